@@ -0,0 +1,88 @@
+"""Compare the artifact store backends on first writes, unchanged rewrites and changed rewrites.
+
+Usage:
+    python benchmarks/bench_artifact_store.py [--artifacts N] [--bytes N] [--runs N] [--json]
+
+For each backend (local files, memory, SQLite) in a temporary directory, writes `--artifacts`
+markdown artifacts of about `--bytes` each into `--runs` run namespaces, then writes the same
+content again (skipped by content hash) and then changed content, and reports milliseconds per
+write for each pass plus the time to list a run's manifest.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from company_ai.artifact_store import ArtifactStore, LocalArtifactStore, MemoryArtifactStore, SqliteArtifactStore
+
+
+def _content(index: int, size: int, version: int) -> str:
+    line = f"- item {index} revision {version}: the quick brown fox jumps over the lazy dog\n"
+    return f"# Artifact {index}\n\n" + line * max(1, size // len(line))
+
+
+def _write_pass(store: ArtifactStore, runs: int, artifacts: int, size: int, version: int) -> tuple[float, int]:
+    unchanged = 0
+    started = time.perf_counter()
+    for run in range(runs):
+        for index in range(artifacts):
+            entry = store.write(f"run-{run}", f"docs/artifact_{index}.md", _content(index, size, version))
+            unchanged += entry["unchanged"]
+    return time.perf_counter() - started, unchanged
+
+
+def bench(store: ArtifactStore, runs: int, artifacts: int, size: int) -> dict[str, Any]:
+    writes = runs * artifacts
+    results: dict[str, Any] = {}
+    for label, version in (("first", 0), ("unchanged", 0), ("changed", 1)):
+        seconds, unchanged = _write_pass(store, runs, artifacts, size, version)
+        results[f"{label}_ms_per_write"] = round(seconds / writes * 1000, 3)
+        results[f"{label}_skipped"] = unchanged
+    started = time.perf_counter()
+    listed = len(store.manifest("run-0")["artifacts"])
+    results["manifest_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    results["manifest_entries"] = listed
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--artifacts", type=int, default=25, help="Artifacts written per run")
+    parser.add_argument("--bytes", type=int, default=8192, help="Approximate size of each artifact")
+    parser.add_argument("--runs", type=int, default=20, help="Run namespaces to write")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="company-ai-artifacts-"))
+    try:
+        stores: dict[str, ArtifactStore] = {
+            "local": LocalArtifactStore(work_dir / "local"),
+            "memory": MemoryArtifactStore(),
+            "sqlite": SqliteArtifactStore(work_dir / "artifacts.sqlite3"),
+        }
+        results = {name: bench(store, args.runs, args.artifacts, args.bytes) for name, store in stores.items()}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    header = f"{'backend':<8} {'first ms':>9} {'unchanged ms':>13} {'changed ms':>11} {'skipped':>8} {'manifest ms':>12}"
+    print(header)
+    print("-" * len(header))
+    for name, row in results.items():
+        print(
+            f"{name:<8} {row['first_ms_per_write']:>9} {row['unchanged_ms_per_write']:>13} "
+            f"{row['changed_ms_per_write']:>11} {row['unchanged_skipped']:>8} {row['manifest_ms']:>12}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+"""Measure crew construction cost with and without the crew template cache.
+
+Usage:
+    python benchmarks/bench_crew_construction.py [--repeat N] [--json]
+
+For each crew, "uncached" parses agents.yaml/tasks.yaml and builds every agent and tool on each
+request (COMPANY_AI_CREW_CACHE=0), while "cached" reuses the parsed template and an idle agent
+set, so only the per-request tasks are rebuilt. No LLM is called.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import time
+from collections.abc import Callable
+
+# Agents resolve their LLM on construction; nothing is sent with this placeholder key.
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+os.environ.setdefault("CREWAI_TRACING_ENABLED", "false")
+
+from company_ai.crews.base import BaseCrew, clear_crew_templates  # noqa: E402
+from company_ai.crews.registry import CREWS  # noqa: E402
+
+CEO_REQUEST = "Launch a self-serve analytics dashboard for mid-market retailers."
+
+
+def _build_once(crew_class: Callable[[], BaseCrew]) -> int:
+    # Returns the number of distinct tool instances held by the crew's agents.
+    crew = crew_class()
+    with crew.checkout_agents() as agents:
+        crew.crew(CEO_REQUEST, agents)
+        return len({id(tool) for agent in agents.values() for tool in agent.tools or []})
+
+
+def _measure(crew_class: Callable[[], BaseCrew], cached: bool, repeat: int) -> tuple[list[float], int]:
+    os.environ["COMPANY_AI_CREW_CACHE"] = "1" if cached else "0"
+    clear_crew_templates()
+    if cached:
+        _build_once(crew_class)  # the first request pays for parsing and agent construction
+    timings = []
+    tools = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        tools = _build_once(crew_class)
+        timings.append(time.perf_counter() - started)
+    return timings, tools
+
+
+def run(repeat: int) -> list[dict[str, object]]:
+    rows = []
+    for name, crew_class in CREWS.items():
+        uncached, uncached_tools = _measure(crew_class, cached=False, repeat=repeat)
+        cached, cached_tools = _measure(crew_class, cached=True, repeat=repeat)
+        uncached_ms = statistics.median(uncached) * 1000
+        cached_ms = statistics.median(cached) * 1000
+        rows.append(
+            {
+                "crew": name,
+                "uncached_ms": round(uncached_ms, 3),
+                "cached_ms": round(cached_ms, 3),
+                "speedup": round(uncached_ms / cached_ms, 2) if cached_ms else None,
+                "uncached_tool_instances": uncached_tools,
+                "cached_tool_instances": cached_tools,
+            }
+        )
+    os.environ.pop("COMPANY_AI_CREW_CACHE", None)
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Requests per crew and mode; the median is reported")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON rows instead of a table")
+    args = parser.parse_args(argv)
+
+    rows = run(max(1, args.repeat))
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    header = f"{'crew':<12} {'uncached ms':>12} {'cached ms':>10} {'speedup':>8} {'tools old/new':>14}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        tools = f"{row['uncached_tool_instances']}/{row['cached_tool_instances']}"
+        print(f"{row['crew']:<12} {row['uncached_ms']:>12} {row['cached_ms']:>10} {row['speedup']:>8} {tools:>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,442 @@
+"""End-to-end benchmark of the crews and the organization flow, fully offline.
+
+Usage:
+    python benchmarks/bench_e2e.py [--repeat N] [--flows N] [--mode sequential|parallel]
+                                   [--llm-latency-ms MS] [--http-latency-ms MS]
+                                   [--output FILE] [--baseline FILE] [--tolerance FRACTION]
+
+Every agent runs on the scripted stub model (COMPANY_AI_LLM_MODE=stub): each one searches the web,
+reads the first result and answers. Search providers and web pages are served by a local HTTP
+server standing in for DuckDuckGo and Serper, and both the model and the server can add a fixed
+latency per call. The benchmark runs each crew's run(), then OrganizationFlow end to end, then
+`--flows` flows concurrently, and records wall time per stage and per task, prompt size per task,
+tool call counts and latency, peak RSS and throughput.
+
+Results are written as JSON with a flat "metrics" map. With `--baseline`, every metric is compared
+with the same metric of an earlier result file: timings, memory, tool calls and prompt sizes may
+not grow, and throughput may not drop, by more than `--tolerance` (plus a small absolute slack for
+noisy timings). The exit status is 1 when any metric regresses, so the script can gate CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+CEO_REQUEST = "Launch a self-serve analytics dashboard for mid-market retailers."
+DEFAULT_OUTPUT_DIR = Path("benchmarks") / "results"
+DEFAULT_TOLERANCE = 0.25
+# Absolute slack per metric unit, so that noise on tiny values does not count as a regression.
+ABSOLUTE_SLACK = {"seconds": 0.05, "ms": 5.0, "mb": 16.0, "calls": 0.0, "chars": 0.0, "per_minute": 0.0}
+PAGE_COUNT = 5
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    # DuckDuckGo HTML results at /html/, Serper JSON at /search and articles at /page/<n>.
+    server: _StandInServer
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        if parsed.path.startswith("/html"):
+            query = parse_qs(parsed.query).get("q", [""])[0]
+            links = "".join(
+                f'<div class="result"><a class="result__a" href="{self.server.base_url}/page/{index}">'
+                f"{query} result {index}</a>"
+                f'<a class="result__snippet" href="#">Snippet {index} about {query}.</a></div>'
+                for index in range(1, PAGE_COUNT + 1)
+            )
+            self._reply("search", "text/html; charset=utf-8", f"<html><body>{links}</body></html>")
+        elif parsed.path.startswith("/page/"):
+            paragraphs = "".join(
+                f"<p>Paragraph {index} of {parsed.path}: market sizing, pricing and rollout notes.</p>"
+                for index in range(40)
+            )
+            body = f"<html><head><title>{parsed.path}</title></head><body>{paragraphs}</body></html>"
+            self._reply("page", "text/html; charset=utf-8", body)
+        else:
+            self._reply("other", "text/plain", "not found", status=404)
+
+    def do_POST(self) -> None:
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        organic = [
+            {
+                "title": f"{request.get('q', '')} result {index}",
+                "link": f"{self.server.base_url}/page/{index}",
+                "snippet": f"Snippet {index}.",
+            }
+            for index in range(1, PAGE_COUNT + 1)
+        ]
+        self._reply("search", "application/json", json.dumps({"organic": organic}))
+
+    def _reply(self, kind: str, content_type: str, body: str, status: int = 200) -> None:
+        time.sleep(self.server.latency)
+        payload = body.encode("utf-8")
+        with self.server.lock:
+            self.server.requests[kind] += 1
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float) -> None:
+        super().__init__(("127.0.0.1", 0), _StandInHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests: dict[str, int] = defaultdict(int)
+        self.base_url = f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@contextmanager
+def stand_in_server(latency: float) -> Iterator[_StandInServer]:
+    server = _StandInServer(latency)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class ToolRecorder:
+    # Wraps _run of every company_ai tool class to count calls and time them.
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    def install(self) -> None:
+        import company_ai.tools as tools
+        from company_ai.tools.base import _traced
+        from crewai.tools import BaseTool
+
+        for name in dir(tools):
+            tool_class = getattr(tools, name)
+            if isinstance(tool_class, type) and issubclass(tool_class, BaseTool) and "_run" in vars(tool_class):
+                run = tool_class._run
+                tool_name = tool_class.model_fields["name"].default
+                if not getattr(run, "__traced__", False):
+                    tool_class._run = self._wrap(tool_name, run)
+                    continue
+                # Time the tool's own _run inside the span and output policy, and keep __wrapped__
+                # on the original so run_raw (tools built on other tools) still skips both.
+                raw = run.__wrapped__
+                traced = _traced(self._wrap(tool_name, raw))
+                traced.__wrapped__ = raw
+                tool_class._run = traced
+
+    def _wrap(self, tool_name: str, run: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(run)
+        def timed_run(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return run(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.samples[tool_name].append(time.perf_counter() - started)
+
+        return timed_run
+
+    def reset(self) -> None:
+        with self.lock:
+            self.samples.clear()
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        with self.lock:
+            return {
+                name: {
+                    "calls": len(samples),
+                    "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+                    "max_ms": round(max(samples) * 1000, 3),
+                }
+                for name, samples in sorted(self.samples.items())
+            }
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _configure_environment(args: argparse.Namespace, server: _StandInServer, work_dir: Path) -> None:
+    script = {
+        "*": [
+            {"tool": "internet_search", "input": {"query": "mid-market retail analytics"}},
+            {"tool": "read_webpage", "input": {"url": f"{server.base_url}/page/1"}},
+        ]
+    }
+    script_path = work_dir / "stub_script.json"
+    script_path.write_text(json.dumps(script), encoding="utf-8")
+    os.environ.update(
+        {
+            "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY") or "benchmark-placeholder",
+            "CREWAI_TRACING_ENABLED": "false",
+            "COMPANY_AI_LLM_MODE": "stub",
+            "COMPANY_AI_LLM_STUB_SCRIPT": str(script_path),
+            "COMPANY_AI_LLM_LATENCY": str(args.llm_latency_ms / 1000),
+            # Every run executes every task and reaches the stand-in server.
+            "COMPANY_AI_TASK_REUSE": "0",
+            # Task outputs stay in the process instead of the artifacts directory.
+            "COMPANY_AI_ARTIFACT_BACKEND": "memory",
+            "INTERNET_TOOL_CACHE": "0",
+            "INTERNET_TOOL_DUCKDUCKGO_URL": f"{server.base_url}/html/",
+            "INTERNET_TOOL_SERPER_URL": f"{server.base_url}/search",
+        }
+    )
+    if args.search_provider == "serper":
+        os.environ["SERPER_API_KEY"] = "benchmark-placeholder"
+    else:
+        os.environ.pop("SERPER_API_KEY", None)
+    if args.task_mode:
+        os.environ["COMPANY_AI_TASK_MODE"] = args.task_mode
+
+
+def bench_crews(repeat: int) -> dict[str, Any]:
+    from company_ai.crews.registry import CREWS
+
+    results: dict[str, Any] = {}
+    for name, crew_class in CREWS.items():
+        walls: list[float] = []
+        tasks: dict[str, list[float]] = defaultdict(list)
+        prompt_chars: dict[str, int] = {}
+        for _ in range(repeat):
+            crew = crew_class()
+            started = time.perf_counter()
+            crew.run(CEO_REQUEST)
+            walls.append(time.perf_counter() - started)
+            for task_key, seconds in crew.task_timings.items():
+                tasks[task_key].append(seconds)
+            for task_key, sizes in crew.prompt_sizes.items():
+                prompt_chars[task_key] = sizes["prompt_chars"]
+        results[name] = {
+            "wall_seconds": round(statistics.median(walls), 3),
+            "tasks": {task_key: round(statistics.median(samples), 3) for task_key, samples in tasks.items()},
+            "prompt_chars": prompt_chars,
+        }
+    return results
+
+
+def bench_flow(mode: str, repeat: int, work_dir: Path, run_ids: list[str]) -> dict[str, Any]:
+    from company_ai.main import execute_flow
+
+    walls: list[float] = []
+    stages: dict[str, list[float]] = defaultdict(list)
+    for index in range(repeat):
+        run_ids.append(f"bench-{os.getpid()}-flow-{index}")
+        started = time.perf_counter()
+        state = execute_flow(
+            CEO_REQUEST,
+            mode=mode,
+            report_path=str(work_dir / f"flow-{index}.md"),
+            run_id=run_ids[-1],
+        )
+        walls.append(time.perf_counter() - started)
+        for stage, seconds in state.stage_timings.items():
+            stages[stage].append(seconds)
+    return {
+        "mode": mode,
+        "wall_seconds": round(statistics.median(walls), 3),
+        "stages": {stage: round(statistics.median(samples), 3) for stage, samples in stages.items()},
+    }
+
+
+def bench_throughput(mode: str, flows: int, work_dir: Path, run_ids: list[str]) -> dict[str, Any]:
+    from company_ai.main import execute_flow
+
+    def run_one(index: int) -> float:
+        run_ids.append(f"bench-{os.getpid()}-concurrent-{index}")
+        started = time.perf_counter()
+        execute_flow(
+            f"{CEO_REQUEST} (variant {index})",
+            mode=mode,
+            report_path=str(work_dir / f"concurrent-{index}.md"),
+            run_id=run_ids[-1],
+        )
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=flows) as pool:
+        latencies = list(pool.map(run_one, range(flows)))
+    wall = time.perf_counter() - started
+    return {
+        "flows": flows,
+        "wall_seconds": round(wall, 3),
+        "flows_per_minute": round(flows * 60 / wall, 2) if wall else None,
+        "median_flow_seconds": round(statistics.median(latencies), 3),
+    }
+
+
+def flatten_metrics(results: dict[str, Any]) -> dict[str, float]:
+    # One flat, comparable map; the last name segment carries the unit.
+    metrics: dict[str, float] = {}
+    for crew, row in results["crews"].items():
+        metrics[f"crews.{crew}.wall_seconds"] = row["wall_seconds"]
+        for task_key, seconds in row["tasks"].items():
+            metrics[f"crews.{crew}.tasks.{task_key}.seconds"] = seconds
+        for task_key, chars in row.get("prompt_chars", {}).items():
+            metrics[f"crews.{crew}.tasks.{task_key}.prompt_chars"] = chars
+    flow = results["flow"]
+    metrics["flow.wall_seconds"] = flow["wall_seconds"]
+    for stage, seconds in flow["stages"].items():
+        metrics[f"flow.stages.{stage}.seconds"] = seconds
+    throughput = results["throughput"]
+    metrics["throughput.wall_seconds"] = throughput["wall_seconds"]
+    if throughput["flows_per_minute"] is not None:
+        metrics["throughput.flows_per_minute"] = throughput["flows_per_minute"]
+    for phase, tools in results["tools"].items():
+        for tool, row in tools.items():
+            metrics[f"tools.{phase}.{tool}.calls"] = row["calls"]
+            metrics[f"tools.{phase}.{tool}.mean_ms"] = row["mean_ms"]
+    if results["memory"]["peak_rss_mb"] is not None:
+        metrics["memory.peak_rss_mb"] = results["memory"]["peak_rss_mb"]
+    return metrics
+
+
+def _unit(metric: str) -> str:
+    suffix = metric.rsplit(".", 1)[-1]
+    return next((unit for unit in ABSOLUTE_SLACK if suffix == unit or suffix.endswith(f"_{unit}")), "seconds")
+
+
+def compare(metrics: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[dict[str, Any]]:
+    regressions = []
+    for metric, previous in sorted(baseline.items()):
+        current = metrics.get(metric)
+        if current is None or previous is None:
+            continue
+        unit = _unit(metric)
+        if unit == "per_minute":
+            regressed = current < previous / (1 + tolerance)
+        else:
+            regressed = current > previous * (1 + tolerance) + ABSOLUTE_SLACK[unit]
+        if regressed:
+            change = round((current - previous) / previous * 100, 1) if previous else None
+            regressions.append({"metric": metric, "baseline": previous, "current": current, "change_pct": change})
+    return regressions
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    results: dict[str, Any] = {"tools": {}, "memory": {}}
+    run_ids: list[str] = []
+    with tempfile.TemporaryDirectory(prefix="company-ai-bench-") as tmp, stand_in_server(
+        args.http_latency_ms / 1000
+    ) as server:
+        work_dir = Path(tmp)
+        _configure_environment(args, server, work_dir)
+        recorder = ToolRecorder()
+        recorder.install()
+
+        from company_ai.checkpoint import checkpoint_path
+
+        phases: list[tuple[str, Callable[[], dict[str, Any]]]] = [
+            ("crews", lambda: bench_crews(args.repeat)),
+            ("flow", lambda: bench_flow(args.mode, args.repeat, work_dir, run_ids)),
+            ("throughput", lambda: bench_throughput(args.mode, args.flows, work_dir, run_ids)),
+        ]
+        try:
+            for phase, bench in phases:
+                recorder.reset()
+                results[phase] = bench()
+                results["tools"][phase] = recorder.summary()
+                results["memory"][f"after_{phase}_rss_mb"] = peak_rss_mb()
+        finally:
+            for run_id in run_ids:
+                checkpoint_path(run_id).unlink(missing_ok=True)
+        results["http_requests"] = dict(server.requests)
+    results["memory"]["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per crew and of the flow; medians are reported")
+    parser.add_argument("--flows", type=int, default=4, help="Flows run concurrently in the throughput phase")
+    parser.add_argument("--mode", choices=("sequential", "parallel"), default="sequential", help="Flow mode")
+    parser.add_argument("--task-mode", choices=("sequential", "dag"), help="Task mode inside crews")
+    parser.add_argument("--search-provider", choices=("duckduckgo", "serper"), default="duckduckgo")
+    parser.add_argument("--llm-latency-ms", type=float, default=20.0, help="Simulated latency per model call")
+    parser.add_argument("--http-latency-ms", type=float, default=20.0, help="Simulated latency per HTTP request")
+    parser.add_argument("--output", type=Path, help="Result file (default benchmarks/results/e2e-<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, help="Earlier result file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+    args.repeat = max(1, args.repeat)
+    args.flows = max(1, args.flows)
+
+    results = run(args)
+    payload = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        },
+        "metrics": flatten_metrics(results),
+        "results": results,
+    }
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        payload["regressions"] = compare(payload["metrics"], baseline["metrics"], args.tolerance)
+
+    output = args.output or DEFAULT_OUTPUT_DIR / f"e2e-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    print(f"{'crew':<12} {'wall s':>8}  slowest tasks")
+    for crew, row in results["crews"].items():
+        slowest = sorted(row["tasks"].items(), key=lambda item: item[1], reverse=True)[:3]
+        print(f"{crew:<12} {row['wall_seconds']:>8}  " + ", ".join(f"{task} {seconds}" for task, seconds in slowest))
+    flow = results["flow"]
+    print(f"\nflow ({flow['mode']}): {flow['wall_seconds']} s; stages: {flow['stages']}")
+    throughput = results["throughput"]
+    print(
+        f"throughput: {throughput['flows']} concurrent flows in {throughput['wall_seconds']} s "
+        f"({throughput['flows_per_minute']} flows/min)"
+    )
+    for phase, tools in results["tools"].items():
+        print(f"tools during {phase}: " + (", ".join(f"{tool} x{row['calls']}" for tool, row in tools.items()) or "none"))
+    print(f"peak RSS: {results['memory']['peak_rss_mb']} MB; stand-in HTTP requests: {results['http_requests']}")
+    print(f"results written to {output}")
+
+    regressions = payload.get("regressions", [])
+    if args.baseline:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline} (tolerance {args.tolerance:.0%})")
+        for row in regressions:
+            print(f"  {row['metric']}: {row['baseline']} -> {row['current']} ({row['change_pct']}%)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+"""Compare the single-pass HTML extractor with the previous regex-based _strip_html.
+
+Usage:
+    python benchmarks/bench_html_text.py [--corpus DIR] [--repeat N] [--scale N]
+
+Every *.html page in the corpus (default: benchmarks/corpus/html) is measured as saved and
+concatenated `--scale` times to approximate a large page. Two generated stress inputs are
+added: unterminated <script> tags, on which the regex chain backtracks super-linearly (keep
+`--stress-bytes` small), and runs of stray "<" characters.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from html import unescape
+from pathlib import Path
+
+from company_ai.tools.html_text import html_to_text
+
+
+def legacy_strip_html(html: str) -> str:
+    # The implementation _strip_html used before the single-pass extractor.
+    text = re.sub(r"(?is)<script.*?>.*?</script>", " ", html)
+    text = re.sub(r"(?is)<style.*?>.*?</style>", " ", text)
+    text = re.sub(r"(?s)<[^>]+>", " ", text)
+    text = unescape(text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _best_of(func: Callable[[str], str], html: str, repeat: int) -> tuple[float, str]:
+    timings = []
+    output = ""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = func(html)
+        timings.append(time.perf_counter() - started)
+    return min(timings), output
+
+
+def _pathological_inputs(size: int) -> dict[str, str]:
+    return {
+        "unterminated_scripts": "<p>intro</p>" + "<script>var a = 1;" * (size // 18),
+        "stray_lt_runs": "<p>" + "a <" * (size // 3) + ">",
+    }
+
+
+def run(corpus: Path, repeat: int, scale: int, stress_bytes: int) -> list[dict[str, object]]:
+    cases: dict[str, str] = {}
+    for page in sorted(corpus.glob("*.html")):
+        html = page.read_text(encoding="utf-8", errors="replace")
+        cases[page.name] = html
+        cases[f"{page.name} x{scale}"] = html * scale
+    cases.update(_pathological_inputs(size=stress_bytes))
+
+    rows = []
+    for name, html in cases.items():
+        legacy_seconds, legacy_output = _best_of(legacy_strip_html, html, repeat)
+        new_seconds, new_output = _best_of(html_to_text, html, repeat)
+        rows.append(
+            {
+                "case": name,
+                "input_bytes": len(html.encode("utf-8")),
+                "legacy_ms": round(legacy_seconds * 1000, 3),
+                "single_pass_ms": round(new_seconds * 1000, 3),
+                "speedup": round(legacy_seconds / new_seconds, 2) if new_seconds else None,
+                "legacy_chars": len(legacy_output),
+                "single_pass_chars": len(new_output),
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=Path(__file__).resolve().parent / "corpus" / "html")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the fastest is reported")
+    parser.add_argument("--scale", type=int, default=50, help="Copies concatenated for the large-page cases")
+    parser.add_argument("--stress-bytes", type=int, default=4000, help="Size of the generated stress inputs")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON rows instead of a table")
+    args = parser.parse_args(argv)
+
+    rows = run(args.corpus, max(1, args.repeat), max(1, args.scale), max(100, args.stress_bytes))
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    header = f"{'case':<28} {'bytes':>9} {'legacy ms':>10} {'single ms':>10} {'speedup':>8} {'chars old/new':>15}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['case']:<28} {row['input_bytes']:>9} {row['legacy_ms']:>10} {row['single_pass_ms']:>10} "
+            f"{row['speedup']:>8} {str(row['legacy_chars']) + '/' + str(row['single_pass_chars']):>15}"
+        )
+    print(f"\nmedian speedup: {statistics.median(row['speedup'] or 0 for row in rows):.2f}x", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+"""Check the import time of the company_ai entry points against a budget.
+
+Usage:
+    python benchmarks/bench_import_time.py [--target MODULE ...] [--repeat N] [--budget-ms MS]
+
+Each target is imported in a fresh interpreter under `python -X importtime`, and the cumulative
+time reported for it is compared with the budget (the median over `--repeat` runs). A target also
+fails when it pulls in a module listed with `--forbid` (crewai by default), which is what a
+regression of the lazy-import paths looks like. The exit status is 1 when any check fails, so the
+script can gate CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+DEFAULT_TARGETS = ("company_ai.main", "company_ai.batch", "company_ai.tools")
+DEFAULT_BUDGET_MS = 300.0
+DEFAULT_FORBIDDEN = ("crewai",)
+
+
+def _import_profile(target: str) -> dict[str, tuple[int, int]]:
+    # Maps module name to (self, cumulative) microseconds as printed by -X importtime.
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile: dict[str, tuple[int, int]] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def measure(target: str, repeat: int, forbidden: tuple[str, ...]) -> dict[str, object]:
+    timings = []
+    profile: dict[str, tuple[int, int]] = {}
+    for _ in range(repeat):
+        profile = _import_profile(target)
+        timings.append(profile.get(target, (0, 0))[1] / 1000)
+    slowest = sorted(profile.items(), key=lambda item: item[1][0], reverse=True)[:5]
+    return {
+        "target": target,
+        "median_ms": round(statistics.median(timings), 2),
+        "modules": len(profile),
+        "forbidden_imported": sorted(
+            name for name in profile if any(name == banned or name.startswith(f"{banned}.") for banned in forbidden)
+        )[:5],
+        "slowest_self_ms": {name: round(self_us / 1000, 2) for name, (self_us, _) in slowest},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", action="append", help="Module to import; repeatable")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target; the median is used")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Cumulative import budget per target")
+    parser.add_argument("--forbid", action="append", help="Module that must not be imported; repeatable")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON rows instead of a table")
+    args = parser.parse_args(argv)
+
+    targets = tuple(args.target or DEFAULT_TARGETS)
+    forbidden = tuple(args.forbid or DEFAULT_FORBIDDEN)
+    rows = [measure(target, max(1, args.repeat), forbidden) for target in targets]
+    failed = False
+    for row in rows:
+        row["budget_ms"] = args.budget_ms
+        row["ok"] = row["median_ms"] <= args.budget_ms and not row["forbidden_imported"]
+        failed = failed or not row["ok"]
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        header = f"{'target':<24} {'median ms':>10} {'budget ms':>10} {'modules':>8}  status"
+        print(header)
+        print("-" * len(header))
+        for row in rows:
+            status = "ok" if row["ok"] else "FAIL"
+            if row["forbidden_imported"]:
+                status += f" (imports {', '.join(row['forbidden_imported'])})"
+            print(f"{row['target']:<24} {row['median_ms']:>10} {row['budget_ms']:>10} {row['modules']:>8}  {status}")
+            slowest = ", ".join(f"{name} {ms}" for name, ms in row["slowest_self_ms"].items())
+            print(f"{'':<24} slowest self ms: {slowest}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
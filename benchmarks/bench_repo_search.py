@@ -0,0 +1,243 @@
+"""Measure the repo_search trigram index on a synthetic repository.
+
+Usage:
+    python benchmarks/bench_repo_search.py [--files N] [--dir DIR] [--repeat N] [--json]
+
+Generates a git repository of `--files` small source files (default 100000) in nested
+packages, plus a .gitignore'd build/ directory that must stay out of the index, and reports:
+
+- cold build: first refresh with no index on disk
+- warm load: a new index loading the segments from disk plus a refresh that finds no changes
+- incremental: refresh after modifying, adding and deleting a few hundred files
+- queries: rare and common identifiers, a regex and a path-filtered query, against a full
+  scan that reads every file and searches it with the same pattern (what a query costs
+  without the index)
+
+The repository is written to `--dir` and kept there when given (the directory is replaced);
+otherwise it is created in a temporary directory and removed afterwards. peak_rss_mb is the
+process's peak resident memory after the cold build, generated files included.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from company_ai.tools.ci_cache import list_repo_files
+from company_ai.tools.search_index import SearchIndex
+
+
+FILES_PER_PACKAGE = 500
+WORDS = (
+    "account billing cache client config context customer data event handler invoice "
+    "item ledger message model order payment queue record report request response "
+    "schema service session settings state store task token user worker"
+).split()
+TEMPLATE = '''"""{title} module."""
+
+from __future__ import annotations
+
+from {package}.{dependency} import {imported}
+
+
+class {class_name}:
+    def __init__(self, {word_a}: str, {word_b}: int = {number}) -> None:
+        self.{word_a} = {word_a}
+        self.{word_b} = {word_b}
+
+    def {method}(self, payload: dict) -> dict:
+        # Validate the {word_a} before the {word_b} is stored.
+        result = {imported}(payload)
+        result["{word_a}_{number}"] = self.{word_b}
+        return result
+
+
+def {function}({word_b}: int) -> int:
+    return {word_b} * {number} + {offset}
+'''
+
+
+def _identifier(rng: random.Random) -> tuple[str, str]:
+    first, second = rng.sample(WORDS, 2)
+    return first, second
+
+
+def generate(root: Path, files: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    for number in range(files):
+        package = f"pkg{number // FILES_PER_PACKAGE:04d}"
+        word_a, word_b = _identifier(rng)
+        path = root / "src" / package / f"{word_a}_{word_b}_{number}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            TEMPLATE.format(
+                title=f"{word_a.title()} {word_b}",
+                package=package,
+                dependency=f"{rng.choice(WORDS)}_helpers",
+                imported=f"build_{rng.choice(WORDS)}",
+                class_name=f"{word_a.title()}{word_b.title()}{number}",
+                word_a=word_a,
+                word_b=word_b,
+                number=number,
+                method=f"apply_{rng.choice(WORDS)}",
+                function=f"compute_{word_a}_{number}",
+                offset=rng.randint(1, 1000),
+            ),
+            encoding="utf-8",
+        )
+    build = root / "build"
+    build.mkdir(exist_ok=True)
+    for number in range(100):
+        (build / f"generated_{number}.py").write_text(f"def ignored_build_output_{number}(): pass\n", encoding="utf-8")
+    (root / ".gitignore").write_text("build/\n", encoding="utf-8")
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 2**20 if sys.platform == "darwin" else peak / 2**10, 1)
+
+
+def _timed(func: Any) -> tuple[float, Any]:
+    started = time.perf_counter()
+    value = func()
+    return time.perf_counter() - started, value
+
+
+def full_scan(root: Path, pattern: re.Pattern[str], paths: list[str]) -> int:
+    hits = 0
+    for path in paths:
+        try:
+            text = (root / path).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        hits += sum(1 for _ in pattern.finditer(text))
+    return hits
+
+
+def mutate(root: Path, files: int, count: int, seed: int = 11) -> None:
+    rng = random.Random(seed)
+    existing = sorted((root / "src").glob("pkg*/*.py"))
+    for path in rng.sample(existing, min(count, len(existing))):
+        path.write_text(path.read_text(encoding="utf-8") + "\n\ndef touched_by_benchmark():\n    return 1\n")
+    for path in rng.sample(existing, min(count // 10, len(existing))):
+        path.unlink(missing_ok=True)
+    added = root / "src" / "pkg_added"
+    added.mkdir(exist_ok=True)
+    for number in range(count // 10):
+        (added / f"added_{number}.py").write_text(f"def freshly_added_{number}():\n    return {files + number}\n")
+
+
+def run(root: Path, files: int, repeat: int) -> dict[str, Any]:
+    state = Path(tempfile.mkdtemp(prefix="company-ai-search-state-"))
+    results: dict[str, Any] = {"files": files}
+    try:
+        build_seconds, stats = _timed(lambda: SearchIndex(root, state).refresh())
+        results["cold_build"] = {**stats.as_dict(), "seconds": round(build_seconds, 3), "peak_rss_mb": _peak_rss_mb()}
+        results["index_bytes"] = sum(path.stat().st_size for path in state.iterdir())
+
+        index = SearchIndex(root, state)
+        load_seconds, stats = _timed(index.refresh)
+        results["warm_load"] = {**stats.as_dict(), "seconds": round(load_seconds, 3)}
+        noop_seconds, stats = _timed(index.refresh)
+        results["noop_refresh"] = {**stats.as_dict(), "seconds": round(noop_seconds, 3)}
+
+        mutate(root, files, count=max(10, files // 500))
+        incremental_seconds, stats = _timed(index.refresh)
+        results["incremental"] = {**stats.as_dict(), "seconds": round(incremental_seconds, 3)}
+
+        ignored = index.search("ignored_build_output", max_results=1)
+        results["gitignored_hits"] = ignored["total_hits"]
+
+        paths = list_repo_files(root)
+        queries = [
+            ("rare identifier", {"query": f"compute_{WORDS[0]}_"}),
+            ("unique identifier", {"query": "freshly_added_0"}),
+            ("common word", {"query": "payload"}),
+            ("regex", {"query": r"def\s+compute_invoice_\d+", "regex": True}),
+            ("path filter", {"query": "build_ledger", "path_glob": "src/pkg0001/*"}),
+        ]
+        rows = []
+        for label, kwargs in queries:
+            timings = []
+            result: dict[str, Any] = {}
+            for _ in range(repeat):
+                seconds, result = _timed(lambda: index.search(**kwargs))
+                timings.append(seconds - result["index"]["seconds"])
+            flags = re.IGNORECASE | re.MULTILINE
+            pattern = re.compile(kwargs["query"] if kwargs.get("regex") else re.escape(kwargs["query"]), flags)
+            scan_paths = [path for path in paths if fnmatch.fnmatch(path, kwargs.get("path_glob") or "*")]
+            scan_seconds, scan_hits = _timed(lambda: full_scan(root, pattern, scan_paths))
+            rows.append(
+                {
+                    "query": label,
+                    "pattern": kwargs["query"],
+                    "candidates": result["candidate_files"],
+                    "scanned": result["scanned_files"],
+                    "hits": result["total_hits"],
+                    "index_ms": round(statistics.median(timings) * 1000, 1),
+                    "refresh_ms": round(result["index"]["seconds"] * 1000, 1),
+                    "full_scan_ms": round(scan_seconds * 1000, 1),
+                    "full_scan_hits": scan_hits,
+                }
+            )
+        results["queries"] = rows
+    finally:
+        shutil.rmtree(state, ignore_errors=True)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100_000, help="Source files in the synthetic repository")
+    parser.add_argument("--dir", type=Path, default=None, help="Keep the synthetic repository in this directory")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query; the median is reported")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    root = args.dir or Path(tempfile.mkdtemp(prefix="company-ai-search-repo-"))
+    try:
+        shutil.rmtree(root, ignore_errors=True)
+        generate_seconds, _ = _timed(lambda: generate(root, args.files))
+        print(f"generated {args.files} files in {generate_seconds:.1f}s", file=sys.stderr)
+        results = run(root, args.files, max(1, args.repeat))
+    finally:
+        if args.dir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    for step in ("cold_build", "warm_load", "noop_refresh", "incremental"):
+        print(f"{step:<13} {json.dumps(results[step])}")
+    print(f"index size    {results['index_bytes'] / 2**20:.1f} MB; .gitignore'd hits: {results['gitignored_hits']}\n")
+    header = f"{'query':<18} {'candidates':>10} {'hits':>6} {'index ms':>9} {'refresh ms':>11} {'full scan ms':>13}"
+    print(header)
+    print("-" * len(header))
+    for row in results["queries"]:
+        print(
+            f"{row['query']:<18} {row['candidates']:>10} {row['hits']:>6} {row['index_ms']:>9} "
+            f"{row['refresh_ms']:>11} {row['full_scan_ms']:>13}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
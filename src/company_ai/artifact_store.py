@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import posixpath
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from company_ai.checkpoint import write_bytes_atomic, write_json_atomic
+from company_ai.settings import artifact_settings
+
+
+# How tasks.yaml, final_report_path and agents name artifacts: relative to the repository root.
+ARTIFACTS_PREFIX = "src/company_ai/artifacts/"
+# Top-level names inside the artifacts directory that artifacts cannot use: run namespaces, run
+# state and the manifest of unscoped artifacts.
+RESERVED_KEYS = ("runs", "state", "manifest.json")
+
+
+def default_artifacts_dir() -> Path:
+    return Path(__file__).resolve().parent / "artifacts"
+
+
+def is_artifact_path(path: str) -> bool:
+    if os.path.isabs(path):
+        root = default_artifacts_dir().resolve()
+        return Path(path).resolve().is_relative_to(root)
+    return Path(path).as_posix().startswith(ARTIFACTS_PREFIX)
+
+
+def artifact_key(path: str) -> str:
+    # The artifact's path inside the artifacts directory. Accepts paths relative to it, relative to
+    # the repository root (src/company_ai/artifacts/...) or absolute paths inside it.
+    if os.path.isabs(path):
+        root = default_artifacts_dir().resolve()
+        target = Path(path).resolve()
+        if not target.is_relative_to(root):
+            raise ValueError("Path traversal detected. Write denied.")
+        path = target.relative_to(root).as_posix()
+    path = Path(path).as_posix()
+    if path.startswith(ARTIFACTS_PREFIX):
+        path = path[len(ARTIFACTS_PREFIX) :]
+    key = posixpath.normpath(path)
+    if key in ("", ".") or key == ".." or key.startswith(("../", "/")):
+        raise ValueError("Path traversal detected. Write denied.")
+    if key.split("/", 1)[0] in RESERVED_KEYS:
+        raise ValueError(f"'{key}' is reserved for run state; choose another artifact path.")
+    return key
+
+
+class ArtifactStore(ABC):
+    # Artifacts of each run under its own namespace (run id "" is the unscoped namespace), with a
+    # manifest per run: path -> sha256, size, location and when it was written. A write whose
+    # content hash matches the manifest entry is skipped, so unchanged artifacts keep their
+    # modification times and are not rewritten. Backends implement the _entries, _load and _save
+    # hooks, which are called under the store's lock.
+
+    backend = ""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, Counter[str]] = defaultdict(Counter)
+
+    @abstractmethod
+    def location(self, run_id: str, key: str) -> str: ...
+
+    @abstractmethod
+    def manifest_location(self, run_id: str) -> str: ...
+
+    @abstractmethod
+    def _entries(self, run_id: str) -> dict[str, dict[str, Any]]: ...
+
+    @abstractmethod
+    def _load(self, run_id: str, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    def _save(self, run_id: str, key: str, data: bytes, entry: dict[str, Any]) -> None: ...
+
+    def _unchanged(self, run_id: str, key: str, entry: dict[str, Any]) -> bool:
+        return True
+
+    def write(self, run_id: str, path: str, content: str) -> dict[str, Any]:
+        key = artifact_key(path)
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            entry = self._entries(run_id).get(key)
+            if entry is not None and entry["sha256"] == digest and self._unchanged(run_id, key, entry):
+                self._stats[run_id]["unchanged"] += 1
+                return {**entry, "path": key, "unchanged": True}
+            entry = {
+                "sha256": digest,
+                "bytes": len(data),
+                "location": self.location(run_id, key),
+                "written_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            }
+            self._save(run_id, key, data, entry)
+            self._stats[run_id]["written"] += 1
+            return {**entry, "path": key, "unchanged": False}
+
+    def read(self, run_id: str, path: str) -> str | None:
+        key = artifact_key(path)
+        with self._lock:
+            data = self._load(run_id, key)
+        return None if data is None else data.decode("utf-8", errors="replace")
+
+    def exists(self, run_id: str, path: str) -> bool:
+        return self.read(run_id, path) is not None
+
+    def manifest(self, run_id: str) -> dict[str, Any]:
+        with self._lock:
+            entries = dict(self._entries(run_id))
+        return {"run_id": run_id, "backend": self.backend, "artifacts": dict(sorted(entries.items()))}
+
+    def stats(self, run_id: str) -> dict[str, int]:
+        with self._lock:
+            counts = self._stats.get(run_id, Counter())
+            return {"written": counts["written"], "unchanged": counts["unchanged"]}
+
+
+class LocalArtifactStore(ArtifactStore):
+    # Files under <root>/runs/<run_id>/ (or <root>/ itself when unscoped), each written to a
+    # temporary file and renamed into place, with the run's manifest in manifest.json next to them.
+
+    backend = "local"
+
+    def __init__(self, root: Path | None = None) -> None:
+        super().__init__()
+        self.root = root or default_artifacts_dir()
+        self._manifests: dict[str, dict[str, dict[str, Any]]] = {}
+
+    def _run_dir(self, run_id: str) -> Path:
+        return self.root / "runs" / run_id if run_id else self.root
+
+    def location(self, run_id: str, key: str) -> str:
+        return str(self._run_dir(run_id) / key)
+
+    def manifest_location(self, run_id: str) -> str:
+        return str(self._run_dir(run_id) / "manifest.json")
+
+    def _entries(self, run_id: str) -> dict[str, dict[str, Any]]:
+        if run_id not in self._manifests:
+            try:
+                manifest = json.loads(Path(self.manifest_location(run_id)).read_text(encoding="utf-8"))
+                self._manifests[run_id] = dict(manifest.get("artifacts") or {})
+            except (OSError, ValueError):
+                self._manifests[run_id] = {}
+        return self._manifests[run_id]
+
+    def _load(self, run_id: str, key: str) -> bytes | None:
+        try:
+            return (self._run_dir(run_id) / key).read_bytes()
+        except OSError:
+            return None
+
+    def _unchanged(self, run_id: str, key: str, entry: dict[str, Any]) -> bool:
+        # The file may have been edited or removed outside the store since the manifest was written.
+        try:
+            stat = (self._run_dir(run_id) / key).stat()
+        except OSError:
+            return False
+        return stat.st_size == entry["bytes"] and stat.st_mtime_ns == entry.get("mtime_ns")
+
+    def _save(self, run_id: str, key: str, data: bytes, entry: dict[str, Any]) -> None:
+        target = self._run_dir(run_id) / key
+        write_bytes_atomic(target, data)
+        entries = self._entries(run_id)
+        entries[key] = {**entry, "mtime_ns": target.stat().st_mtime_ns}
+        write_json_atomic(
+            Path(self.manifest_location(run_id)),
+            {"run_id": run_id, "backend": self.backend, "artifacts": dict(sorted(entries.items()))},
+        )
+
+
+class MemoryArtifactStore(ArtifactStore):
+    # Keeps artifacts in the process, for tests and benchmarks that should not touch the disk.
+
+    backend = "memory"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._runs: dict[str, dict[str, tuple[bytes, dict[str, Any]]]] = defaultdict(dict)
+
+    def location(self, run_id: str, key: str) -> str:
+        return f"memory://{run_id}/{key}"
+
+    def manifest_location(self, run_id: str) -> str:
+        return f"memory://{run_id}/manifest.json"
+
+    def _entries(self, run_id: str) -> dict[str, dict[str, Any]]:
+        return {key: entry for key, (_, entry) in self._runs.get(run_id, {}).items()}
+
+    def _load(self, run_id: str, key: str) -> bytes | None:
+        stored = self._runs.get(run_id, {}).get(key)
+        return stored[0] if stored is not None else None
+
+    def _save(self, run_id: str, key: str, data: bytes, entry: dict[str, Any]) -> None:
+        self._runs[run_id][key] = (data, entry)
+
+
+class SqliteArtifactStore(ArtifactStore):
+    # One row per (run_id, path) in a SQLite file, so every run's artifacts and manifest live in
+    # a single file that several processes can share.
+
+    backend = "sqlite"
+
+    def __init__(self, path: Path | None = None) -> None:
+        super().__init__()
+        self.path = path or default_artifacts_dir() / "state" / "artifacts.sqlite3"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS artifacts ("
+            "run_id TEXT NOT NULL, key TEXT NOT NULL, content BLOB NOT NULL, sha256 TEXT NOT NULL, "
+            "bytes INTEGER NOT NULL, written_at TEXT NOT NULL, PRIMARY KEY (run_id, key))"
+        )
+
+    def location(self, run_id: str, key: str) -> str:
+        return f"sqlite://{self.path}#{run_id}/{key}"
+
+    def manifest_location(self, run_id: str) -> str:
+        return f"sqlite://{self.path}#{run_id}"
+
+    def _entries(self, run_id: str) -> dict[str, dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT key, sha256, bytes, written_at FROM artifacts WHERE run_id = ?", (run_id,)
+        ).fetchall()
+        return {
+            key: {"sha256": sha256, "bytes": size, "location": self.location(run_id, key), "written_at": written_at}
+            for key, sha256, size, written_at in rows
+        }
+
+    def _load(self, run_id: str, key: str) -> bytes | None:
+        row = self._conn.execute(
+            "SELECT content FROM artifacts WHERE run_id = ? AND key = ?", (run_id, key)
+        ).fetchone()
+        return bytes(row[0]) if row is not None else None
+
+    def _save(self, run_id: str, key: str, data: bytes, entry: dict[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT INTO artifacts (run_id, key, content, sha256, bytes, written_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(run_id, key) DO UPDATE SET content = excluded.content, sha256 = excluded.sha256, "
+            "bytes = excluded.bytes, written_at = excluded.written_at",
+            (run_id, key, data, entry["sha256"], entry["bytes"], entry["written_at"]),
+        )
+
+
+@dataclass(frozen=True)
+class ArtifactScope:
+    # A store bound to one run's namespace.
+    store: ArtifactStore
+    run_id: str
+
+    def write(self, path: str, content: str) -> dict[str, Any]:
+        return self.store.write(self.run_id, path, content)
+
+    def read(self, path: str) -> str | None:
+        return self.store.read(self.run_id, path)
+
+    def exists(self, path: str) -> bool:
+        return self.store.exists(self.run_id, path)
+
+    def manifest(self) -> dict[str, Any]:
+        return self.store.manifest(self.run_id)
+
+
+_stores: dict[tuple[str, str], ArtifactStore] = {}
+_stores_lock = threading.Lock()
+_current_run: ContextVar[str] = ContextVar("company_ai_artifact_run", default="")
+
+
+def get_artifact_store() -> ArtifactStore:
+    # One store per backend (and database path) per process, so the memory backend is shared by
+    # every flow in the process.
+    settings = artifact_settings()
+    backend, db_path = settings["backend"], settings["db_path"]
+    with _stores_lock:
+        store = _stores.get((backend, db_path))
+        if store is None:
+            if backend == "memory":
+                store = MemoryArtifactStore()
+            elif backend == "sqlite":
+                store = SqliteArtifactStore(Path(db_path) if db_path else None)
+            else:
+                store = LocalArtifactStore()
+            _stores[(backend, db_path)] = store
+        return store
+
+
+def artifact_namespace(run_id: str) -> str:
+    # With artifacts.run_scoped off every run shares the unscoped namespace.
+    return run_id if artifact_settings()["run_scoped"] else ""
+
+
+@contextmanager
+def artifact_run(run_id: str) -> Iterator[ArtifactScope]:
+    # Artifacts written inside the block, from any thread the flow starts, go to run_id's namespace.
+    namespace = artifact_namespace(run_id)
+    token = _current_run.set(namespace)
+    try:
+        yield ArtifactScope(get_artifact_store(), namespace)
+    finally:
+        _current_run.reset(token)
+
+
+def current_artifacts() -> ArtifactScope:
+    return ArtifactScope(get_artifact_store(), _current_run.get())
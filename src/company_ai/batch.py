@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, TextIO
+
+from company_ai.checkpoint import safe_run_id
+from company_ai.settings import FLOW_MODES
+
+
+DEFAULT_WORKERS = 2
+DEFAULT_REPORT_DIR = "src/company_ai/artifacts/reports/batch"
+EXECUTORS = ("thread", "process")
+
+
+def _request_id(ceo_request: str) -> str:
+    return hashlib.sha1(ceo_request.encode("utf-8")).hexdigest()[:12]
+
+
+def read_requests(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    # Each line is either {"id": ..., "ceo_request": ...} or a bare JSON string.
+    # Requests without an id get one derived from their text so resumes stay stable. An id seen on
+    # an earlier line gets the line number appended, so repeated requests keep separate run ids
+    # and reports.
+    seen: set[str] = set()
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield {"id": f"line-{line_number}", "ceo_request": "", "error": f"invalid JSON: {exc}"}
+            continue
+        if isinstance(payload, str):
+            payload = {"ceo_request": payload}
+        if not isinstance(payload, dict):
+            yield {"id": f"line-{line_number}", "ceo_request": "", "error": "expected a JSON object or string"}
+            continue
+        ceo_request = str(payload.get("ceo_request", "")).strip()
+        request_id = str(payload.get("id") or _request_id(ceo_request))
+        if request_id in seen:
+            request_id = f"{request_id}-line-{line_number}"
+        seen.add(request_id)
+        yield {"id": request_id, "ceo_request": ceo_request}
+
+
+def completed_request_ids(results_path: Path) -> set[str]:
+    completed: set[str] = set()
+    if not results_path.exists():
+        return completed
+    for line in results_path.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # A partially written last line from an interrupted batch.
+            continue
+        if isinstance(record, dict) and record.get("status") == "ok":
+            completed.add(str(record.get("id")))
+    return completed
+
+
+def process_request(
+    request: dict[str, Any],
+    mode: str | None,
+    max_concurrency: int | None,
+    report_dir: str,
+) -> dict[str, Any]:
+    # Imported here so that process-pool workers pay for the crew import graph once,
+    # and the parent process does not need it just to read and write JSONL.
+    from company_ai.main import execute_flow
+
+    started = time.perf_counter()
+    record: dict[str, Any] = {"id": request["id"], "status": "ok", "report_path": "", "timings": {}}
+    try:
+        if request.get("error"):
+            raise ValueError(request["error"])
+        if not request["ceo_request"]:
+            raise ValueError("CEO request is required.")
+        report_path = str(Path(report_dir) / f"{request['id']}.md")
+        record["run_id"] = safe_run_id(f"batch-{request['id']}")
+        state = execute_flow(
+            request["ceo_request"],
+            mode=mode,
+            max_concurrency=max_concurrency,
+            report_path=report_path,
+            run_id=record["run_id"],
+        )
+        record["report_path"] = state.report_location or state.final_report_path
+        record["timings"] = dict(state.stage_timings)
+    except Exception as exc:  # noqa: BLE001
+        record["status"] = "error"
+        record["error"] = str(exc)
+    record["duration_seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def run_batch(
+    requests: Iterable[dict[str, Any]],
+    output: TextIO,
+    workers: int = DEFAULT_WORKERS,
+    executor_kind: str = "thread",
+    mode: str | None = None,
+    max_concurrency: int | None = None,
+    report_dir: str = DEFAULT_REPORT_DIR,
+    skip_ids: set[str] | None = None,
+) -> dict[str, int]:
+    skip_ids = skip_ids or set()
+    summary = {"submitted": 0, "skipped": 0, "ok": 0, "error": 0}
+    executor_cls: type[Executor] = ProcessPoolExecutor if executor_kind == "process" else ThreadPoolExecutor
+
+    def emit(record: dict[str, Any]) -> None:
+        summary[record["status"]] += 1
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+
+    with executor_cls(max_workers=max(1, workers)) as executor:
+        futures: dict[Future[dict[str, Any]], dict[str, Any]] = {}
+        for request in requests:
+            if request["id"] in skip_ids:
+                summary["skipped"] += 1
+                continue
+            summary["submitted"] += 1
+            try:
+                futures[executor.submit(process_request, request, mode, max_concurrency, report_dir)] = request
+            except BrokenProcessPool as exc:
+                emit(_crashed_record(request, exc))
+
+        # Stream one record per request as soon as it finishes. A worker process that dies (for
+        # example killed for memory) breaks the pool: every request still in it is reported as
+        # an error instead of aborting the batch.
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except BrokenProcessPool as exc:
+                record = _crashed_record(futures[future], exc)
+            emit(record)
+    return summary
+
+
+def _crashed_record(request: dict[str, Any], exc: BaseException) -> dict[str, Any]:
+    return {
+        "id": request["id"],
+        "status": "error",
+        "report_path": "",
+        "timings": {},
+        "error": f"worker process crashed: {exc}",
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m company_ai.batch",
+        description="Run a JSONL file of CEO requests through the organization flow.",
+    )
+    parser.add_argument("input", help="JSONL file of CEO requests, or - for stdin")
+    parser.add_argument("--output", default="-", help="JSONL file for result records (default: stdout)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Requests processed at once")
+    parser.add_argument("--executor", choices=EXECUTORS, default="thread", help="Worker pool type")
+    parser.add_argument("--mode", choices=FLOW_MODES, default=None, help="Crew execution mode per request")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Crews to run at once in parallel mode")
+    parser.add_argument("--report-dir", default=DEFAULT_REPORT_DIR, help="Directory for per-request final reports")
+    parser.add_argument("--resume", action="store_true", help="Skip requests already completed in --output")
+    args = parser.parse_args(argv)
+
+    if args.resume and args.output == "-":
+        parser.error("--resume requires --output to point at a results file")
+
+    input_stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    skip_ids = completed_request_ids(Path(args.output)) if args.resume else set()
+    if args.output == "-":
+        output_stream = sys.stdout
+    else:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        output_stream = open(args.output, "a" if args.resume else "w", encoding="utf-8")
+
+    try:
+        summary = run_batch(
+            read_requests(input_stream),
+            output_stream,
+            workers=args.workers,
+            executor_kind=args.executor,
+            mode=args.mode,
+            max_concurrency=args.max_concurrency,
+            report_dir=args.report_dir,
+            skip_ids=skip_ids,
+        )
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+    print(
+        "Batch completed. "
+        f"ok={summary['ok']} error={summary['error']} skipped={summary['skipped']}",
+        file=sys.stderr,
+    )
+    return 0 if summary["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import secrets
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+
+CHECKPOINT_VERSION = 1
+_RUN_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,127}$")
+
+
+def _package_dir() -> Path:
+    return Path(__file__).resolve().parent
+
+
+def checkpoint_dir() -> Path:
+    return _package_dir() / "artifacts" / "state" / "runs"
+
+
+def new_run_id() -> str:
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+
+
+def safe_run_id(name: str) -> str:
+    # Turns an arbitrary label (such as a batch request id) into a valid run id.
+    run_id = re.sub(r"[^A-Za-z0-9._-]+", "-", name).strip("-.")[:128]
+    return run_id or hashlib.sha1(name.encode("utf-8")).hexdigest()[:12]
+
+
+def checkpoint_path(run_id: str) -> Path:
+    if not _RUN_ID_PATTERN.match(run_id):
+        raise ValueError(f"Invalid run id '{run_id}': use letters, digits, '.', '_' and '-'.")
+    return checkpoint_dir() / f"{run_id}.json"
+
+
+def request_fingerprint(ceo_request: str) -> str:
+    return hashlib.sha256(ceo_request.strip().encode("utf-8")).hexdigest()
+
+
+def config_fingerprint() -> str:
+    # Covers the flow config and every crew's agents/tasks definitions.
+    package_dir = _package_dir()
+    digest = hashlib.sha256()
+    paths = [package_dir / "config" / "flow.yaml", *sorted(package_dir.glob("crews/*/config/*.yaml"))]
+    for path in paths:
+        digest.update(path.relative_to(package_dir).as_posix().encode("utf-8") + b"\0")
+        digest.update(path.read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+def write_json_atomic(path: Path, payload: dict[str, Any]) -> None:
+    write_text_atomic(path, json.dumps(payload, indent=2))
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    write_bytes_atomic(path, text.encode("utf-8"))
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    # Writes to a temporary file in the same directory and renames it over the previous
+    # file, so a crash mid-write never leaves a truncated file behind.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.stem}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def write_checkpoint(run_id: str, state: dict[str, Any]) -> Path:
+    path = checkpoint_path(run_id)
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "run_id": run_id,
+        "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "request_sha256": request_fingerprint(state.get("ceo_request", "")),
+        "config_sha256": config_fingerprint(),
+        "state": state,
+    }
+    write_json_atomic(path, payload)
+    return path
+
+
+def load_checkpoint(run_id: str, ceo_request: str | None = None) -> dict[str, Any]:
+    # Returns the saved state after checking that neither the request nor the config changed.
+    path = checkpoint_path(run_id)
+    if not path.exists():
+        raise ValueError(f"No checkpoint found for run '{run_id}' at {path}.")
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Checkpoint for run '{run_id}' has unsupported version {payload.get('version')}.")
+    if ceo_request and request_fingerprint(ceo_request) != payload["request_sha256"]:
+        raise ValueError(f"CEO request differs from the one run '{run_id}' was started with.")
+    if config_fingerprint() != payload["config_sha256"]:
+        raise ValueError(
+            f"Flow or crew configuration changed since run '{run_id}' was checkpointed; start a new run instead."
+        )
+    return payload["state"]
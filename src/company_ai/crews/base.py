@@ -0,0 +1,532 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+from crewai import Agent, Crew, Process, Task
+from crewai.agents.agent_builder.utilities.base_token_process import TokenProcess
+from crewai.llms.base_llm import BaseLLM
+from crewai.tasks.task_output import TaskOutput
+from crewai.types.usage_metrics import UsageMetrics
+
+from company_ai.artifact_store import current_artifacts
+from company_ai.digest import markdown_digest
+from company_ai.llm import build_llm, llm_signature
+from company_ai.profiling import profile_section
+from company_ai.scheduling import run_dag, topological_order
+from company_ai.settings import (
+    context_digest_chars,
+    context_mode as resolve_context_mode,
+    crew_cache_enabled,
+    llm_mode as resolve_llm_mode,
+    task_max_concurrency,
+    task_mode,
+    task_reuse_enabled,
+)
+from company_ai.task_store import TaskOutputStore, fingerprint
+from company_ai.telemetry import record_span, span, token_counts
+from company_ai.tools import build_internet_tools, shared_internet_tools, tool_output_pager
+
+
+CONFIG_FILES = ("agents.yaml", "tasks.yaml")
+
+_ConfigSignature = tuple[Any, ...]
+
+
+def _load_yaml(path: Path) -> dict[str, Any]:
+    return yaml.safe_load(path.read_text(encoding="utf-8"))
+
+
+def _config_signature(base_dir: Path) -> _ConfigSignature:
+    # Everything that shapes the agents built from a template: the config files, the LLM mode
+    # and what the LLMs are built from (model name, completion store, stub script).
+    signature: list[Any] = []
+    for name in CONFIG_FILES:
+        stat = (base_dir / "config" / name).stat()
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    signature.append(os.getenv("COMPANY_AI_LLM_MODE", ""))
+    signature.append(llm_signature())
+    return tuple(signature)
+
+
+def _reset_agent(agent: Agent) -> None:
+    # Clear what an Agent accumulates while executing tasks so the next run starts clean.
+    agent.tools_results = []
+    agent.agent_executor = None
+    agent.crew = None
+    agent._times_executed = 0
+    # Token counters too, or crewai's CrewOutput.token_usage keeps growing across runs.
+    agent._token_process = TokenProcess()
+    if isinstance(agent.llm, BaseLLM):
+        agent.llm._token_usage = dict.fromkeys(agent.llm._token_usage, 0)
+
+
+def _usage_snapshot(agents: Iterable[Agent]) -> UsageMetrics:
+    # crewai counts tokens on each agent's LLM (or on the agent for models it wraps itself) for
+    # the lifetime of that object, and CrewOutput.token_usage reports those running totals, so
+    # the tokens of one kickoff are the difference between snapshots taken around it.
+    usage = UsageMetrics()
+    for agent in agents:
+        if isinstance(agent.llm, BaseLLM):
+            usage.add_usage_metrics(agent.llm.get_token_usage_summary())
+        else:
+            usage.add_usage_metrics(agent._token_process.get_summary())
+    return usage
+
+
+@dataclass
+class CrewTemplate:
+    # Parsed configuration of one crew plus idle agent sets built from it. Agents keep
+    # per-execution state, so a set is checked out by one run at a time and reset when returned.
+    signature: _ConfigSignature
+    agents_config: dict[str, Any]
+    tasks_config: dict[str, Any]
+    cached: bool = True
+    _idle_agents: list[dict[str, Agent]] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @classmethod
+    def load(cls, base_dir: Path, cached: bool = True) -> CrewTemplate:
+        signature = _config_signature(base_dir)
+        return cls(
+            signature,
+            _load_yaml(base_dir / "config" / "agents.yaml"),
+            _load_yaml(base_dir / "config" / "tasks.yaml"),
+            cached=cached,
+        )
+
+    def checkout(self) -> dict[str, Agent] | None:
+        with self._lock:
+            return self._idle_agents.pop() if self._idle_agents else None
+
+    def checkin(self, agents: dict[str, Agent]) -> None:
+        for agent in agents.values():
+            _reset_agent(agent)
+        with self._lock:
+            self._idle_agents.append(agents)
+
+
+_templates: dict[Path, CrewTemplate] = {}
+_templates_lock = threading.Lock()
+_template_stats = {"hits": 0, "misses": 0, "invalidations": 0, "agent_sets_built": 0, "agent_sets_reused": 0}
+
+
+def crew_template(base_dir: Path) -> CrewTemplate:
+    # Returns the cached template for base_dir, reparsing the configs when either file changed.
+    if not crew_cache_enabled():
+        return CrewTemplate.load(base_dir, cached=False)
+    signature = _config_signature(base_dir)
+    with _templates_lock:
+        template = _templates.get(base_dir)
+        if template is not None and template.signature == signature:
+            _template_stats["hits"] += 1
+            return template
+        _template_stats["invalidations" if template is not None else "misses"] += 1
+        template = _templates[base_dir] = CrewTemplate.load(base_dir)
+        return template
+
+
+def crew_template_stats() -> dict[str, int]:
+    with _templates_lock:
+        return {**_template_stats, "templates": len(_templates)}
+
+
+def clear_crew_templates() -> None:
+    with _templates_lock:
+        _templates.clear()
+
+
+class BaseCrew(ABC):
+    def __init__(self, base_dir: Path) -> None:
+        self.base_dir = base_dir
+        self.template = crew_template(base_dir)
+        self.agents_config = self.template.agents_config
+        self.tasks_config = self.template.tasks_config
+        # Which tasks the last run reused from the task store, which it executed, and the time saved.
+        self.reuse_report: dict[str, Any] = {}
+        # Wall time in seconds of each task the last run executed.
+        self.task_timings: dict[str, float] = {}
+        # LLM tokens used by the last run, as reported by crewai (empty when the model reports none).
+        self.token_usage: dict[str, int] = {}
+        # Characters of the task prompt and of the context in it, for each task the last run executed.
+        self.prompt_sizes: dict[str, dict[str, int]] = {}
+
+    def _make_agent(self, name: str, tools: list[Any] | None = None, llm_mode: str | None = None) -> Agent:
+        # llm_mode (live, record, replay or stub) takes precedence over the agent's llm_mode in
+        # agents.yaml, which takes precedence over COMPANY_AI_LLM_MODE.
+        cfg = self.agents_config[name]
+        internet_tools = shared_internet_tools() if self.template.cached else build_internet_tools()
+        role_tools = [*internet_tools, *(tools or [])]
+        pager = tool_output_pager()
+        if pager is not None:
+            role_tools.append(pager)
+        agent_kwargs: dict[str, Any] = {}
+        llm = build_llm(name, resolve_llm_mode(llm_mode or cfg.get("llm_mode")))
+        if llm is not None:
+            agent_kwargs["llm"] = llm
+        return Agent(
+            role=cfg["role"],
+            goal=cfg["goal"],
+            backstory=cfg["backstory"],
+            allow_delegation=cfg.get("allow_delegation", False),
+            verbose=cfg.get("verbose", False),
+            tools=role_tools,
+            **agent_kwargs,
+        )
+
+    @abstractmethod
+    def _build_agents(self) -> dict[str, Agent]: ...
+
+    @contextmanager
+    def checkout_agents(self) -> Iterator[dict[str, Agent]]:
+        # Reuses an idle agent set of this crew's template, or builds one, for the duration of a run.
+        agents = self.template.checkout()
+        with _templates_lock:
+            _template_stats["agent_sets_reused" if agents is not None else "agent_sets_built"] += 1
+        if agents is None:
+            agents = self._build_agents()
+        try:
+            yield agents
+        finally:
+            self.template.checkin(agents)
+
+    def task_dependencies(self) -> dict[str, list[str]]:
+        # A task also waits for every task named in its context: list.
+        return {
+            key: list(dict.fromkeys([*(cfg.get("depends_on") or []), *(cfg.get("context") or [])]))
+            for key, cfg in self.tasks_config.items()
+        }
+
+    def ordered_task_keys(self) -> list[str]:
+        return topological_order(self.task_dependencies())
+
+    def execution_dependencies(self, dag: bool) -> dict[str, list[str]]:
+        # The tasks each task waits for: its declared dependencies in DAG mode, and every earlier
+        # task under Process.sequential.
+        if dag:
+            return self.task_dependencies()
+        ordered = self.ordered_task_keys()
+        return {task_key: ordered[:index] for index, task_key in enumerate(ordered)}
+
+    def explicit_context(self) -> dict[str, list[str]]:
+        # The context: lists of the tasks that declare one in tasks.yaml (an empty list means none).
+        return {
+            key: list(cfg["context"] or [])
+            for key, cfg in self.tasks_config.items()
+            if "context" in cfg and cfg["context"] is not None
+        }
+
+    def context_dependencies(self, dag: bool) -> dict[str, list[str]]:
+        # The tasks whose outputs each task sees as context: its context: list when it has one,
+        # otherwise the tasks it waits for.
+        return {**self.execution_dependencies(dag), **self.explicit_context()}
+
+    def context_modes(self) -> dict[str, str]:
+        return {key: resolve_context_mode(cfg.get("context_mode")) for key, cfg in self.tasks_config.items()}
+
+    def input_fingerprints(self, agents: dict[str, Agent], ceo_request: str) -> dict[str, str]:
+        # What each task is given apart from its context: prompt, agent, tools, model and script.
+        modes = self.context_modes()
+        fingerprints: dict[str, str] = {}
+        for task_key, cfg in self.tasks_config.items():
+            agent = agents[cfg["agent"]]
+            fingerprints[task_key] = fingerprint(
+                {
+                    "description": cfg["description"].format(ceo_request=ceo_request),
+                    "expected_output": cfg["expected_output"],
+                    "output_file": cfg["output_file"],
+                    "agent": self.agents_config[cfg["agent"]],
+                    "tools": sorted(f"{tool.name}:{type(tool).__qualname__}" for tool in agent.tools or []),
+                    "model": str(getattr(agent.llm, "model", agent.llm)),
+                    "llm_script": getattr(agent.llm, "script", None),
+                    "context_mode": modes[task_key],
+                }
+            )
+        return fingerprints
+
+    @staticmethod
+    def task_fingerprint(input_fingerprint: str, upstream_outputs: Iterable[str]) -> str:
+        # Chained like a build system on results rather than inputs: a task's fingerprint covers
+        # its own inputs and the sha256 of each context task's actual output, so a changed
+        # upstream output invalidates it, and an upstream rerun that produced the same output
+        # does not.
+        return fingerprint(
+            {
+                "inputs": input_fingerprint,
+                "upstream": [hashlib.sha256(output.encode("utf-8")).hexdigest() for output in upstream_outputs],
+            }
+        )
+
+    def _build_task_map(
+        self,
+        agents: dict[str, Agent],
+        ceo_request: str,
+        context: dict[str, list[str]] | None = None,
+    ) -> dict[str, Task]:
+        # output_file is not passed to crewai, which would write it in place relative to the
+        # working directory; _execute writes task outputs to the run's artifact store instead.
+        tasks: dict[str, Task] = {}
+        for task_key in self.ordered_task_keys():
+            cfg = self.tasks_config[task_key]
+            task_kwargs: dict[str, Any] = {}
+            if context is not None and task_key in context:
+                # Without it a task under Process.sequential sees every earlier output, and a task
+                # running in its own crew sees none.
+                task_kwargs["context"] = [tasks[upstream] for upstream in context[task_key]]
+            tasks[task_key] = Task(
+                description=cfg["description"].format(ceo_request=ceo_request),
+                expected_output=cfg["expected_output"],
+                agent=agents[cfg["agent"]],
+                **task_kwargs,
+            )
+        return tasks
+
+    def _build_tasks(self, agents: dict[str, Agent], ceo_request: str) -> list[Task]:
+        return list(self._build_task_map(agents, ceo_request, self.explicit_context()).values())
+
+    def crew(self, ceo_request: str, agents: dict[str, Agent] | None = None) -> Crew:
+        # Tasks are rebuilt for every request since their descriptions embed the CEO request.
+        agents = self._build_agents() if agents is None else agents
+        tasks = self._build_tasks(agents, ceo_request)
+        return Crew(
+            agents=list(agents.values()),
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+        )
+
+    def run(self, ceo_request: str) -> str:
+        return self._run(ceo_request, dag=task_mode() == "dag")
+
+    def run_dag(self, ceo_request: str, max_concurrency: int | None = None) -> str:
+        return self._run(ceo_request, dag=True, max_concurrency=max_concurrency)
+
+    def _run(self, ceo_request: str, dag: bool, max_concurrency: int | None = None) -> str:
+        with span(
+            self.base_dir.name,
+            "crew",
+            task_mode="dag" if dag else "sequential",
+            bytes_in=len(ceo_request.encode("utf-8")),
+        ) as current:
+            output = self._execute(ceo_request, dag, max_concurrency)
+            if current is not None:
+                current.attributes.update(
+                    bytes_out=len(output.encode("utf-8")),
+                    tasks_executed=len(self.reuse_report["executed"]),
+                    tasks_reused=len(self.reuse_report["reused"]),
+                    **self.token_usage,
+                )
+            return output
+
+    def _execute(self, ceo_request: str, dag: bool, max_concurrency: int | None = None) -> str:
+        store = TaskOutputStore() if task_reuse_enabled() else None
+        artifacts = current_artifacts()
+        context = self.context_dependencies(dag)
+        with self.checkout_agents() as agents:
+            inputs = self.input_fingerprints(agents, ceo_request)
+            reused: dict[str, dict[str, Any]] = {}
+
+            def reusable(task_key: str, outputs: Mapping[str, str]) -> dict[str, Any] | None:
+                # outputs holds the actual outputs of the task's context tasks.
+                if store is None:
+                    return None
+                output_file = self.tasks_config[task_key]["output_file"]
+                task_fingerprint = self.task_fingerprint(inputs[task_key], (outputs[key] for key in context[task_key]))
+                record = store.reusable(output_file, task_fingerprint)
+                if record is not None:
+                    # A new run starts with an empty namespace; unchanged artifacts are not rewritten.
+                    artifacts.write(output_file, record["output"])
+                return record
+
+            # Tasks whose context tasks are all reused are decided up front; the others once their
+            # context tasks have run, as that is when their outputs are known.
+            for task_key in self.ordered_task_keys():
+                if all(upstream in reused for upstream in context[task_key]):
+                    record = reusable(task_key, {key: reused[key]["output"] for key in context[task_key]})
+                    if record is not None:
+                        reused[task_key] = record
+            stored = store is not None and any(store.has(cfg["output_file"]) for cfg in self.tasks_config.values())
+
+            modes = self.context_modes()
+            digest = any(mode == "digest" for mode in modes.values())
+            if not dag and not stored and not digest:
+                tasks = self._build_task_map(agents, ceo_request, self.explicit_context())
+                baseline = _usage_snapshot(agents.values())
+                Crew(
+                    agents=list(agents.values()),
+                    tasks=list(tasks.values()),
+                    process=Process.sequential,
+                    verbose=True,
+                ).kickoff(inputs={"ceo_request": ceo_request})
+                durations = {task_key: task.execution_duration or 0.0 for task_key, task in tasks.items()}
+                self.token_usage = token_counts(_usage_snapshot(agents.values()), baseline)
+                self.prompt_sizes = {task_key: _prompt_size(task) for task_key, task in tasks.items()}
+                for task_key, task in tasks.items():
+                    if task.start_time is not None and task.end_time is not None:
+                        record_span(
+                            task_key,
+                            "task",
+                            int(task.start_time.timestamp() * 1e9),
+                            int(task.end_time.timestamp() * 1e9),
+                            **_task_attributes(task),
+                        )
+            else:
+                # Runs with stored outputs, digest or DAG runs execute task by task; a sequential
+                # crew keeps its semantics because tasks still run in order and receive the same
+                # context.
+                tasks = self._build_task_map(agents, ceo_request, context)
+                durations, self.token_usage = self._run_task_graph(
+                    tasks,
+                    ceo_request,
+                    self.execution_dependencies(dag),
+                    {task_key: context[task_key] for task_key, mode in modes.items() if mode == "digest"},
+                    reused,
+                    (max_concurrency or task_max_concurrency()) if dag else 1,
+                    lambda task_key: reusable(task_key, _raw_outputs(tasks, context[task_key])),
+                )
+
+        for task_key, seconds in durations.items():
+            output = tasks[task_key].output
+            if output is not None:
+                artifacts.write(self.tasks_config[task_key]["output_file"], output.raw)
+                if store is not None:
+                    store.put(
+                        self.tasks_config[task_key]["output_file"],
+                        self.task_fingerprint(inputs[task_key], _raw_outputs(tasks, context[task_key]).values()),
+                        output.raw,
+                        seconds,
+                        crew=self.base_dir.name,
+                        task=task_key,
+                    )
+        self.task_timings = {task_key: round(seconds, 3) for task_key, seconds in durations.items()}
+        self.reuse_report = {
+            "reused": [task_key for task_key in tasks if task_key in reused],
+            "executed": list(durations),
+            "seconds_saved": round(sum(record.get("seconds", 0.0) for record in reused.values()), 3),
+        }
+        # Match Process.sequential, which returns the output of the last task.
+        last_output = tasks[self.ordered_task_keys()[-1]].output
+        return last_output.raw if last_output is not None else ""
+
+    def _run_task_graph(
+        self,
+        tasks: dict[str, Task],
+        ceo_request: str,
+        dependencies: dict[str, list[str]],
+        digests: dict[str, list[str]],
+        reused: dict[str, dict[str, Any]],
+        max_concurrency: int,
+        reusable: Callable[[str], dict[str, Any] | None],
+    ) -> tuple[dict[str, float], dict[str, int]]:
+        # Runs every task that was not reused in its own single-task crew once its dependencies
+        # are done; reused tasks get their stored output so downstream context still sees it.
+        # The other tasks are looked up with reusable when their turn comes, and added to reused
+        # on a hit. Tasks in digests get digests of the outputs of the listed tasks as their context.
+        # Returns the execution time of each task that actually ran and the tokens they used.
+        for task_key, record in reused.items():
+            tasks[task_key].output = _stored_output(tasks[task_key], record)
+        # An Agent keeps per-execution state, so tasks sharing an agent never overlap.
+        agent_locks = {agent_name: threading.Lock() for agent_name in self.agents_config}
+        durations: dict[str, float] = {}
+        token_usage: Counter[str] = Counter()
+        usage_lock = threading.Lock()
+        self.prompt_sizes = {}
+        digest_chars = context_digest_chars()
+
+        def run_task(task_key: str) -> None:
+            task = tasks[task_key]
+            record = reusable(task_key)
+            if record is not None:
+                task.output = _stored_output(task, record)
+                with usage_lock:
+                    reused[task_key] = record
+                return
+            if task_key in digests:
+                task.context = [
+                    _digest_task(tasks[upstream], self.tasks_config[upstream]["output_file"], digest_chars)
+                    for upstream in digests[task_key]
+                ]
+            with (
+                agent_locks[self.tasks_config[task_key]["agent"]],
+                profile_section("task", task_key),
+                span(task_key, "task") as current,
+            ):
+                baseline = _usage_snapshot([task.agent])
+                started = time.perf_counter()
+                Crew(
+                    agents=[task.agent],
+                    tasks=[task],
+                    process=Process.sequential,
+                    verbose=True,
+                ).kickoff(inputs={"ceo_request": ceo_request})
+                durations[task_key] = time.perf_counter() - started
+                tokens = token_counts(_usage_snapshot([task.agent]), baseline)
+                with usage_lock:
+                    token_usage.update(tokens)
+                    self.prompt_sizes[task_key] = _prompt_size(task)
+                if current is not None:
+                    current.attributes.update(_task_attributes(task), **tokens)
+
+        jobs = {
+            task_key: (lambda: None) if task_key in reused else (lambda key=task_key: run_task(key))
+            for task_key in tasks
+        }
+        run_dag(jobs, dependencies, max_concurrency)
+        # Report prompt sizes in task order rather than completion order.
+        self.prompt_sizes = {key: self.prompt_sizes[key] for key in tasks if key in self.prompt_sizes}
+        return durations, dict(token_usage)
+
+
+def _raw_outputs(tasks: dict[str, Task], task_keys: list[str]) -> dict[str, str]:
+    return {key: tasks[key].output.raw if tasks[key].output is not None else "" for key in task_keys}
+
+
+def _stored_output(task: Task, record: dict[str, Any]) -> TaskOutput:
+    return TaskOutput(
+        description=task.description,
+        expected_output=task.expected_output,
+        raw=record["output"],
+        agent=task.agent.role if task.agent is not None else "",
+    )
+
+
+def _prompt_size(task: Task) -> dict[str, int]:
+    # crewai keeps the context it rendered into the prompt of the last execution in prompt_context.
+    context_chars = len(task.prompt_context or "")
+    return {"prompt_chars": len(task.prompt()) + context_chars, "context_chars": context_chars}
+
+
+def _digest_task(task: Task, output_file: str, max_chars: int) -> Task:
+    # A stand-in context task whose output is a digest of task's output; crewai only reads the
+    # outputs of context tasks.
+    raw = task.output.raw if task.output is not None else ""
+    return Task(
+        description=f"Digest of: {task.description}",
+        expected_output=task.expected_output,
+        output=TaskOutput(
+            description=task.description,
+            expected_output=task.expected_output,
+            raw=markdown_digest(raw, max_chars, output_file),
+            agent=task.agent.role if task.agent is not None else "",
+        ),
+    )
+
+
+def _task_attributes(task: Task) -> dict[str, Any]:
+    output = task.output.raw if task.output is not None else ""
+    return {
+        "agent": task.agent.role if task.agent is not None else "",
+        "bytes_in": len(task.description.encode("utf-8")),
+        "bytes_out": len(output.encode("utf-8")),
+        **_prompt_size(task),
+    }
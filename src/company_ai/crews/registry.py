@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import importlib
+import threading
+from collections.abc import Iterator, Mapping
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from company_ai.crews.base import BaseCrew
+
+
+class CrewRegistry(Mapping[str, "type[BaseCrew]"]):
+    # Maps crew names to "module:Class" paths and imports a crew module (and with it crewai and
+    # the crew's tools) only when that crew is first looked up. Listing the names imports nothing.
+
+    def __init__(self, paths: dict[str, str]) -> None:
+        self._paths = dict(paths)
+        self._loaded: dict[str, type[BaseCrew]] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> type[BaseCrew]:
+        with self._lock:
+            crew_class = self._loaded.get(name)
+            if crew_class is None:
+                module_name, class_name = self._paths[name].split(":")
+                crew_class = self._loaded[name] = getattr(importlib.import_module(module_name), class_name)
+            return crew_class
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def loaded(self) -> list[str]:
+        with self._lock:
+            return list(self._loaded)
+
+
+CREWS = CrewRegistry(
+    {
+        "technical": "company_ai.crews.tech_crew:TechnicalCrew",
+        "finance": "company_ai.crews.finance_crew:FinanceCrew",
+        "compliance": "company_ai.crews.compliance_crew:ComplianceCrew",
+        "marketing": "company_ai.crews.marketing_crew:MarketingCrew",
+    }
+)
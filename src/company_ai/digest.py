@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import re
+
+
+HEADING = re.compile(r"^\s{0,3}#{1,6}\s+\S")
+BULLET = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+\S")
+LEAD_CHARS = 240
+BULLET_CHARS = 120
+BULLETS_PER_SECTION = 3
+
+
+def _clip(line: str, limit: int) -> str:
+    line = line.rstrip()
+    return line if len(line) <= limit else f"{line[: limit - 3].rstrip()}..."
+
+
+def markdown_digest(text: str, max_chars: int, source: str = "") -> str:
+    # An extractive summary of a markdown document, without a model call: every heading, the
+    # first line of prose under each heading and its first few bullets, in document order. Lines
+    # are kept by priority (headings, then lead lines, then bullets) until max_chars is reached.
+    footer = f"[digest of {len(text)} characters" + (f"; full document: {source}]" if source else "]")
+    if len(text) + len(footer) + 1 <= max_chars:
+        return text
+
+    candidates: list[tuple[int, int, str]] = []
+    has_lead = False
+    bullets = 0
+    in_code = False
+    for index, line in enumerate(text.splitlines()):
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+            continue
+        if in_code or not line.strip():
+            continue
+        if HEADING.match(line):
+            candidates.append((0, index, _clip(line, LEAD_CHARS)))
+            has_lead, bullets = False, 0
+        elif BULLET.match(line):
+            if bullets < BULLETS_PER_SECTION:
+                candidates.append((2, index, _clip(line, BULLET_CHARS)))
+            bullets += 1
+        elif not has_lead:
+            candidates.append((1, index, _clip(line, LEAD_CHARS)))
+            has_lead = True
+
+    budget = max_chars - len(footer) - 1
+    kept: list[tuple[int, str]] = []
+    for _, index, line in sorted(candidates):
+        if len(line) + 1 > budget:
+            continue
+        kept.append((index, line))
+        budget -= len(line) + 1
+    return "\n".join([*(line for _, line in sorted(kept)), footer])
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import threading
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from crewai.flow.flow import Flow, listen, start
+
+from company_ai.artifact_store import current_artifacts, is_artifact_path
+from company_ai.checkpoint import write_checkpoint, write_text_atomic
+from company_ai.crews.registry import CREWS
+from company_ai.profiling import profile_section, profiled
+from company_ai.scheduling import run_dag
+from company_ai.settings import crew_dependencies, flow_max_concurrency
+
+
+CREW_OUTPUT_FIELDS = {
+    "technical": "technical_output",
+    "finance": "finance_output",
+    "compliance": "compliance_output",
+    "marketing": "marketing_output",
+}
+
+
+class OrganizationState(BaseModel):
+    id: str = Field(default="organization-flow")
+    ceo_request: str = Field(default="")
+    technical_output: str = Field(default="")
+    finance_output: str = Field(default="")
+    compliance_output: str = Field(default="")
+    marketing_output: str = Field(default="")
+    final_report_path: str = Field(default="src/company_ai/artifacts/reports/final_orchestration_report.md")
+    # Where the artifact store put the final report (the run's copy of final_report_path).
+    report_location: str = Field(default="")
+    max_concurrency: int = Field(default=0)
+    stage_timings: dict[str, float] = Field(default_factory=dict)
+    run_id: str = Field(default="")
+    completed_steps: list[str] = Field(default_factory=list)
+    task_reuse: dict[str, dict[str, Any]] = Field(default_factory=dict)
+
+
+class OrganizationFlow(Flow[OrganizationState]):
+    initial_state = OrganizationState
+
+    @start()
+    @profiled("step")
+    def run_technical(self) -> str:
+        ceo_request = self.state.ceo_request.strip()
+        if not ceo_request:
+            raise ValueError("CEO request is required.")
+        return _run_stage(self.state, "technical")
+
+    @listen(run_technical)
+    @profiled("step")
+    def run_finance_and_compliance(self) -> dict[str, str]:
+        _run_stage(self.state, "finance")
+        _run_stage(self.state, "compliance")
+        return {
+            "finance_output": self.state.finance_output,
+            "compliance_output": self.state.compliance_output,
+        }
+
+    @listen(run_finance_and_compliance)
+    @profiled("step")
+    def run_marketing(self) -> str:
+        return _run_stage(self.state, "marketing")
+
+    @listen(run_marketing)
+    @profiled("step")
+    def finalize(self) -> str:
+        return _write_final_report(self.state)
+
+
+class ParallelOrganizationFlow(Flow[OrganizationState]):
+    initial_state = OrganizationState
+
+    @start()
+    @profiled("step")
+    def run_crews(self) -> dict[str, str]:
+        ceo_request = self.state.ceo_request.strip()
+        if not ceo_request:
+            raise ValueError("CEO request is required.")
+
+        dependencies = crew_dependencies()
+        unknown = sorted(set(dependencies) - set(CREWS))
+        if unknown:
+            raise ValueError(f"Unknown crews in flow config: {', '.join(unknown)}")
+        state = self.state
+        jobs = {
+            name: partial(_completed_crew, state, name)
+            if name in state.completed_steps
+            else partial(_run_crew, name, ceo_request)
+            for name in dependencies
+        }
+        # Each crew is recorded and checkpointed as soon as it finishes.
+        outputs = run_dag(
+            jobs,
+            dependencies,
+            state.max_concurrency or flow_max_concurrency(),
+            on_result=lambda name, result: _record_stage(state, name, *result),
+        )
+
+        # Reorder by topology (not completion order) so the final state is reproducible.
+        state.stage_timings = {name: state.stage_timings[name] for name in outputs}
+        state.completed_steps = list(outputs)
+        state.task_reuse = {name: state.task_reuse[name] for name in outputs if name in state.task_reuse}
+        return {name: output for name, (output, *_) in outputs.items()}
+
+    @listen(run_crews)
+    @profiled("step")
+    def finalize(self) -> str:
+        return _write_final_report(self.state)
+
+
+def _run_crew(name: str, ceo_request: str) -> tuple[str, float, dict[str, Any]]:
+    started = time.perf_counter()
+    with profile_section("crew", name):
+        crew = CREWS[name]()
+        output = crew.run(ceo_request)
+    return output, round(time.perf_counter() - started, 3), crew.reuse_report
+
+
+def _completed_crew(state: OrganizationState, name: str) -> tuple[str, float, dict[str, Any]]:
+    output = getattr(state, CREW_OUTPUT_FIELDS[name])
+    return output, state.stage_timings.get(name, 0.0), state.task_reuse.get(name, {})
+
+
+def _run_stage(state: OrganizationState, name: str) -> str:
+    if name in state.completed_steps:
+        return getattr(state, CREW_OUTPUT_FIELDS[name])
+    output, elapsed, reuse = _run_crew(name, state.ceo_request)
+    _record_stage(state, name, output, elapsed, reuse)
+    return output
+
+
+_checkpoint_lock = threading.Lock()
+
+
+def _record_stage(
+    state: OrganizationState,
+    name: str,
+    output: str,
+    elapsed: float,
+    reuse: dict[str, Any] | None = None,
+) -> None:
+    with _checkpoint_lock:
+        if name in state.completed_steps:
+            return
+        if name in CREW_OUTPUT_FIELDS:
+            setattr(state, CREW_OUTPUT_FIELDS[name], output)
+        state.stage_timings[name] = elapsed
+        if reuse:
+            state.task_reuse[name] = reuse
+        state.completed_steps.append(name)
+        if state.run_id:
+            write_checkpoint(state.run_id, state.model_dump(exclude={"id"}))
+
+
+def _write_final_report(state: OrganizationState) -> str:
+    started = time.perf_counter()
+    report = "\n".join(
+        [
+            "# ai_company Orchestration Report",
+            "",
+            f"## CEO Request",
+            state.ceo_request,
+            "",
+            "## Technical Crew Output",
+            state.technical_output,
+            "",
+            "## Finance Crew Output",
+            state.finance_output,
+            "",
+            "## Compliance Crew Output",
+            state.compliance_output,
+            "",
+            "## Marketing Crew Output",
+            state.marketing_output,
+            *_task_reuse_lines(state),
+        ]
+    )
+    # Reports inside the artifacts directory belong to the run; any other path is written as given.
+    if is_artifact_path(state.final_report_path):
+        state.report_location = current_artifacts().write(state.final_report_path, report)["location"]
+    else:
+        write_text_atomic(Path(state.final_report_path), report)
+        state.report_location = state.final_report_path
+    state.completed_steps = [step for step in state.completed_steps if step != "finalize"]
+    _record_stage(state, "finalize", state.report_location, round(time.perf_counter() - started, 3))
+    return state.report_location
+
+
+def _task_reuse_lines(state: OrganizationState) -> list[str]:
+    if not any(reuse.get("reused") for reuse in state.task_reuse.values()):
+        return []
+    lines = ["", "## Task Reuse", ""]
+    for name, reuse in state.task_reuse.items():
+        reused = ", ".join(reuse.get("reused", [])) or "none"
+        lines.append(
+            f"- {name}: reused {reused}; executed {len(reuse.get('executed', []))} task(s); "
+            f"saved ~{reuse.get('seconds_saved', 0.0)}s"
+        )
+    total = sum(reuse.get("seconds_saved", 0.0) for reuse in state.task_reuse.values())
+    lines.append(f"- total time saved: ~{round(total, 3)}s")
+    return lines
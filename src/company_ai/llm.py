@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+from crewai import LLM
+from crewai.llms.base_llm import BaseLLM
+from pydantic import Field, PrivateAttr
+
+from company_ai.checkpoint import write_json_atomic
+
+
+DEFAULT_MODEL_NAME = "gpt-4o-mini"
+DEFAULT_STUB_ANSWER = "Stub output from {agent} for: {task}"
+
+
+def default_llm_store_dir() -> Path:
+    configured = os.getenv("COMPANY_AI_LLM_STORE", "").strip()
+    return Path(configured) if configured else Path(__file__).resolve().parent / "artifacts" / "state" / "llm"
+
+
+def _model_name() -> str:
+    return os.getenv("OPENAI_MODEL_NAME", "").strip() or DEFAULT_MODEL_NAME
+
+
+def _file_stamp(path: str) -> tuple[int, int] | None:
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def llm_signature() -> tuple[Any, ...]:
+    # What build_llm reads besides the mode, for caches of agents built with it: the model name,
+    # the completion store of record/replay and the stub script (with its mtime and size).
+    script_path = os.getenv("COMPANY_AI_LLM_STUB_SCRIPT", "").strip()
+    return _model_name(), str(default_llm_store_dir()), script_path, _file_stamp(script_path) if script_path else None
+
+
+def simulated_latency(recorded: float) -> float:
+    # COMPANY_AI_LLM_LATENCY is either "recorded" (replay the latency measured while recording)
+    # or a fixed number of seconds per call.
+    raw_latency = os.getenv("COMPANY_AI_LLM_LATENCY", "recorded").strip().lower()
+    if raw_latency in ("", "recorded"):
+        return recorded
+    try:
+        return max(0.0, float(raw_latency))
+    except ValueError:
+        return recorded
+
+
+def _normalize_messages(messages: str | list[Any]) -> list[dict[str, Any]]:
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+    return [{"role": message.get("role", "user"), "content": message.get("content", "")} for message in messages]
+
+
+def prompt_key(model: str, messages: str | list[Any]) -> str:
+    payload = {"model": model, "messages": _normalize_messages(messages)}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class CompletionStore:
+    # Content-addressed prompt -> completion store: one JSON file per prompt, named after the
+    # SHA-256 of the model and messages, so identical prompts share a recording.
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = root or default_llm_store_dir()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        try:
+            return json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, model: str, messages: str | list[Any], completion: str, latency: float) -> None:
+        write_json_atomic(
+            self._path(key),
+            {
+                "key": key,
+                "model": model,
+                "messages": _normalize_messages(messages),
+                "completion": completion,
+                "latency_seconds": round(latency, 3),
+                "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+        )
+
+
+class RecordReplayLLM(BaseLLM):
+    # In "record" mode every call goes to the live model and the completion is stored; in
+    # "replay" mode completions are served from the store, with simulated latency, and a prompt
+    # that was never recorded is an error. Calls use the text (ReAct) tool protocol so that a
+    # completion is always plain text and replays exactly.
+
+    llm_type: str = "record_replay"
+    mode: str = Field(default="replay")
+    store_dir: str = Field(default="")
+    _inner: BaseLLM | None = PrivateAttr(default=None)
+    _store: CompletionStore | None = PrivateAttr(default=None)
+
+    def bind(self, inner: BaseLLM | None = None, store: CompletionStore | None = None) -> RecordReplayLLM:
+        self._inner = inner
+        self._store = store
+        return self
+
+    @property
+    def store(self) -> CompletionStore:
+        if self._store is None:
+            self._store = CompletionStore(Path(self.store_dir) if self.store_dir else None)
+        return self._store
+
+    def call(
+        self,
+        messages: str | list[Any],
+        tools: list[dict[str, Any]] | None = None,
+        callbacks: list[Any] | None = None,
+        available_functions: dict[str, Any] | None = None,
+        from_task: Any | None = None,
+        from_agent: Any | None = None,
+        response_model: Any | None = None,
+    ) -> str:
+        key = prompt_key(self.model, messages)
+        if self.mode == "replay":
+            record = self.store.get(key)
+            if record is None:
+                raise RuntimeError(
+                    f"No recorded completion for prompt {key[:12]} (model {self.model}); "
+                    "run once with COMPANY_AI_LLM_MODE=record first."
+                )
+            time.sleep(simulated_latency(float(record.get("latency_seconds", 0.0))))
+            return record["completion"]
+
+        if self._inner is None:
+            self._inner = LLM(model=self.model)
+        started = time.perf_counter()
+        completion = self._inner.call(
+            messages,
+            callbacks=callbacks,
+            from_task=from_task,
+            from_agent=from_agent,
+            response_model=response_model,
+        )
+        completion = str(completion)
+        self.store.put(key, self.model, messages, completion, time.perf_counter() - started)
+        return completion
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 128000
+
+
+class ScriptedStubLLM(BaseLLM):
+    # Offline stand-in for a model. Each agent follows a script of steps; a step either calls a
+    # tool ({"tool": name, "input": {...}}) or answers ({"final": text}). The current step is the
+    # number of answers the agent already gave in this conversation, so tool observations move
+    # the script forward. Without a script, or past its end, a deterministic final answer is given.
+
+    llm_type: str = "scripted_stub"
+    agent_name: str = Field(default="")
+    script: list[dict[str, Any]] = Field(default_factory=list)
+
+    def call(
+        self,
+        messages: str | list[Any],
+        tools: list[dict[str, Any]] | None = None,
+        callbacks: list[Any] | None = None,
+        available_functions: dict[str, Any] | None = None,
+        from_task: Any | None = None,
+        from_agent: Any | None = None,
+        response_model: Any | None = None,
+    ) -> str:
+        time.sleep(simulated_latency(0.0))
+        normalized = _normalize_messages(messages)
+        step_index = sum(1 for message in normalized if message["role"] == "assistant")
+        step = self.script[step_index] if step_index < len(self.script) else {}
+        if "tool" in step:
+            tool_input = step.get("input", {})
+            return (
+                f"Thought: I should use the {step['tool']} tool.\n"
+                f"Action: {step['tool']}\n"
+                f"Action Input: {json.dumps(tool_input) if not isinstance(tool_input, str) else tool_input}"
+            )
+        task_description = getattr(from_task, "description", "") or ""
+        answer = step.get("final") or DEFAULT_STUB_ANSWER.format(
+            agent=self.agent_name or "agent",
+            task=" ".join(task_description.split())[:160],
+        )
+        return f"Thought: I now know the final answer\nFinal Answer: {answer}"
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 128000
+
+
+_stub_scripts: dict[str, tuple[tuple[int, int] | None, dict[str, list[dict[str, Any]]]]] = {}
+_stub_scripts_lock = threading.Lock()
+
+
+def load_stub_script(path: str) -> dict[str, list[dict[str, Any]]]:
+    # Maps agent names from agents.yaml (or "*" for every other agent) to their steps. Reloaded
+    # when the file changes.
+    stamp = _file_stamp(path)
+    with _stub_scripts_lock:
+        cached = _stub_scripts.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = _stub_scripts[path] = (stamp, yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {})
+        return cached[1]
+
+
+def build_llm(agent_name: str, mode: str) -> BaseLLM | None:
+    # Returns None in "live" mode so the Agent keeps crewai's default model resolution.
+    if mode == "live":
+        return None
+    if mode in ("record", "replay"):
+        return RecordReplayLLM(model=_model_name(), mode=mode)
+    script_path = os.getenv("COMPANY_AI_LLM_STUB_SCRIPT", "").strip()
+    scripts = load_stub_script(script_path) if script_path else {}
+    script = list(scripts.get(agent_name) or scripts.get("*") or [])
+    return ScriptedStubLLM(model="stub", agent_name=agent_name, script=script)
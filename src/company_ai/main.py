@@ -1,98 +1,162 @@
 from __future__ import annotations
 
+import argparse
+import os
 import sys
-from pathlib import Path
-
-from pydantic import BaseModel, Field
-
-from crewai.flow.flow import Flow, listen, start
-
-from company_ai.crews.compliance_crew import ComplianceCrew
-from company_ai.crews.finance_crew import FinanceCrew
-from company_ai.crews.marketing_crew import MarketingCrew
-from company_ai.crews.tech_crew import TechnicalCrew
-
-
-class OrganizationState(BaseModel):
-    id: str = Field(default="organization-flow")
-    ceo_request: str = Field(default="")
-    technical_output: str = Field(default="")
-    finance_output: str = Field(default="")
-    compliance_output: str = Field(default="")
-    marketing_output: str = Field(default="")
-    final_report_path: str = Field(default="src/company_ai/artifacts/reports/final_orchestration_report.md")
-
-
-class OrganizationFlow(Flow[OrganizationState]):
-    initial_state = OrganizationState
-
-    @start()
-    def run_technical(self) -> str:
-        ceo_request = self.state.ceo_request.strip()
-        if not ceo_request:
-            raise ValueError("CEO request is required.")
-        self.state.technical_output = TechnicalCrew().run(ceo_request)
-        return self.state.technical_output
-
-    @listen(run_technical)
-    def run_finance_and_compliance(self) -> dict[str, str]:
-        ceo_request = self.state.ceo_request
-        self.state.finance_output = FinanceCrew().run(ceo_request)
-        self.state.compliance_output = ComplianceCrew().run(ceo_request)
-        return {
-            "finance_output": self.state.finance_output,
-            "compliance_output": self.state.compliance_output,
-        }
-
-    @listen(run_finance_and_compliance)
-    def run_marketing(self) -> str:
-        ceo_request = self.state.ceo_request
-        self.state.marketing_output = MarketingCrew().run(ceo_request)
-        return self.state.marketing_output
-
-    @listen(run_marketing)
-    def finalize(self) -> str:
-        report_path = Path(self.state.final_report_path)
-        report_path.parent.mkdir(parents=True, exist_ok=True)
-        report_path.write_text(
-            "\n".join(
-                [
-                    "# ai_company Orchestration Report",
-                    "",
-                    f"## CEO Request",
-                    self.state.ceo_request,
-                    "",
-                    "## Technical Crew Output",
-                    self.state.technical_output,
-                    "",
-                    "## Finance Crew Output",
-                    self.state.finance_output,
-                    "",
-                    "## Compliance Crew Output",
-                    self.state.compliance_output,
-                    "",
-                    "## Marketing Crew Output",
-                    self.state.marketing_output,
-                ]
-            ),
-            encoding="utf-8",
-        )
-        return str(report_path)
-
-
-def run_flow(ceo_request: str) -> str:
-    flow = OrganizationFlow()
-    result = flow.kickoff(inputs={"ceo_request": ceo_request})
-    return str(result)
-
-
-def main() -> int:
-    if len(sys.argv) < 2:
-        print('Usage: python -m company_ai.main "CEO request here"')
+from typing import TYPE_CHECKING, Any
+
+from company_ai.artifact_store import artifact_namespace, artifact_run, get_artifact_store
+from company_ai.checkpoint import load_checkpoint, new_run_id
+from company_ai.profiling import profile_dir, start_profiling
+from company_ai.settings import FLOW_MODES, flow_max_concurrency, flow_mode, profile_targets, tracing_enabled
+from company_ai.telemetry import span, start_trace, trace_paths
+from company_ai.tools.output_policy import output_policy_run, output_policy_stats
+
+if TYPE_CHECKING:
+    from crewai.flow.flow import Flow
+
+    from company_ai.flow import OrganizationState
+
+# crewai and the crew modules take seconds to import, so they are loaded only once a flow runs;
+# printing usage or parsing arguments stays fast. These names are re-exported from company_ai.flow.
+_FLOW_EXPORTS = ("CREW_OUTPUT_FIELDS", "OrganizationState", "OrganizationFlow", "ParallelOrganizationFlow")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _FLOW_EXPORTS:
+        from company_ai import flow
+
+        return getattr(flow, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def execute_flow(
+    ceo_request: str,
+    mode: str | None = None,
+    max_concurrency: int | None = None,
+    report_path: str | None = None,
+    run_id: str | None = None,
+    resume: bool = False,
+) -> OrganizationState:
+    # State is checkpointed under artifacts/state/runs/<run_id>.json after every step. With
+    # resume=True the saved state of run_id is restored and its completed steps are skipped.
+    from company_ai.flow import OrganizationFlow, ParallelOrganizationFlow
+
+    mode = mode or flow_mode()
+    inputs: dict[str, object]
+    if resume:
+        if not run_id:
+            raise ValueError("A run id is required to resume a flow.")
+        inputs = load_checkpoint(run_id, ceo_request or None)
+    else:
+        inputs = {"ceo_request": ceo_request, "run_id": run_id or new_run_id()}
+    if report_path:
+        inputs["final_report_path"] = report_path
+    if mode == "parallel":
+        flow: Flow[OrganizationState] = ParallelOrganizationFlow()
+        inputs["max_concurrency"] = max_concurrency or flow_max_concurrency()
+    else:
+        flow = OrganizationFlow()
+    # With tracing or profiling enabled, the spans and profiles of the run are exported under
+    # artifacts/reports when it ends. Artifacts the run writes go to its namespace in the store,
+    # and the tool-output policy counts its savings per run.
+    trace_id = str(inputs.get("run_id") or run_id)
+    with (
+        artifact_run(trace_id),
+        output_policy_run(trace_id),
+        start_trace(trace_id),
+        start_profiling(trace_id),
+        span("organization_flow", "flow", mode=mode),
+    ):
+        flow.kickoff(inputs=inputs)
+    return flow.state
+
+
+def run_flow(
+    ceo_request: str,
+    mode: str | None = None,
+    max_concurrency: int | None = None,
+    run_id: str | None = None,
+    resume: bool = False,
+) -> str:
+    state = execute_flow(ceo_request, mode=mode, max_concurrency=max_concurrency, run_id=run_id, resume=resume)
+    return state.report_location or state.final_report_path
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print('Usage: python -m company_ai.main [--mode sequential|parallel] "CEO request here"')
+        print("       python -m company_ai.main --resume RUN_ID")
         return 1
-    ceo_request = " ".join(sys.argv[1:]).strip()
-    result = run_flow(ceo_request)
-    print(f"Flow completed. Final report: {result}")
+    parser = argparse.ArgumentParser(prog="python -m company_ai.main")
+    parser.add_argument("ceo_request", nargs="*", help="CEO request to execute (optional with --resume)")
+    parser.add_argument("--mode", choices=FLOW_MODES, default=None, help="Crew execution mode")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Crews to run at once in parallel mode")
+    run_group = parser.add_mutually_exclusive_group()
+    run_group.add_argument("--run-id", default=None, help="Id under which the run is checkpointed")
+    run_group.add_argument("--resume", metavar="RUN_ID", default=None, help="Resume a checkpointed run")
+    parser.add_argument("--trace", action="store_true", help="Export a trace and Prometheus metrics of the run")
+    parser.add_argument(
+        "--profile",
+        metavar="TARGETS",
+        default=None,
+        help='Profile flow steps, crews, tasks or tools, e.g. "steps" or "crew:technical,tool:read_webpage"',
+    )
+    args = parser.parse_args(argv)
+    if args.trace:
+        os.environ["COMPANY_AI_TRACE"] = "1"
+    if args.profile:
+        try:
+            profile_targets(args.profile)
+        except ValueError as exc:
+            parser.error(str(exc))
+        os.environ["COMPANY_AI_PROFILE"] = args.profile
+
+    ceo_request = " ".join(args.ceo_request).strip()
+    if not ceo_request and not args.resume:
+        parser.error("a CEO request is required unless --resume is given")
+    if args.resume:
+        try:
+            load_checkpoint(args.resume, ceo_request or None)
+        except ValueError as exc:
+            parser.error(str(exc))
+    run_id = args.resume or args.run_id or new_run_id()
+    print(f"Run id: {run_id}")
+    try:
+        state = execute_flow(
+            ceo_request,
+            mode=args.mode,
+            max_concurrency=args.max_concurrency,
+            run_id=run_id,
+            resume=bool(args.resume),
+        )
+    except Exception:
+        print(f"Flow failed. Resume it with: python -m company_ai.main --resume {run_id}", file=sys.stderr)
+        raise
+    finally:
+        if tracing_enabled():
+            trace_path, metrics_path = trace_paths(run_id)
+            print(f"Trace: {trace_path}\nMetrics: {metrics_path}")
+        if profile_targets():
+            print(f"Profiles: {profile_dir(run_id)}")
+    reused = sum(len(reuse.get("reused", [])) for reuse in state.task_reuse.values())
+    if reused:
+        saved = sum(reuse.get("seconds_saved", 0.0) for reuse in state.task_reuse.values())
+        print(f"Reused {reused} unchanged task output(s), saving ~{saved:.1f}s.")
+    shaped = output_policy_stats(run_id)["total"]
+    if shaped["truncated"] or shaped["tokens_saved"]:
+        print(
+            f"Tool output policy: ~{shaped['tokens_saved']} tokens saved "
+            f"({shaped['truncated']} of {shaped['calls']} tool result(s) truncated)."
+        )
+    store, namespace = get_artifact_store(), artifact_namespace(run_id)
+    artifacts = store.stats(namespace)
+    print(
+        f"Artifacts: {artifacts['written']} written, {artifacts['unchanged']} unchanged. "
+        f"Manifest: {store.manifest_location(namespace)}"
+    )
+    print(f"Flow completed. Final report: {state.report_location or state.final_report_path}")
     return 0
 
 
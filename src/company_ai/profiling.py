@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import re
+import sys
+import threading
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from types import FrameType
+from typing import Any, TypeVar
+
+from company_ai.checkpoint import write_text_atomic
+from company_ai.settings import profile_interval_seconds, profile_targets, profiler_mode
+from company_ai.telemetry import default_report_dir
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+MAX_STACK_DEPTH = 256
+SUMMARY_ROWS = 30
+# Frames at the top of a stack that only mean the thread is parked.
+_IDLE_FRAMES = {("threading", "Condition.wait"), ("threading", "Event.wait"), ("selectors", "EpollSelector.select")}
+# From Python 3.12 cProfile is built on sys.monitoring: one profiler at a time per process, and
+# it sees every thread. Before that each thread needs a profiler of its own.
+_PROCESS_WIDE_CPROFILE = sys.version_info >= (3, 12)
+
+
+def profile_dir(run_id: str, report_dir: Path | None = None) -> Path:
+    return (report_dir or default_report_dir()) / "profiles" / run_id
+
+
+def _qualname(frame: FrameType) -> str:
+    # co_qualname exists from Python 3.11 on.
+    return getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+
+
+def _frame_name(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{_qualname(frame)}".replace(";", ",").replace(" ", "_")
+
+
+def _folded_stack(frame: FrameType) -> str | None:
+    # Root-first "module:function;module:function" as read by flamegraph.pl, inferno and speedscope.
+    leaf = frame
+    names: list[str] = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    if (leaf.f_globals.get("__name__"), _qualname(leaf)) in _IDLE_FRAMES:
+        return None
+    return ";".join(reversed(names))
+
+
+class ProfileSession:
+    # Profiles the sections of one flow run. A section is profiled when its "kind:name" matches a
+    # target; work that a section hands to other threads through run_dag (crews in the parallel
+    # flow, tasks in DAG mode) is attributed to it as well, because those threads inherit the
+    # open sections through the copied context. The sampling profiler counts each thread's
+    # stack towards every section open in that thread. cProfile attributes a thread to the
+    # outermost profiled section it runs in; from Python 3.12 there is a single profiler for the
+    # whole process, so sections that overlap in time (crews in the parallel flow, tasks in DAG
+    # mode) share it and each one's profile includes the others' work.
+
+    def __init__(self, run_id: str, targets: tuple[str, ...], mode: str, interval: float) -> None:
+        self.run_id = run_id
+        self.targets = targets
+        self.mode = mode
+        self.interval = interval
+        self.samples: dict[str, Counter[str]] = defaultdict(Counter)
+        self.profiles: dict[str, list[cProfile.Profile]] = defaultdict(list)
+        self._threads: dict[int, tuple[str, ...]] = {}
+        self._profiling: set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    def wants(self, kind: str, name: str) -> bool:
+        return f"{kind}:*" in self.targets or f"{kind}:{name.lower()}" in self.targets
+
+    def enter(self, labels: tuple[str, ...]) -> tuple[str, ...] | None:
+        ident = threading.get_ident()
+        with self._lock:
+            previous = self._threads.get(ident)
+            self._threads[ident] = labels
+            if self.mode == "sampling":
+                # Sections shorter than the sampling interval still get (empty) profile files.
+                for label in labels:
+                    self.samples.setdefault(label, Counter())
+            if self.mode == "sampling" and self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample, name="company-ai-profiler", daemon=True)
+                self._sampler.start()
+        return previous
+
+    def leave(self, previous: tuple[str, ...] | None) -> None:
+        ident = threading.get_ident()
+        with self._lock:
+            if previous is None:
+                self._threads.pop(ident, None)
+            else:
+                self._threads[ident] = previous
+
+    @contextmanager
+    def cprofile(self, label: str) -> Iterator[None]:
+        ident = threading.get_ident()
+        with self._lock:
+            nested = ident in self._profiling
+            self._profiling.add(ident)
+        if nested:
+            yield
+            return
+        try:
+            with _enabled_cprofile() as profiler:
+                if profiler is not None:
+                    with self._lock:
+                        if profiler not in self.profiles[label]:
+                            self.profiles[label].append(profiler)
+                yield
+        finally:
+            with self._lock:
+                self._profiling.discard(ident)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads.items())
+            for ident, labels in threads:
+                frame = frames.get(ident)
+                stack = _folded_stack(frame) if frame is not None else None
+                if stack is None:
+                    continue
+                with self._lock:
+                    for label in labels:
+                        self.samples[label][stack] += 1
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def export(self, report_dir: Path | None = None) -> list[Path]:
+        directory = profile_dir(self.run_id, report_dir)
+        written: list[Path] = []
+        for label in sorted({*self.samples, *self.profiles}):
+            stem = re.sub(r"[^A-Za-z0-9._-]+", "-", label.replace(":", "-"))
+            if label in self.samples:
+                path = directory / f"{stem}.collapsed"
+                write_text_atomic(path, "".join(f"{stack} {count}\n" for stack, count in self.samples[label].items()))
+                written.append(path)
+                summary = _sample_summary(label, self.samples[label], self.interval)
+            else:
+                stats = pstats.Stats(*self.profiles[label])
+                path = directory / f"{stem}.prof"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                stats.dump_stats(str(path))
+                written.append(path)
+                summary = _cprofile_summary(label, stats)
+            write_text_atomic(directory / f"{stem}.txt", summary)
+            written.append(directory / f"{stem}.txt")
+        return written
+
+
+_shared_lock = threading.Lock()
+_shared_profiler: cProfile.Profile | None = None
+_shared_users = 0
+
+
+@contextmanager
+def _enabled_cprofile() -> Iterator[cProfile.Profile | None]:
+    # Yields the profiler recording the calling thread, or None when another tool (a debugger,
+    # coverage) already holds the profiling hook. From Python 3.12 the process-wide profiler is
+    # enabled by the first open section and disabled when the last one ends.
+    global _shared_profiler, _shared_users
+    if not _PROCESS_WIDE_CPROFILE:
+        profiler: cProfile.Profile | None = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            profiler = None
+        try:
+            yield profiler
+        finally:
+            if profiler is not None:
+                profiler.disable()
+        return
+    with _shared_lock:
+        if _shared_users == 0:
+            _shared_profiler = cProfile.Profile()
+            try:
+                _shared_profiler.enable()
+            except ValueError:
+                _shared_profiler = None
+        _shared_users += 1
+        profiler = _shared_profiler
+    try:
+        yield profiler
+    finally:
+        with _shared_lock:
+            _shared_users -= 1
+            if _shared_users == 0 and _shared_profiler is not None:
+                _shared_profiler.disable()
+                _shared_profiler = None
+
+
+def _sample_summary(label: str, samples: Counter[str], interval: float) -> str:
+    total = sum(samples.values())
+    own: Counter[str] = Counter()
+    inclusive: Counter[str] = Counter()
+    for stack, count in samples.items():
+        frames = stack.split(";")
+        own[frames[-1]] += count
+        for name in set(frames):
+            inclusive[name] += count
+    lines = [f"{label}: {total} samples every {interval * 1000:g} ms (~{total * interval:.2f}s of thread time)", ""]
+    if not total:
+        return "\n".join([*lines, "no samples: the section ran for less than the sampling interval", ""])
+    for title, counter in (("self", own), ("inclusive", inclusive)):
+        lines.append(f"top functions by {title} samples:")
+        for name, count in counter.most_common(SUMMARY_ROWS):
+            lines.append(f"  {count:>7} {count / total:7.1%}  {name}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _cprofile_summary(label: str, stats: pstats.Stats) -> str:
+    buffer = io.StringIO()
+    stats.stream = buffer
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_ROWS)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(SUMMARY_ROWS)
+    return f"{label}\n{buffer.getvalue()}"
+
+
+_current_session: ContextVar[ProfileSession | None] = ContextVar("company_ai_profile_session", default=None)
+_open_sections: ContextVar[tuple[str, ...]] = ContextVar("company_ai_profile_sections", default=())
+
+
+@contextmanager
+def start_profiling(run_id: str) -> Iterator[ProfileSession | None]:
+    # Profiles the sections selected by COMPANY_AI_PROFILE and writes them under
+    # artifacts/reports/profiles/<run_id>/ when the run ends. Yields None when nothing is selected.
+    targets = profile_targets()
+    if not targets:
+        yield None
+        return
+    session = ProfileSession(run_id, targets, profiler_mode(), profile_interval_seconds())
+    token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(token)
+        session.close()
+        session.export()
+
+
+@contextmanager
+def profile_section(kind: str, name: str) -> Iterator[None]:
+    session = _current_session.get()
+    if session is None:
+        yield
+        return
+    inherited = _open_sections.get()
+    label = f"{kind}:{name}" if session.wants(kind, name) else None
+    labels = (*inherited, label) if label else inherited
+    if not labels:
+        yield
+        return
+    token = _open_sections.set(labels)
+    previous = session.enter(labels)
+    try:
+        if session.mode == "cprofile":
+            with session.cprofile(labels[0]):
+                yield
+        else:
+            yield
+    finally:
+        session.leave(previous)
+        _open_sections.reset(token)
+
+
+def profiled(kind: str) -> Callable[[F], F]:
+    # Decorator form of profile_section, named after the function (used for flow steps).
+    def decorate(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with profile_section(kind, func.__name__):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
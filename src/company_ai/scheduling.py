@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import contextvars
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+
+def topological_order(dependencies: Mapping[str, Sequence[str]]) -> list[str]:
+    # Always emits the first declared node whose dependencies are satisfied, so a
+    # declaration order that is already valid is returned unchanged.
+    for name, upstream in dependencies.items():
+        for dependency in upstream:
+            if dependency not in dependencies:
+                raise ValueError(f"'{name}' depends on unknown node '{dependency}'.")
+
+    remaining = {name: set(upstream) for name, upstream in dependencies.items()}
+    ordered: list[str] = []
+    while remaining:
+        ready = next((name for name, upstream in remaining.items() if not upstream), None)
+        if ready is None:
+            raise ValueError(f"Dependency cycle detected between: {', '.join(remaining)}")
+        ordered.append(ready)
+        del remaining[ready]
+        for upstream in remaining.values():
+            upstream.discard(ready)
+    return ordered
+
+
+def run_dag(
+    jobs: Mapping[str, Callable[[], Any]],
+    dependencies: Mapping[str, Sequence[str]],
+    max_concurrency: int,
+    on_result: Callable[[str, Any], None] | None = None,
+) -> dict[str, Any]:
+    # Runs every job once all of its dependencies have finished, with at most
+    # max_concurrency jobs in flight. Results are returned in topological order
+    # regardless of completion order so callers can merge them deterministically.
+    # on_result, if given, is called from the scheduling thread as each job succeeds.
+    graph = {name: list(dependencies.get(name, [])) for name in jobs}
+    order = topological_order(graph)
+
+    results: dict[str, Any] = {}
+    pending = list(order)
+    running: dict[Future[Any], str] = {}
+    failure: BaseException | None = None
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        while pending or running:
+            if failure is None:
+                for name in list(pending):
+                    if len(running) >= max(1, max_concurrency):
+                        break
+                    if all(dependency in results for dependency in graph[name]):
+                        pending.remove(name)
+                        # Each job runs in a copy of the caller's context so context
+                        # variables (such as the active trace) reach the worker threads.
+                        running[executor.submit(contextvars.copy_context().run, jobs[name])] = name
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                    if on_result is not None:
+                        on_result(name, results[name])
+                except BaseException as exc:  # noqa: BLE001
+                    # Let in-flight jobs finish, but do not start anything new.
+                    if failure is None:
+                        failure = exc
+
+    if failure is not None:
+        raise failure
+    return {name: results[name] for name in order}
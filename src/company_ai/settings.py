@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+
+FLOW_MODES = ("sequential", "parallel")
+DEFAULT_FLOW_MODE = "sequential"
+DEFAULT_MAX_CONCURRENCY = 4
+TASK_MODES = ("sequential", "dag")
+DEFAULT_TASK_MODE = "sequential"
+DEFAULT_TASK_MAX_CONCURRENCY = 3
+CONTEXT_MODES = ("full", "digest")
+DEFAULT_CONTEXT_MODE = "full"
+DEFAULT_CONTEXT_DIGEST_CHARS = 1500
+LLM_MODES = ("live", "record", "replay", "stub")
+PROFILERS = ("sampling", "cprofile")
+PROFILE_KINDS = ("step", "crew", "task", "tool")
+DEFAULT_PROFILE_INTERVAL_MS = 5.0
+DEFAULT_TOOL_OUTPUT_MAX_TOKENS = 3000
+CI_MODES = ("streaming", "blocking")
+DEFAULT_CI_TIMEOUT_SECONDS = 180.0
+DEFAULT_CI_KILL_GRACE_SECONDS = 5.0
+DEFAULT_CI_MAX_OUTPUT_BYTES = 1024 * 1024
+DEFAULT_REPO_READ_MAX_BYTES = 256 * 1024
+DEFAULT_REPO_READ_MMAP_BYTES = 1024 * 1024
+DEFAULT_REPO_SEARCH_MAX_FILE_BYTES = 1024 * 1024
+DEFAULT_REPO_SEARCH_MAX_RESULTS = 20
+DEFAULT_REPO_SEARCH_MAX_SCAN_FILES = 5000
+ARTIFACT_BACKENDS = ("local", "memory", "sqlite")
+
+
+def _config_dir() -> Path:
+    return Path(__file__).resolve().parent / "config"
+
+
+_flow_config_cache: dict[tuple[int, int], dict[str, Any]] = {}
+
+
+def load_flow_config() -> dict[str, Any]:
+    # Parsed once per version of the file: tool calls read the tool_output section on every call.
+    # Callers must treat the returned mapping as read-only.
+    path = _config_dir() / "flow.yaml"
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    config = _flow_config_cache.get(key)
+    if config is None:
+        config = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        _flow_config_cache.clear()
+        _flow_config_cache[key] = config
+    return config
+
+
+def _int_setting(env_name: str, configured: Any, default: int) -> int:
+    raw_value = os.getenv(env_name, "").strip() or configured
+    try:
+        value = int(raw_value)
+    except (TypeError, ValueError):
+        value = default
+    return max(1, value)
+
+
+def flow_mode(config: dict[str, Any] | None = None) -> str:
+    config = load_flow_config() if config is None else config
+    configured = config.get("execution", {}).get("mode", DEFAULT_FLOW_MODE)
+    mode = (os.getenv("COMPANY_AI_FLOW_MODE", "").strip() or configured).lower()
+    if mode not in FLOW_MODES:
+        raise ValueError(f"Unknown flow mode '{mode}'. Expected one of: {', '.join(FLOW_MODES)}.")
+    return mode
+
+
+def flow_max_concurrency(config: dict[str, Any] | None = None) -> int:
+    config = load_flow_config() if config is None else config
+    configured = config.get("execution", {}).get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+    return _int_setting("COMPANY_AI_FLOW_MAX_CONCURRENCY", configured, DEFAULT_MAX_CONCURRENCY)
+
+
+def crew_dependencies(config: dict[str, Any] | None = None) -> dict[str, list[str]]:
+    config = load_flow_config() if config is None else config
+    return {
+        name: list((spec or {}).get("depends_on") or [])
+        for name, spec in (config.get("crews") or {}).items()
+    }
+
+
+def task_mode(config: dict[str, Any] | None = None) -> str:
+    config = load_flow_config() if config is None else config
+    configured = config.get("tasks", {}).get("mode", DEFAULT_TASK_MODE)
+    mode = (os.getenv("COMPANY_AI_TASK_MODE", "").strip() or configured).lower()
+    if mode not in TASK_MODES:
+        raise ValueError(f"Unknown task mode '{mode}'. Expected one of: {', '.join(TASK_MODES)}.")
+    return mode
+
+
+def task_max_concurrency(config: dict[str, Any] | None = None) -> int:
+    config = load_flow_config() if config is None else config
+    configured = config.get("tasks", {}).get("max_concurrency", DEFAULT_TASK_MAX_CONCURRENCY)
+    return _int_setting("COMPANY_AI_TASK_MAX_CONCURRENCY", configured, DEFAULT_TASK_MAX_CONCURRENCY)
+
+
+def context_mode(configured: str | None = None, config: dict[str, Any] | None = None) -> str:
+    # configured comes from a task's context_mode in tasks.yaml and overrides COMPANY_AI_CONTEXT_MODE,
+    # which overrides tasks.context_mode in flow.yaml.
+    config = load_flow_config() if config is None else config
+    default = config.get("tasks", {}).get("context_mode", DEFAULT_CONTEXT_MODE)
+    mode = (configured or os.getenv("COMPANY_AI_CONTEXT_MODE", "").strip() or default).lower()
+    if mode not in CONTEXT_MODES:
+        raise ValueError(f"Unknown context mode '{mode}'. Expected one of: {', '.join(CONTEXT_MODES)}.")
+    return mode
+
+
+def context_digest_chars(config: dict[str, Any] | None = None) -> int:
+    config = load_flow_config() if config is None else config
+    configured = config.get("tasks", {}).get("digest_chars", DEFAULT_CONTEXT_DIGEST_CHARS)
+    return _int_setting("COMPANY_AI_CONTEXT_DIGEST_CHARS", configured, DEFAULT_CONTEXT_DIGEST_CHARS)
+
+
+def crew_cache_enabled() -> bool:
+    # Set COMPANY_AI_CREW_CACHE=0 to parse crew configs and build agents afresh on every run.
+    return os.getenv("COMPANY_AI_CREW_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def task_reuse_enabled() -> bool:
+    # Set COMPANY_AI_TASK_REUSE=0 to execute every task even when a stored output matches its inputs.
+    return os.getenv("COMPANY_AI_TASK_REUSE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def llm_mode(configured: str | None = None) -> str:
+    # configured comes from an agent's llm_mode in agents.yaml and overrides COMPANY_AI_LLM_MODE.
+    mode = (configured or os.getenv("COMPANY_AI_LLM_MODE", "").strip() or "live").lower()
+    if mode not in LLM_MODES:
+        raise ValueError(f"Unknown LLM mode '{mode}'. Expected one of: {', '.join(LLM_MODES)}.")
+    return mode
+
+
+def tracing_enabled() -> bool:
+    # Set COMPANY_AI_TRACE=1 (or pass --trace) to record spans and export a trace per run.
+    return os.getenv("COMPANY_AI_TRACE", "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+def profile_targets(configured: str | None = None) -> tuple[str, ...]:
+    # Comma-separated "kind:name" targets, e.g. "steps", "crew:technical", "tool:read_webpage" or
+    # "tool:*". A bare kind (or its plural) profiles every section of that kind; "all" profiles all.
+    raw_targets = configured if configured is not None else os.getenv("COMPANY_AI_PROFILE", "")
+    targets: list[str] = []
+    for raw_target in raw_targets.split(","):
+        target = raw_target.strip().lower()
+        if not target or target in ("0", "off", "false", "no"):
+            continue
+        if target == "all":
+            targets += [f"{kind}:*" for kind in PROFILE_KINDS]
+            continue
+        kind, _, name = target.partition(":")
+        kind = kind.removesuffix("s")
+        if kind not in PROFILE_KINDS:
+            raise ValueError(
+                f"Unknown profile target '{raw_target.strip()}'. Expected kinds: {', '.join(PROFILE_KINDS)}."
+            )
+        targets.append(f"{kind}:{name or '*'}")
+    return tuple(targets)
+
+
+def profiler_mode() -> str:
+    mode = os.getenv("COMPANY_AI_PROFILER", "").strip().lower() or PROFILERS[0]
+    if mode not in PROFILERS:
+        raise ValueError(f"Unknown profiler '{mode}'. Expected one of: {', '.join(PROFILERS)}.")
+    return mode
+
+
+def profile_interval_seconds() -> float:
+    raw_interval = os.getenv("COMPANY_AI_PROFILE_INTERVAL_MS", str(DEFAULT_PROFILE_INTERVAL_MS))
+    try:
+        return max(0.5, float(raw_interval)) / 1000
+    except ValueError:
+        return DEFAULT_PROFILE_INTERVAL_MS / 1000
+
+
+def tool_output_policy(config: dict[str, Any] | None = None) -> dict[str, Any]:
+    # compact_json: serialize JSON tool outputs without indentation.
+    # max_tokens: default budget per tool call, and tools: per-tool budgets; 0 means unlimited.
+    # COMPANY_AI_TOOL_OUTPUT_MAX_TOKENS replaces the default budget, and 0 turns truncation off.
+    config = load_flow_config() if config is None else config
+    section = config.get("tool_output") or {}
+    raw_compact = os.getenv("COMPANY_AI_TOOL_OUTPUT_COMPACT", "").strip().lower()
+    compact = raw_compact not in ("0", "false", "no", "off") if raw_compact else bool(section.get("compact_json", True))
+    raw_tokens = os.getenv("COMPANY_AI_TOOL_OUTPUT_MAX_TOKENS", "").strip()
+    try:
+        max_tokens = int(raw_tokens or section.get("max_tokens", DEFAULT_TOOL_OUTPUT_MAX_TOKENS))
+    except (TypeError, ValueError):
+        max_tokens = DEFAULT_TOOL_OUTPUT_MAX_TOKENS
+    tools = {name: int(tokens) for name, tokens in (section.get("tools") or {}).items()}
+    if raw_tokens and max_tokens <= 0:
+        tools = {}
+    return {"compact_json": compact, "max_tokens": max(0, max_tokens), "tools": tools}
+
+
+def _float_setting(env_name: str, configured: Any, default: float) -> float:
+    raw_value = os.getenv(env_name, "").strip() or configured
+    try:
+        return max(0.0, float(raw_value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _bool_setting(env_name: str, configured: Any) -> bool:
+    raw_value = os.getenv(env_name, "").strip().lower()
+    if raw_value:
+        return raw_value not in ("0", "false", "no", "off")
+    return bool(configured)
+
+
+def ci_settings(config: dict[str, Any] | None = None) -> dict[str, Any]:
+    # How run_tests, run_lint and run_checks execute commands. mode: "streaming" reads output into
+    # bounded buffers (max_output_bytes per stream) and keeps it on timeout; "blocking" is the
+    # former subprocess.run call. On timeout a command gets SIGTERM, then SIGKILL after kill_grace.
+    # cache: reuse the result of a command while the repository files are unchanged
+    # (COMPANY_AI_CI_CACHE); affected_only: by default run only the tests and lint targets
+    # affected by files changed since the command's last full run (COMPANY_AI_CI_AFFECTED_ONLY).
+    config = load_flow_config() if config is None else config
+    section = config.get("ci") or {}
+    mode = (os.getenv("COMPANY_AI_CI_MODE", "").strip() or section.get("mode", "streaming")).lower()
+    if mode not in CI_MODES:
+        raise ValueError(f"Unknown CI mode '{mode}'. Expected one of: {', '.join(CI_MODES)}.")
+    timeout = _float_setting("COMPANY_AI_CI_TIMEOUT", section.get("timeout_seconds"), DEFAULT_CI_TIMEOUT_SECONDS)
+    return {
+        "mode": mode,
+        "timeout": timeout or DEFAULT_CI_TIMEOUT_SECONDS,
+        "kill_grace": _float_setting(
+            "COMPANY_AI_CI_KILL_GRACE", section.get("kill_grace_seconds"), DEFAULT_CI_KILL_GRACE_SECONDS
+        ),
+        "max_output_bytes": _int_setting(
+            "COMPANY_AI_CI_MAX_OUTPUT_BYTES", section.get("max_output_bytes"), DEFAULT_CI_MAX_OUTPUT_BYTES
+        ),
+        "cache": _bool_setting("COMPANY_AI_CI_CACHE", section.get("cache", True)),
+        "affected_only": _bool_setting("COMPANY_AI_CI_AFFECTED_ONLY", section.get("affected_only", False)),
+    }
+
+
+def repo_read_settings(config: dict[str, Any] | None = None) -> dict[str, int]:
+    # max_bytes: largest file (or requested range) repo_read returns as content; larger files get a
+    # summary instead. mmap_bytes: files from this size on are memory-mapped rather than read.
+    config = load_flow_config() if config is None else config
+    section = config.get("repo_read") or {}
+    return {
+        "max_bytes": _int_setting(
+            "COMPANY_AI_REPO_READ_MAX_BYTES", section.get("max_bytes"), DEFAULT_REPO_READ_MAX_BYTES
+        ),
+        "mmap_bytes": _int_setting(
+            "COMPANY_AI_REPO_READ_MMAP_BYTES", section.get("mmap_bytes"), DEFAULT_REPO_READ_MMAP_BYTES
+        ),
+    }
+
+
+def repo_search_settings(config: dict[str, Any] | None = None) -> dict[str, int]:
+    # max_file_bytes: larger files are left out of the search index. max_results: hits returned
+    # when the agent does not ask for a number. max_scan_files: candidate files read per query.
+    config = load_flow_config() if config is None else config
+    section = config.get("repo_search") or {}
+    return {
+        "max_file_bytes": _int_setting(
+            "COMPANY_AI_REPO_SEARCH_MAX_FILE_BYTES", section.get("max_file_bytes"), DEFAULT_REPO_SEARCH_MAX_FILE_BYTES
+        ),
+        "max_results": _int_setting(
+            "COMPANY_AI_REPO_SEARCH_MAX_RESULTS", section.get("max_results"), DEFAULT_REPO_SEARCH_MAX_RESULTS
+        ),
+        "max_scan_files": _int_setting(
+            "COMPANY_AI_REPO_SEARCH_MAX_SCAN_FILES", section.get("max_scan_files"), DEFAULT_REPO_SEARCH_MAX_SCAN_FILES
+        ),
+    }
+
+
+def artifact_settings(config: dict[str, Any] | None = None) -> dict[str, Any]:
+    # Where WriteArtifactTool, task output files and the final report are stored. backend: "local"
+    # files, "memory" (tests and benchmarks) or "sqlite" (db_path, by default
+    # artifacts/state/artifacts.sqlite3). run_scoped: each run writes under its own run id
+    # (artifacts/runs/<run_id>/ for local files) instead of sharing the artifacts directory.
+    config = load_flow_config() if config is None else config
+    section = config.get("artifacts") or {}
+    backend = (os.getenv("COMPANY_AI_ARTIFACT_BACKEND", "").strip() or section.get("backend", "local")).lower()
+    if backend not in ARTIFACT_BACKENDS:
+        raise ValueError(f"Unknown artifact backend '{backend}'. Expected one of: {', '.join(ARTIFACT_BACKENDS)}.")
+    return {
+        "backend": backend,
+        "run_scoped": _bool_setting("COMPANY_AI_ARTIFACT_RUN_SCOPED", section.get("run_scoped", True)),
+        "db_path": os.getenv("COMPANY_AI_ARTIFACT_DB", "").strip() or str(section.get("db_path") or ""),
+    }
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from company_ai.checkpoint import write_json_atomic
+
+
+def default_task_store_dir() -> Path:
+    return Path(__file__).resolve().parent / "artifacts" / "state" / "tasks"
+
+
+def fingerprint(payload: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class TaskOutputStore:
+    # Remembers, per task output_file, the fingerprint of the inputs that produced it together with
+    # the raw output and how long the task took. One JSON file per output_file keeps concurrent
+    # crews from rewriting each other's records.
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = root or default_task_store_dir()
+
+    def _path(self, output_file: str) -> Path:
+        return self.root / f"{hashlib.sha1(output_file.encode('utf-8')).hexdigest()[:20]}.json"
+
+    def get(self, output_file: str) -> dict[str, Any] | None:
+        path = self._path(output_file)
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return record if record.get("output_file") == output_file else None
+
+    def has(self, output_file: str) -> bool:
+        return self._path(output_file).exists()
+
+    def reusable(self, output_file: str, task_fingerprint: str) -> dict[str, Any] | None:
+        # A stored output is only reused when the inputs match; the caller writes it to the
+        # current run's artifacts, so a missing output file does not force a rerun.
+        record = self.get(output_file)
+        if record is None or record.get("fingerprint") != task_fingerprint:
+            return None
+        return record
+
+    def put(self, output_file: str, task_fingerprint: str, output: str, seconds: float, **extra: Any) -> None:
+        write_json_atomic(
+            self._path(output_file),
+            {
+                "output_file": output_file,
+                "fingerprint": task_fingerprint,
+                "output": output,
+                "seconds": round(seconds, 3),
+                "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                **extra,
+            },
+        )
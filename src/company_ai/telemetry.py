@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from company_ai.checkpoint import write_json_atomic, write_text_atomic
+from company_ai.settings import tracing_enabled
+
+
+TOKEN_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+
+def default_report_dir() -> Path:
+    configured = os.getenv("COMPANY_AI_TRACE_DIR", "").strip()
+    return Path(configured) if configured else Path(__file__).resolve().parent / "artifacts" / "reports"
+
+
+def trace_paths(run_id: str, report_dir: Path | None = None) -> tuple[Path, Path]:
+    # The Chrome trace of a run and its Prometheus textfile.
+    report_dir = report_dir or default_report_dir()
+    return report_dir / "traces" / f"{run_id}.trace.json", report_dir / "metrics" / f"{run_id}.prom"
+
+
+@dataclass
+class Span:
+    span_id: int
+    parent_id: int | None
+    name: str
+    category: str
+    start_ns: int
+    end_ns: int = 0
+    thread_id: int = 0
+    thread_name: str = ""
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def seconds(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class Trace:
+    # Spans of one flow run. Spans from every thread that inherits the run's context end up here.
+
+    def __init__(self, run_id: str) -> None:
+        self.run_id = run_id
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def open(self, name: str, category: str, start_ns: int, parent: Span | None, **attributes: Any) -> Span:
+        thread = threading.current_thread()
+        return Span(
+            span_id=next(self._ids),
+            parent_id=parent.span_id if parent is not None else None,
+            name=name,
+            category=category,
+            start_ns=start_ns,
+            thread_id=thread.ident or 0,
+            thread_name=thread.name,
+            attributes=attributes,
+        )
+
+    def close(self, span: Span, end_ns: int) -> None:
+        span.end_ns = end_ns
+        with self._lock:
+            self.spans.append(span)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        # Chrome trace event format ("X" complete events, microseconds), which chrome://tracing,
+        # Perfetto and speedscope open directly.
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start_ns)
+        threads = {span.thread_id: span.thread_name for span in spans}
+        events: list[dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        for span in spans:
+            args = {"span_id": span.span_id, "parent_id": span.parent_id, **span.attributes}
+            if span.error:
+                args["error"] = span.error
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": span.start_ns // 1000,
+                    "dur": max(1, (span.end_ns - span.start_ns) // 1000),
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"run_id": self.run_id}}
+
+    def prometheus_text(self) -> str:
+        with self._lock:
+            spans = list(self.spans)
+        durations: dict[tuple[str, str], list[float]] = defaultdict(list)
+        counters: dict[str, dict[tuple[str, str], float]] = defaultdict(lambda: defaultdict(float))
+        tokens: dict[tuple[str, str], int] = defaultdict(int)
+        for span in spans:
+            key = (span.category, span.name)
+            durations[key].append(span.seconds)
+            counters["errors"][key] += 1 if span.error else 0
+            counters["bytes_in"][key] += span.attributes.get("bytes_in", 0)
+            counters["bytes_out"][key] += span.attributes.get("bytes_out", 0)
+            if span.category == "tool":
+                counters["tokens_saved"][key] += span.attributes.get("tokens_saved", 0)
+            if span.category == "task":
+                counters["prompt_chars"][key] += span.attributes.get("prompt_chars", 0)
+            if span.category == "crew":
+                for token_field in TOKEN_FIELDS:
+                    tokens[(span.name, token_field.removesuffix("_tokens"))] += span.attributes.get(token_field, 0)
+
+        run = f'run_id="{_escape(self.run_id)}"'
+        lines = [
+            "# HELP company_ai_span_duration_seconds Wall time of crews, tasks and tool calls.",
+            "# TYPE company_ai_span_duration_seconds summary",
+        ]
+        for (category, name), samples in sorted(durations.items()):
+            labels = f'{run},category="{category}",name="{_escape(name)}"'
+            lines.append(f"company_ai_span_duration_seconds_sum{{{labels}}} {sum(samples):.6f}")
+            lines.append(f"company_ai_span_duration_seconds_count{{{labels}}} {len(samples)}")
+        for counter, help_text in (
+            ("errors", "Crews, tasks and tool calls that failed or returned an error."),
+            ("bytes_in", "Bytes passed into crews, tasks and tool calls."),
+            ("bytes_out", "Bytes returned by crews, tasks and tool calls."),
+            ("tokens_saved", "Estimated prompt tokens saved by the tool-output policy."),
+            ("prompt_chars", "Characters of task prompts, including the context passed to them."),
+        ):
+            metric = f"company_ai_span_{counter}_total"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            for (category, name), value in sorted(counters[counter].items()):
+                lines.append(f'{metric}{{{run},category="{category}",name="{_escape(name)}"}} {value:g}')
+        lines += [
+            "# HELP company_ai_llm_tokens_total LLM tokens used per crew, as reported by crewai.",
+            "# TYPE company_ai_llm_tokens_total counter",
+        ]
+        for (crew, kind), value in sorted(tokens.items()):
+            lines.append(f'company_ai_llm_tokens_total{{{run},crew="{_escape(crew)}",kind="{kind}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, report_dir: Path | None = None) -> tuple[Path, Path]:
+        trace_path, metrics_path = trace_paths(self.run_id, report_dir)
+        write_json_atomic(trace_path, self.chrome_trace())
+        write_text_atomic(metrics_path, self.prometheus_text())
+        return trace_path, metrics_path
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_current_trace: ContextVar[Trace | None] = ContextVar("company_ai_trace", default=None)
+_current_span: ContextVar[Span | None] = ContextVar("company_ai_span", default=None)
+
+
+@contextmanager
+def start_trace(run_id: str) -> Iterator[Trace | None]:
+    # Collects the spans of one run and exports them when the run ends, also when it fails.
+    # Yields None, and records nothing, unless tracing is enabled.
+    if not tracing_enabled():
+        yield None
+        return
+    trace = Trace(run_id)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        trace.export()
+
+
+@contextmanager
+def span(name: str, category: str, **attributes: Any) -> Iterator[Span | None]:
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    current = trace.open(name, category, time.time_ns(), _current_span.get(), **attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        _current_span.reset(token)
+        trace.close(current, time.time_ns())
+
+
+def record_span(
+    name: str,
+    category: str,
+    start_ns: int,
+    end_ns: int,
+    error: str | None = None,
+    **attributes: Any,
+) -> None:
+    # Adds a span that was timed elsewhere (such as a task timed by crewai) under the current span.
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    recorded = trace.open(name, category, start_ns, _current_span.get(), **attributes)
+    recorded.error = error
+    trace.close(recorded, end_ns)
+
+
+def annotate(**attributes: Any) -> None:
+    # Adds attributes, such as bytes read from the network, to the innermost open span.
+    current = _current_span.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+def token_counts(usage: Any, baseline: Any = None) -> dict[str, int]:
+    # Tokens in a crewai UsageMetrics, less those in baseline, an earlier snapshot of the same
+    # cumulative counters; empty when the model did not report any.
+    counts = {
+        token_field: max(0, int(getattr(usage, token_field, 0) or 0) - int(getattr(baseline, token_field, 0) or 0))
+        for token_field in TOKEN_FIELDS
+    }
+    return counts if any(counts.values()) else {}
@@ -1,22 +1,62 @@
-from .ci_tools import RunLintTool, RunTestsTool
-from .docs_tools import WriteArtifactTool
-from .finance_tools import CostModelTool
-from .internet_tools import InternetSearchTool, ReadWebpageTool, build_internet_tools
-from .legal_tools import ComplianceChecklistTool, ContractReviewTool
-from .marketing_tools import ClaimsCheckTool
-from .repo_tools import RepoReadTool, RepoWriteTool
-
-__all__ = [
-    "WriteArtifactTool",
-    "RepoReadTool",
-    "RepoWriteTool",
-    "RunTestsTool",
-    "RunLintTool",
-    "ContractReviewTool",
-    "ComplianceChecklistTool",
-    "ClaimsCheckTool",
-    "CostModelTool",
-    "InternetSearchTool",
-    "ReadWebpageTool",
-    "build_internet_tools",
-]
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .ci_tools import RunChecksTool, RunLintTool, RunTestsTool
+    from .docs_tools import WriteArtifactTool
+    from .finance_tools import CostModelTool
+    from .internet_tools import (
+        BatchInternetSearchTool,
+        BatchReadWebpageTool,
+        InternetSearchTool,
+        ReadWebpageTool,
+        build_internet_tools,
+        shared_internet_tools,
+    )
+    from .legal_tools import ComplianceChecklistTool, ContractReviewTool
+    from .marketing_tools import ClaimsCheckTool
+    from .output_policy import output_policy_stats
+    from .output_tools import ReadToolOutputTool, tool_output_pager
+    from .repo_tools import RepoReadTool, RepoSearchTool, RepoWriteTool
+
+# Every tool module imports crewai, which is slow to load; each one is imported on first access so
+# that helpers such as html_text or http_cache, and code paths that never build tools, stay cheap.
+_EXPORTS = {
+    "WriteArtifactTool": "docs_tools",
+    "RepoReadTool": "repo_tools",
+    "RepoSearchTool": "repo_tools",
+    "RepoWriteTool": "repo_tools",
+    "RunTestsTool": "ci_tools",
+    "RunLintTool": "ci_tools",
+    "RunChecksTool": "ci_tools",
+    "ContractReviewTool": "legal_tools",
+    "ComplianceChecklistTool": "legal_tools",
+    "ClaimsCheckTool": "marketing_tools",
+    "CostModelTool": "finance_tools",
+    "InternetSearchTool": "internet_tools",
+    "ReadWebpageTool": "internet_tools",
+    "BatchInternetSearchTool": "internet_tools",
+    "BatchReadWebpageTool": "internet_tools",
+    "build_internet_tools": "internet_tools",
+    "shared_internet_tools": "internet_tools",
+    "ReadToolOutputTool": "output_tools",
+    "tool_output_pager": "output_tools",
+    "output_policy_stats": "output_policy",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from functools import wraps
+from typing import Any, ClassVar
+
+from crewai.tools import BaseTool
+
+from company_ai.profiling import profile_section
+from company_ai.telemetry import span
+
+from .output_policy import shape_output
+
+
+def _reported_error(result: Any) -> str | None:
+    # Tools report failures as {"error": ...} instead of raising.
+    if not isinstance(result, str) or not result.startswith("{") or '"error"' not in result:
+        return None
+    try:
+        payload = json.loads(result)
+    except ValueError:
+        return None
+    return str(payload["error"]) if isinstance(payload, dict) and payload.get("error") else None
+
+
+def _traced(run: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(run)
+    def traced_run(self: TracedTool, *args: Any, **kwargs: Any) -> Any:
+        with profile_section("tool", self.name), span(self.name, "tool") as current:
+            result = run(self, *args, **kwargs)
+            shaped = None
+            if self.apply_output_policy and isinstance(result, str):
+                shaped = shape_output(self.name, result)
+            if current is not None:
+                current.attributes["bytes_in"] = len(json.dumps([args, kwargs], default=str).encode("utf-8"))
+                current.error = _reported_error(result)
+                if shaped is not None:
+                    current.attributes["bytes_raw"] = len(result.encode("utf-8"))
+                    current.attributes["tokens_saved"] = shaped.tokens_saved
+            output = shaped.text if shaped is not None else result
+            if current is not None:
+                current.attributes["bytes_out"] = len(str(output).encode("utf-8"))
+            return output
+
+    traced_run.__traced__ = True  # type: ignore[attr-defined]
+    return traced_run
+
+
+class TracedTool(BaseTool):
+    # Base class of every company_ai tool: each _run call becomes a "tool" span with its duration,
+    # input and output sizes and any reported error whenever tracing is enabled, and its result
+    # is shaped by the tool-output policy (compact JSON, per-tool budgets) before the model sees it.
+
+    apply_output_policy: ClassVar[bool] = True
+
+    def run_raw(self, *args: Any, **kwargs: Any) -> Any:
+        # The tool's own _run, without a span or the output policy, for tools built on other tools.
+        return type(self)._run.__wrapped__(self, *args, **kwargs)  # type: ignore[attr-defined]
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        run = cls.__dict__.get("_run")
+        if run is not None and not getattr(run, "__traced__", False):
+            cls._run = _traced(run)
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shlex
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from company_ai.checkpoint import write_json_atomic
+
+
+# Paths that never affect test or lint results: files the agents write while a flow runs.
+IGNORED_PREFIXES = ("src/company_ai/artifacts/",)
+IGNORED_DIRS = {".git", "__pycache__", ".venv", "venv", ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache"}
+# Files that configure how tests and linters run: changing one always means a full run.
+CONFIG_FILES = {
+    "pyproject.toml",
+    "setup.cfg",
+    "setup.py",
+    "tox.ini",
+    "pytest.ini",
+    "conftest.py",
+    "noxfile.py",
+    "ruff.toml",
+    ".ruff.toml",
+    ".flake8",
+    "mypy.ini",
+    "requirements.txt",
+}
+DOC_SUFFIXES = {".md", ".rst", ".txt"}
+# Commands with shell operators cannot be narrowed to the affected files.
+SHELL_OPERATORS = re.compile(r"[;&|<>`]|\$\(")
+
+
+def default_ci_state_dir() -> Path:
+    return Path(__file__).resolve().parents[1] / "artifacts" / "state" / "ci"
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha1()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tree_hash(files: dict[str, str]) -> str:
+    digest = hashlib.sha256()
+    for path, file_hash in sorted(files.items()):
+        digest.update(f"{path}\0{file_hash}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def is_test_file(path: str) -> bool:
+    name = PurePosixPath(path).name
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def list_repo_files(root: Path, ignored_prefixes: tuple[str, ...] = IGNORED_PREFIXES) -> list[str]:
+    # Repository-relative paths from git (tracked plus untracked, minus .gitignore) or, outside
+    # git, from a walk that skips IGNORED_DIRS.
+    try:
+        listed = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            cwd=root,
+            capture_output=True,
+            check=True,
+        ).stdout.decode("utf-8", errors="surrogateescape")
+        paths = [path for path in listed.split("\0") if path]
+    except (OSError, subprocess.CalledProcessError):
+        paths = []
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = [name for name in dirnames if name not in IGNORED_DIRS]
+            relative = Path(directory).relative_to(root)
+            paths.extend((relative / name).as_posix() for name in filenames)
+    return sorted(path for path in paths if not path.startswith(ignored_prefixes))
+
+
+class RepoIndex:
+    # Content hashes of the repository's files, persisted in files.json next to the results and
+    # refreshed from mtimes and sizes: only files that changed since the last snapshot are read.
+
+    def __init__(self, root: Path, state_dir: Path) -> None:
+        self.root = root
+        self.path = state_dir / "files.json"
+        self._entries: dict[str, list[Any]] | None = None
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> dict[str, str]:
+        with self._lock:
+            if self._entries is None:
+                try:
+                    self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    self._entries = {}
+            entries = self._entries
+            current: dict[str, list[Any]] = {}
+            rehashed = 0
+            for path in list_repo_files(self.root):
+                try:
+                    stat = (self.root / path).stat()
+                except OSError:
+                    continue
+                cached = entries.get(path)
+                if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                    current[path] = cached
+                    continue
+                try:
+                    current[path] = [stat.st_mtime_ns, stat.st_size, _file_digest(self.root / path)]
+                except OSError:
+                    continue
+                rehashed += 1
+            if rehashed or len(current) != len(entries):
+                self._entries = current
+                write_json_atomic(self.path, current)
+            return {path: entry[2] for path, entry in current.items()}
+
+
+@dataclass
+class CachePlan:
+    # What to do for one command: return result as is, or run command (the original command or
+    # one narrowed to the affected files) and describe the narrowing in scope.
+    command: str
+    result: dict[str, Any] | None = None
+    scope: dict[str, Any] = field(default_factory=dict)
+
+
+class CIResultCache:
+    # The last result of each (kind, command), where kind is "tests" or "lint", stored with the
+    # hashes of the repository files it ran against. A command is not run again while the tree
+    # hash matches. In affected-only mode the files changed since that full run are mapped to
+    # the test modules and lint targets they affect, and only those are run.
+
+    def __init__(self, root: Path, state_dir: Path | None = None) -> None:
+        self.root = root
+        self.state_dir = state_dir or default_ci_state_dir()
+        self.index = RepoIndex(root, self.state_dir)
+
+    def _path(self, kind: str, command: str) -> Path:
+        key = hashlib.sha1(f"{kind}\0{command}".encode("utf-8")).hexdigest()[:20]
+        return self.state_dir / "results" / f"{key}.json"
+
+    def _load(self, kind: str, command: str) -> dict[str, Any] | None:
+        try:
+            record = json.loads(self._path(kind, command).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return record if record.get("command") == command else None
+
+    def plan(self, kind: str, command: str, files: dict[str, str], affected_only: bool) -> CachePlan:
+        record = self._load(kind, command)
+        if record is None:
+            return CachePlan(command)
+        current = tree_hash(files)
+        if record["tree_hash"] == current:
+            return CachePlan(command, _cached(record["result"], record["saved_at"]))
+        affected = record.get("affected") or {}
+        if not affected_only:
+            return CachePlan(command)
+        if affected.get("tree_hash") == current:
+            return CachePlan(command, _cached(affected["result"], affected["saved_at"]))
+
+        baseline = record["files"]
+        changed = sorted(path for path in {*files, *baseline} if files.get(path) != baseline.get(path))
+        targets = self._targets(kind, changed, files)
+        if targets is None:
+            return CachePlan(command)
+        narrowed = self._narrow(command, targets)
+        if narrowed is None:
+            return CachePlan(command)
+        scope = {"affected_only": True, "changed_files": changed, "targets": narrowed[1]}
+        if not narrowed[1]:
+            # Nothing the command covers changed since its last full run.
+            return CachePlan(command, {**_cached(record["result"], record["saved_at"]), **scope})
+        return CachePlan(narrowed[0], scope=scope)
+
+    def store(self, kind: str, command: str, files: dict[str, str], plan: CachePlan, result: dict[str, Any]) -> None:
+        if result.get("error") or result.get("timed_out"):
+            return
+        saved_at = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        if plan.scope:
+            record = self._load(kind, command)
+            if record is None:
+                return
+            record["affected"] = {"tree_hash": tree_hash(files), "result": result, "saved_at": saved_at}
+        else:
+            record = {
+                "kind": kind,
+                "command": command,
+                "tree_hash": tree_hash(files),
+                "files": files,
+                "result": result,
+                "saved_at": saved_at,
+            }
+        write_json_atomic(self._path(kind, command), record)
+
+    def _targets(self, kind: str, changed: list[str], files: dict[str, str]) -> list[str] | None:
+        # None when a change cannot be mapped and the whole command has to run.
+        if any(PurePosixPath(path).name in CONFIG_FILES for path in changed):
+            return None
+        if kind == "lint":
+            return [path for path in changed if path.endswith(".py") and path in files]
+        targets: list[str] = []
+        test_files = [path for path in files if is_test_file(path)]
+        for path in changed:
+            suffix = PurePosixPath(path).suffix
+            if suffix in DOC_SUFFIXES:
+                continue
+            if suffix != ".py":
+                return None
+            if is_test_file(path):
+                if path in files:
+                    targets.append(path)
+                continue
+            targets.extend(self._tests_for_module(path, test_files))
+        return sorted(set(targets))
+
+    def _tests_for_module(self, path: str, test_files: list[str]) -> list[str]:
+        # A test module is affected when it is named after the module (test_<name>.py or
+        # <name>_test.py) or imports it by its dotted name or by its bare name.
+        module = PurePosixPath(path)
+        parts = list(module.with_suffix("").parts)
+        if parts and parts[0] == "src":
+            parts = parts[1:]
+        if parts and parts[-1] == "__init__":
+            parts = parts[:-1]
+        if not parts:
+            return []
+        name, dotted = re.escape(parts[-1]), re.escape(".".join(parts))
+        patterns = (
+            rf"from\s+{dotted}\b",
+            rf"import\s+{dotted}\b",
+            rf"from\s+\.*{name}\b",
+            rf"import\s+{name}\b",
+            rf"from\s+\S+\s+import\s+(?:.*[\s,(])?{name}\b",
+        )
+        imports = re.compile(rf"^\s*(?:{'|'.join(patterns)})", re.MULTILINE)
+        affected: list[str] = []
+        for test_path in test_files:
+            test_name = PurePosixPath(test_path).name
+            if test_name in (f"test_{parts[-1]}.py", f"{parts[-1]}_test.py"):
+                affected.append(test_path)
+                continue
+            try:
+                source = (self.root / test_path).read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                continue
+            if imports.search(source):
+                affected.append(test_path)
+        return affected
+
+    def _narrow(self, command: str, targets: list[str]) -> tuple[str, list[str]] | None:
+        # Replaces the trailing path arguments of the command (its own scope, such as "." or
+        # "tests/") with the targets inside that scope; None when the command cannot be narrowed.
+        if SHELL_OPERATORS.search(command):
+            return None
+        try:
+            parts = shlex.split(command)
+        except ValueError:
+            return None
+        scope: list[str] = []
+        while len(parts) > 1 and not parts[-1].startswith("-") and (self.root / parts[-1]).exists():
+            scope.append(Path(os.path.normpath(parts.pop())).as_posix())
+        if scope and "." not in scope:
+            targets = [
+                target
+                for target in targets
+                if any(target == path or target.startswith(f"{path}/") for path in scope)
+            ]
+        return shlex.join([*parts, *targets]), targets
+
+
+def _cached(result: dict[str, Any], saved_at: str) -> dict[str, Any]:
+    return {**result, "cached": True, "cached_at": saved_at}
+
+
+_shared_cache: CIResultCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def ci_result_cache(root: Path) -> CIResultCache:
+    # One cache per process so that run_checks, run_tests and run_lint share the file index.
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None or _shared_cache.root != root:
+            _shared_cache = CIResultCache(root)
+        return _shared_cache
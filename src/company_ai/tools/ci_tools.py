@@ -3,64 +3,115 @@ from __future__ import annotations
 import json
 import subprocess
 from pathlib import Path
+from typing import Any
 
-from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from company_ai.settings import ci_settings
+
+from .base import TracedTool
+from .ci_cache import ci_result_cache
+from .command_runner import run_command, run_commands
+
 
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[3]
 
 
+def _run_blocking(command: str, timeout: float) -> dict[str, Any]:
+    try:
+        result = subprocess.run(
+            command,
+            shell=True,
+            capture_output=True,
+            text=True,
+            cwd=_repo_root(),
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"command": command, "error": f"timed out after {timeout:.0f}s"}
+    return {
+        "command": command,
+        "exit_code": result.returncode,
+        "stdout": result.stdout,
+        "stderr": result.stderr,
+    }
+
+
+def _run_commands(commands: dict[str, str], settings: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    if settings["mode"] == "blocking":
+        return {name: _run_blocking(command, settings["timeout"]) for name, command in commands.items()}
+    options = {key: settings[key] for key in ("timeout", "kill_grace", "max_output_bytes")}
+    if len(commands) == 1:
+        [(name, command)] = commands.items()
+        return {name: run_command(command, _repo_root(), **options).as_dict()}
+    return {name: result.as_dict() for name, result in run_commands(commands, _repo_root(), **options).items()}
+
+
+def _execute(commands: dict[str, str], affected_only: bool | None = None) -> dict[str, dict[str, Any]]:
+    # commands maps a kind ("tests" or "lint") to its command. Results of commands whose inputs
+    # did not change come from the CI cache; the others run, at the same time when there are several.
+    settings = ci_settings()
+    if not settings["cache"]:
+        return _run_commands(commands, settings)
+    cache = ci_result_cache(_repo_root())
+    files = cache.index.snapshot()
+    affected_only = settings["affected_only"] if affected_only is None else affected_only
+    plans = {kind: cache.plan(kind, command, files, affected_only) for kind, command in commands.items()}
+    results = {kind: plan.result for kind, plan in plans.items() if plan.result is not None}
+    pending = {kind: plan.command for kind, plan in plans.items() if plan.result is None}
+    if pending:
+        for kind, result in _run_commands(pending, settings).items():
+            results[kind] = {**result, **plans[kind].scope}
+            cache.store(kind, commands[kind], files, plans[kind], results[kind])
+    return {kind: results[kind] for kind in commands}
+
+
+AFFECTED_ONLY_DESCRIPTION = (
+    "Run only the test modules or lint targets affected by files changed since the last full run of "
+    "this command; leave empty for the configured default"
+)
+
+
 class CommandInput(BaseModel):
     command: str = Field(description="Shell command to execute")
+    affected_only: bool | None = Field(default=None, description=AFFECTED_ONLY_DESCRIPTION)
+
+
+class ChecksInput(BaseModel):
+    test_command: str = Field(default="", description="Test command to execute, e.g. pytest -q")
+    lint_command: str = Field(default="", description="Lint command to execute, e.g. ruff check .")
+    affected_only: bool | None = Field(default=None, description=AFFECTED_ONLY_DESCRIPTION)
 
 
-class RunTestsTool(BaseTool):
+class RunTestsTool(TracedTool):
     name: str = "run_tests"
     description: str = "Run a local test command and return stdout/stderr/exit code."
     args_schema: type[BaseModel] = CommandInput
 
-    def _run(self, command: str) -> str:
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            cwd=_repo_root(),
-            timeout=180,
-        )
-        return json.dumps(
-            {
-                "command": command,
-                "exit_code": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-            },
-            indent=2,
-        )
+    def _run(self, command: str, affected_only: bool | None = None) -> str:
+        return json.dumps(_execute({"tests": command}, affected_only)["tests"], indent=2)
 
 
-class RunLintTool(BaseTool):
+class RunLintTool(TracedTool):
     name: str = "run_lint"
     description: str = "Run a local lint command and return stdout/stderr/exit code."
     args_schema: type[BaseModel] = CommandInput
 
-    def _run(self, command: str) -> str:
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            cwd=_repo_root(),
-            timeout=180,
-        )
-        return json.dumps(
-            {
-                "command": command,
-                "exit_code": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-            },
-            indent=2,
-        )
+    def _run(self, command: str, affected_only: bool | None = None) -> str:
+        return json.dumps(_execute({"lint": command}, affected_only)["lint"], indent=2)
+
+
+class RunChecksTool(TracedTool):
+    name: str = "run_checks"
+    description: str = (
+        "Run a local test command and a lint command at the same time and return "
+        "stdout/stderr/exit code of each."
+    )
+    args_schema: type[BaseModel] = ChecksInput
+
+    def _run(self, test_command: str = "", lint_command: str = "", affected_only: bool | None = None) -> str:
+        commands = {name: command for name, command in (("tests", test_command), ("lint", lint_command)) if command}
+        if not commands:
+            return json.dumps({"error": "test_command or lint_command is required"})
+        return json.dumps(_execute(commands, affected_only), indent=2)
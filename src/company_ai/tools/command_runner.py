@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+
+READ_CHUNK = 64 * 1024
+# Share of an output buffer kept for the start of the output; the rest holds its most recent bytes.
+HEAD_SHARE = 0.25
+
+
+class OutputBuffer:
+    # Bounded capture of a stream: the first bytes (where collection errors and usage messages
+    # show up) and a ring of the most recent bytes, with a marker for what was dropped in between.
+
+    def __init__(self, max_bytes: int) -> None:
+        self.head_limit = int(max_bytes * HEAD_SHARE)
+        self.tail_limit = max_bytes - self.head_limit
+        self.head = bytearray()
+        self.tail: deque[bytes] = deque()
+        self.tail_bytes = 0
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+
+    def write(self, chunk: bytes) -> None:
+        with self._lock:
+            self.total_bytes += len(chunk)
+            if len(self.head) < self.head_limit:
+                room = self.head_limit - len(self.head)
+                self.head += chunk[:room]
+                chunk = chunk[room:]
+            if not chunk or self.tail_limit <= 0:
+                return
+            self.tail.append(chunk)
+            self.tail_bytes += len(chunk)
+            while self.tail_bytes - len(self.tail[0]) >= self.tail_limit:
+                self.tail_bytes -= len(self.tail.popleft())
+
+    @property
+    def dropped_bytes(self) -> int:
+        return self.total_bytes - len(self.head) - min(self.tail_bytes, self.tail_limit)
+
+    def text(self) -> str:
+        with self._lock:
+            tail = b"".join(self.tail)[-self.tail_limit :] if self.tail_limit > 0 else b""
+            head = self.head.decode("utf-8", errors="replace")
+            dropped = self.dropped_bytes
+        if not dropped:
+            return head + tail.decode("utf-8", errors="replace")
+        return f"{head}\n... [{dropped} bytes of output dropped] ...\n{tail.decode('utf-8', errors='replace')}"
+
+
+@dataclass
+class CommandResult:
+    command: str
+    exit_code: int | None
+    stdout: str
+    stderr: str
+    seconds: float
+    output_bytes: dict[str, int]
+    dropped_bytes: int = 0
+    timed_out: bool = False
+    usage: dict[str, float] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "command": self.command,
+            "exit_code": self.exit_code,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "duration_seconds": round(self.seconds, 3),
+            "output_bytes": self.output_bytes,
+        }
+        if self.dropped_bytes:
+            payload["dropped_bytes"] = self.dropped_bytes
+        if self.usage:
+            payload["resource_usage"] = self.usage
+        if self.timed_out:
+            payload["timed_out"] = True
+            payload["error"] = f"timed out after {self.seconds:.0f}s; output up to the timeout is included"
+        return payload
+
+
+def _pump(stream: IO[bytes], buffer: OutputBuffer) -> None:
+    with stream:
+        for chunk in iter(lambda: stream.read1(READ_CHUNK), b""):  # type: ignore[attr-defined]
+            buffer.write(chunk)
+
+
+def _usage(rusage: Any) -> dict[str, float]:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    max_rss = rusage.ru_maxrss / (1024 * 1024) if sys.platform == "darwin" else rusage.ru_maxrss / 1024
+    return {
+        "cpu_user_seconds": round(rusage.ru_utime, 3),
+        "cpu_system_seconds": round(rusage.ru_stime, 3),
+        "max_rss_mb": round(max_rss, 1),
+    }
+
+
+class _Reaper:
+    # Waits for the child with wait4 where available, which also returns the CPU time and peak
+    # memory of the command and every process it waited for.
+
+    def __init__(self, process: subprocess.Popen[bytes]) -> None:
+        self.process = process
+        self.done = threading.Event()
+        self.usage: dict[str, float] = {}
+        self._thread = threading.Thread(target=self._wait, name=f"reap-{process.pid}", daemon=True)
+        self._thread.start()
+
+    def _wait(self) -> None:
+        try:
+            if hasattr(os, "wait4"):
+                _, status, rusage = os.wait4(self.process.pid, 0)
+                self.process.returncode = os.waitstatus_to_exitcode(status)
+                self.usage = _usage(rusage)
+            else:
+                self.process.wait()
+        finally:
+            self.done.set()
+
+    def wait(self, timeout: float | None) -> bool:
+        return self.done.wait(timeout)
+
+
+def _signal(process: subprocess.Popen[bytes], sig: int) -> None:
+    # The command runs in its own session, so the whole group (the shell and what it started)
+    # is signalled.
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, sig)
+        else:
+            process.send_signal(sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_command(
+    command: str,
+    cwd: Path,
+    timeout: float,
+    kill_grace: float,
+    max_output_bytes: int,
+) -> CommandResult:
+    # Streams stdout and stderr into bounded buffers while the command runs. On timeout the
+    # command gets SIGTERM, then SIGKILL after kill_grace seconds, and the output captured so far
+    # is returned instead of being lost.
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command,
+        shell=True,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=hasattr(os, "killpg"),
+    )
+    buffers = {"stdout": OutputBuffer(max_output_bytes), "stderr": OutputBuffer(max_output_bytes)}
+    readers = [
+        threading.Thread(target=_pump, args=(stream, buffers[name]), daemon=True)
+        for name, stream in (("stdout", process.stdout), ("stderr", process.stderr))
+    ]
+    for reader in readers:
+        reader.start()
+    reaper = _Reaper(process)
+
+    timed_out = not reaper.wait(timeout)
+    if timed_out:
+        _signal(process, signal.SIGTERM)
+        if not reaper.wait(kill_grace):
+            _signal(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+            reaper.wait(None)
+    # Background processes that inherited the pipes can keep them open after the shell exits.
+    deadline = time.monotonic() + max(kill_grace, 1.0)
+    for reader in readers:
+        reader.join(max(0.0, deadline - time.monotonic()))
+
+    return CommandResult(
+        command=command,
+        exit_code=process.returncode,
+        stdout=buffers["stdout"].text(),
+        stderr=buffers["stderr"].text(),
+        seconds=time.perf_counter() - started,
+        output_bytes={name: buffer.total_bytes for name, buffer in buffers.items()},
+        dropped_bytes=sum(buffer.dropped_bytes for buffer in buffers.values()),
+        timed_out=timed_out,
+        usage=reaper.usage,
+    )
+
+
+def run_commands(commands: dict[str, str], cwd: Path, **options: Any) -> dict[str, CommandResult]:
+    # Runs the named commands at the same time, each with its own timeout and buffers.
+    with ThreadPoolExecutor(max_workers=max(1, len(commands)), thread_name_prefix="company-ai-command") as pool:
+        futures = {name: pool.submit(run_command, command, cwd, **options) for name, command in commands.items()}
+        return {name: future.result() for name, future in futures.items()}
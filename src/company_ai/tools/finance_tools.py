@@ -2,15 +2,16 @@ from __future__ import annotations
 
 import json
 
-from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from .base import TracedTool
+
 
 class CostModelInput(BaseModel):
     initiative: str = Field(description="Name or summary of the initiative")
 
 
-class CostModelTool(BaseTool):
+class CostModelTool(TracedTool):
     name: str = "cost_model"
     description: str = "Return a low/base/high cost estimation template."
     args_schema: type[BaseModel] = CostModelInput
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from html import unescape
+
+
+_WHITESPACE = re.compile(r"\s+")
+_TAG_NAME = re.compile(r"/?([A-Za-z][A-Za-z0-9:-]*)")
+# Elements whose content is raw text that must be skipped until the matching end tag.
+_RAW_TEXT_TAGS = frozenset({"script", "style", "noscript", "template", "textarea"})
+# Page chrome that rarely carries the content an agent is looking for.
+_BOILERPLATE_TAGS = frozenset({"nav", "footer", "aside"})
+_BLOCK_TAGS = frozenset(
+    {
+        "address", "article", "blockquote", "br", "dd", "details", "div", "dl", "dt", "figcaption",
+        "figure", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "ol",
+        "p", "pre", "section", "summary", "table", "title", "tr", "ul",
+    }
+)
+# Block tags that have an end tag, tracked to find where an unclosed nav/footer/aside ends.
+_CONTAINER_TAGS = _BLOCK_TAGS - {"br", "hr"}
+# End tags after which no nav/footer/aside can still be open.
+_DOCUMENT_END_TAGS = frozenset({"body", "html"})
+# Table cells stay on their row's line but must not run into each other.
+_CELL_TAGS = frozenset({"td", "th"})
+# Longest named character reference is 32 characters ("&CounterClockwiseContourIntegral;").
+_MAX_ENTITY_LENGTH = 33
+# A "<" followed by a longer run of name characters without ">" is not waited for any longer.
+_MAX_TAG_NAME_LENGTH = 256
+
+
+class HtmlTextExtractor:
+    # Single-pass HTML-to-text tokenizer. Every input character is scanned a bounded number of
+    # times (there are no backtracking regexes over the document), so run time is linear in the
+    # input size even on malformed pages. feed() accepts arbitrary chunks: what is carried over to
+    # the next chunk is bounded (an entity, the start of an end tag or a tag name), and comments,
+    # raw text and tags whose ">" has not arrived are skipped as state rather than rescanned, so
+    # feeding a page in chunks stays linear too. Block-level tags become paragraph breaks, and
+    # `full` turns True once char_limit characters were produced so callers can stop reading.
+    #
+    # With drop_boilerplate, text inside nav/footer/aside is held back and dropped when the
+    # element ends: at its end tag, or at the end tag of an element that was open before it
+    # started (which closes it implicitly). If the page ends, or </body> or </html> arrives,
+    # while one is still open, the held text is kept rather than losing the rest of the page.
+
+    def __init__(self, char_limit: int | None = None, drop_boilerplate: bool = True) -> None:
+        self.char_limit = char_limit
+        self.drop_boilerplate = drop_boilerplate
+        self._buffer = ""
+        self._raw_text_tag = ""
+        self._in_comment = False
+        # A tag whose name is known but whose ">" has not arrived: (name, closing), with name ""
+        # for <!...> and <?...>, and its source so far, emitted as text if the input ends first.
+        self._pending_tag: tuple[str, bool] | None = None
+        self._pending_source: list[str] = []
+        # One Counter per open nav/footer/aside: the container tags opened inside it and not yet
+        # closed. Paragraphs from _held_from on were produced inside the outermost one.
+        self._boilerplate: list[Counter[str]] = []
+        self._held_from = 0
+        self._paragraphs: list[str] = []
+        self._current: list[str] = []
+        self._length = 0
+
+    @property
+    def full(self) -> bool:
+        return self.char_limit is not None and self._length >= self.char_limit
+
+    def feed(self, data: str) -> None:
+        self._buffer = self._consume(self._buffer + data, final=False)
+
+    def close(self) -> None:
+        self._consume(self._buffer, final=True)
+        self._buffer = ""
+        if self._pending_tag is not None:
+            self._pending_tag = None
+            self._handle_text("".join(self._pending_source))
+            self._pending_source = []
+        self._end_paragraph()
+        if self._boilerplate:
+            self._keep_held()
+
+    def text(self) -> str:
+        if self._boilerplate:
+            return "\n".join(self._paragraphs[: self._held_from])
+        paragraphs = [*self._paragraphs]
+        current = _WHITESPACE.sub(" ", "".join(self._current)).strip()
+        if current:
+            paragraphs.append(current)
+        return "\n".join(paragraphs)
+
+    def _consume(self, buffer: str, final: bool) -> str:
+        # Returns the unconsumed tail of buffer.
+        pos = 0
+        size = len(buffer)
+        # Position of the next ">" at or after the current "<" (-1: none left in the buffer);
+        # reused while scanning runs of stray "<" characters so the buffer is not rescanned for
+        # each of them.
+        gt = -2
+        while pos < size and not self.full:
+            if self._pending_tag is not None:
+                end = buffer.find(">", pos)
+                if end < 0:
+                    self._pending_source.append(buffer[pos:])
+                    return ""
+                name, closing = self._pending_tag
+                last = buffer[end - 1] if end > pos else self._pending_source[-1][-1]
+                self._pending_tag = None
+                self._pending_source = []
+                if name:
+                    self._handle_tag(name, closing, last == "/")
+                pos = end + 1
+                continue
+
+            if self._raw_text_tag or self._in_comment:
+                closing_text = "-->" if self._in_comment else "</" + self._raw_text_tag
+                end = _find_ci(buffer, closing_text, pos)
+                if end < 0:
+                    # Keep just enough to recognise the terminator split across chunks.
+                    return "" if final else buffer[max(pos, size - len(closing_text)) :]
+                if self._in_comment:
+                    self._in_comment = False
+                    pos = end + 3
+                    continue
+                self._raw_text_tag = ""
+                pos = end
+
+            lt = buffer.find("<", pos)
+            if lt < 0:
+                if final:
+                    self._handle_text(buffer[pos:])
+                    return ""
+                amp = buffer.rfind("&", max(pos, size - _MAX_ENTITY_LENGTH))
+                cut = amp if amp >= 0 and ";" not in buffer[amp:] else size
+                self._handle_text(buffer[pos:cut])
+                return buffer[cut:]
+            if lt > pos:
+                self._handle_text(buffer[pos:lt])
+
+            if buffer.startswith("<!--", lt):
+                self._in_comment = True
+                pos = lt + 4
+                continue
+
+            if gt != -1 and gt <= lt:
+                gt = buffer.find(">", lt + 1)
+            match = _TAG_NAME.match(buffer, lt + 1, gt if gt >= 0 else size)
+            if gt < 0:
+                pending = self._pending_start(buffer, lt, match)
+                if pending is None:
+                    # Not enough input yet to tell a tag, a comment or a stray "<" apart.
+                    if final:
+                        self._handle_text(buffer[lt:])
+                        return ""
+                    return buffer[lt:]
+                if pending is not False:
+                    self._pending_tag = pending
+                    self._pending_source = [buffer[lt:]]
+                    return ""
+            elif match is not None:
+                self._handle_tag(match.group(1).lower(), buffer[lt + 1] == "/", buffer[gt - 1] == "/")
+                pos = gt + 1
+                continue
+            elif buffer.startswith(("<!", "<?"), lt):
+                pos = gt + 1
+                continue
+            # A stray "<" in text, e.g. "a < b".
+            self._handle_text("<")
+            pos = lt + 1
+        return "" if self.full else buffer[pos:]
+
+    @staticmethod
+    def _pending_start(buffer: str, lt: int, match: re.Match[str] | None) -> tuple[str, bool] | bool | None:
+        # For a "<" with no ">" after it in the buffer: the (name, closing) of the tag it starts,
+        # False for a stray "<", or None when the buffer ends before that can be told.
+        rest = buffer[lt : lt + 4]
+        if "<!--".startswith(rest):
+            return None
+        if rest[1] in "!?":
+            return ("", False)
+        if match is not None:
+            if match.end() < len(buffer) or match.end() - lt > _MAX_TAG_NAME_LENGTH:
+                return (match.group(1).lower(), buffer[lt + 1] == "/")
+            return None
+        return None if rest == "</" else False
+
+    def _handle_tag(self, tag: str, closing: bool, self_closing: bool) -> None:
+        if self.drop_boilerplate and not self_closing:
+            if tag in _BOILERPLATE_TAGS:
+                self._end_paragraph()
+                if not closing:
+                    if not self._boilerplate:
+                        self._held_from = len(self._paragraphs)
+                    self._boilerplate.append(Counter())
+                elif self._boilerplate:
+                    self._boilerplate.pop()
+                    if not self._boilerplate:
+                        self._drop_held()
+                return
+            if self._boilerplate and tag in _CONTAINER_TAGS:
+                if not closing:
+                    self._boilerplate[-1][tag] += 1
+                else:
+                    self._end_paragraph()
+                    # An end tag of an element opened before the nav/footer/aside ends it too.
+                    while self._boilerplate and not self._boilerplate[-1][tag]:
+                        self._boilerplate.pop()
+                    if self._boilerplate:
+                        self._boilerplate[-1][tag] -= 1
+                    else:
+                        self._drop_held()
+            elif self._boilerplate and closing and tag in _DOCUMENT_END_TAGS:
+                self._keep_held()
+        if not closing and not self_closing and tag in _RAW_TEXT_TAGS:
+            self._raw_text_tag = tag
+            return
+        if tag in _BLOCK_TAGS:
+            self._end_paragraph()
+        elif tag in _CELL_TAGS and self._current:
+            self._current.append(" ")
+
+    def _handle_text(self, data: str) -> None:
+        # Inline markup does not separate words, so segments are only joined (and their
+        # whitespace collapsed once more) when the enclosing paragraph ends.
+        if not data:
+            return
+        text = _WHITESPACE.sub(" ", unescape(data) if "&" in data else data)
+        self._current.append(text)
+        if not self._boilerplate:
+            self._length += len(text)
+
+    def _end_paragraph(self) -> None:
+        if not self._current:
+            return
+        paragraph = _WHITESPACE.sub(" ", "".join(self._current)).strip()
+        self._current = []
+        if paragraph:
+            self._paragraphs.append(paragraph)
+
+    def _drop_held(self) -> None:
+        del self._paragraphs[self._held_from :]
+
+    def _keep_held(self) -> None:
+        # A nav/footer/aside that was never closed: keep its text instead of losing it.
+        self._end_paragraph()
+        self._length += sum(len(paragraph) for paragraph in self._paragraphs[self._held_from :])
+        self._boilerplate.clear()
+
+
+def _find_ci(haystack: str, needle: str, start: int) -> int:
+    # Case-insensitive find that lowercases the haystack in bounded windows, so a large
+    # raw-text block is not copied in full on every call.
+    window = 64 * 1024
+    overlap = len(needle) - 1
+    pos = start
+    while pos < len(haystack):
+        index = haystack[pos : pos + window + overlap].lower().find(needle)
+        if index >= 0:
+            return pos + index
+        pos += window
+    return -1
+
+
+def html_to_text(html: str, drop_boilerplate: bool = True) -> str:
+    extractor = HtmlTextExtractor(drop_boilerplate=drop_boilerplate)
+    extractor.feed(html)
+    extractor.close()
+    return extractor.text()
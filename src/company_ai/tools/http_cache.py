@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+DEFAULT_CACHE_TTL_SECONDS = 3600
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+STAT_NAMES = ("hits", "misses", "stale", "revalidated", "stores", "evictions")
+
+
+def _default_cache_path() -> Path:
+    return Path(__file__).resolve().parents[1] / "artifacts" / "state" / "http_cache.sqlite3"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def page_cache_key(url: str) -> str:
+    return f"url:{normalize_url(url)}"
+
+
+def search_cache_key(provider: str, query: str, max_results: int) -> str:
+    normalized_query = " ".join(query.lower().split())
+    return f"search:{provider}:{max_results}:{normalized_query}"
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    key: str
+    body: bytes
+    content_type: str
+    etag: str
+    last_modified: str
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def validators(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    # SQLite-backed response cache shared by all web tools, and across flows through the file on disk.
+    # Entries expire after a TTL, can be revalidated with ETag/Last-Modified, and the least recently
+    # used entries are evicted once the stored bodies exceed max_bytes.
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: int = DEFAULT_CACHE_TTL_SECONDS,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, body BLOB NOT NULL, content_type TEXT NOT NULL, "
+            "etag TEXT NOT NULL, last_modified TEXT NOT NULL, size INTEGER NOT NULL, "
+            "stored_at REAL NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def _record(self, name: str, count: int = 1) -> None:
+        self._conn.execute(
+            "INSERT INTO stats (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, count),
+        )
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, content_type, etag, last_modified, expires_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self._record("misses")
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            entry = CacheEntry(key, row[0], row[1], row[2], row[3], row[4])
+            self._record("hits" if entry.fresh else "stale")
+            return entry
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        content_type: str = "",
+        etag: str = "",
+        last_modified: str = "",
+        ttl_seconds: int | None = None,
+    ) -> None:
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, body, content_type, etag, last_modified, size, stored_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, body, content_type, etag, last_modified, len(body), now, now + ttl, now),
+            )
+            self._record("stores")
+            self._evict()
+
+    def refresh(self, key: str, ttl_seconds: int | None = None) -> None:
+        # Called when the origin answered 304 Not Modified for a stale entry.
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET expires_at = ?, last_access = ? WHERE key = ?",
+                (now + ttl, now, key),
+            )
+            self._record("revalidated")
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        self._record("evictions", evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM stats")
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM stats").fetchall())
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        stats: dict[str, int | float] = {name: int(counters.get(name, 0)) for name in STAT_NAMES}
+        lookups = stats["hits"] + stats["misses"] + stats["stale"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["revalidated"]) / lookups, 4) if lookups else 0.0
+        stats["entries"] = entries
+        stats["bytes"] = size
+        return stats
+
+
+_cache: HttpCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache | None:
+    # Returns None when caching is disabled with INTERNET_TOOL_CACHE=0.
+    global _cache
+    if os.getenv("INTERNET_TOOL_CACHE", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            path = Path(os.getenv("INTERNET_TOOL_CACHE_PATH", "").strip() or _default_cache_path())
+            _cache = HttpCache(
+                path,
+                ttl_seconds=max(0, _env_int("INTERNET_TOOL_CACHE_TTL_SECONDS", DEFAULT_CACHE_TTL_SECONDS)),
+                max_bytes=max(0, _env_int("INTERNET_TOOL_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES)),
+            )
+        return _cache
+
+
+if __name__ == "__main__":
+    http_cache = get_http_cache()
+    print(json.dumps(http_cache.stats() if http_cache else {"error": "cache disabled"}, indent=2))
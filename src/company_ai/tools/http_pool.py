@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import http.client
+import os
+import ssl
+import threading
+import time
+from email.message import Message
+from typing import Any
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 4
+DEFAULT_IDLE_TIMEOUT_SECONDS = 30.0
+MAX_REDIRECTS = 5
+# Bytes read from an abandoned response to salvage its connection before giving up on it.
+MAX_DRAIN_BYTES = 64 * 1024
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+_PoolKey = tuple[str, str, int]
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class PooledResponse:
+    # Wraps http.client.HTTPResponse; closing it hands the keep-alive connection back to the
+    # pool when the body was fully read, and discards the connection otherwise.
+
+    def __init__(
+        self,
+        pool: HttpConnectionPool,
+        key: _PoolKey,
+        connection: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+        url: str,
+    ) -> None:
+        self._pool = pool
+        self._key = key
+        self._connection: http.client.HTTPConnection | None = connection
+        self._response = response
+        self.url = url
+        self.status = response.status
+        self.reason = response.reason
+        self.headers: Message = response.headers
+
+    def read(self, amt: int | None = None) -> bytes:
+        return self._response.read(amt)
+
+    def close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        reusable = False
+        try:
+            if not self._response.isclosed():
+                self._response.read(MAX_DRAIN_BYTES)
+            reusable = self._response.isclosed() and not self._response.will_close
+        except (OSError, http.client.HTTPException):
+            reusable = False
+        self._pool._release(self._key, connection, reusable)
+
+    def __enter__(self) -> PooledResponse:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class HttpConnectionPool:
+    # Thread-safe keep-alive connection pool shared by all web tools. At most
+    # max_per_host connections per (scheme, host, port) are in use at once; callers beyond
+    # that wait for a free slot. Idle connections are closed after idle_timeout seconds.
+
+    def __init__(
+        self,
+        max_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
+    ) -> None:
+        self.max_per_host = max(1, max_per_host)
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle: dict[_PoolKey, list[tuple[http.client.HTTPConnection, float]]] = {}
+        self._slots: dict[_PoolKey, threading.BoundedSemaphore] = {}
+        self._ssl_context = ssl.create_default_context()
+        self._stats = {"requests": 0, "connections_opened": 0, "connections_reused": 0, "connections_discarded": 0}
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        body: bytes | None = None,
+        timeout: float = 15,
+    ) -> PooledResponse:
+        # Follows redirects like urlopen and raises urllib.error.HTTPError for 4xx/5xx answers.
+        # 304 Not Modified is returned to the caller.
+        headers = dict(headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send(method, url, headers, body, timeout)
+            location = response.headers.get("Location")
+            if response.status not in REDIRECT_STATUSES or not location:
+                break
+            response.close()
+            url = urljoin(url, location)
+            if response.status == 303 or (response.status in (301, 302) and method == "POST"):
+                method, body = "GET", None
+                headers.pop("Content-Type", None)
+        else:
+            response.close()
+            raise HTTPError(url, response.status, "Too many redirects", response.headers, None)
+
+        if response.status >= 400:
+            response.close()
+            raise HTTPError(url, response.status, response.reason, response.headers, None)
+        return response
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        body: bytes | None,
+        timeout: float,
+    ) -> PooledResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname.lower(), port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        slot = self._slot(key)
+        if not slot.acquire(timeout=timeout):
+            raise TimeoutError(f"No free connection to {parts.hostname} within {timeout}s")
+        try:
+            with self._lock:
+                self._stats["requests"] += 1
+            # A pooled connection may have been closed by the server while idle; retry once
+            # on a fresh connection when a reused one fails before any response arrives.
+            for attempt in range(2):
+                connection, reused = self._checkout(key, timeout)
+                request_path, request_headers = self._route(connection, key, path, headers)
+                try:
+                    connection.request(method, request_path, body=body, headers=request_headers)
+                    response = connection.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    connection.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    connection.close()
+                    raise
+                return PooledResponse(self, key, connection, response, url)
+            raise RuntimeError("unreachable")
+        except BaseException:
+            slot.release()
+            raise
+
+    def _slot(self, key: _PoolKey) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+
+    def _checkout(self, key: _PoolKey, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                connection, last_used = idle.pop()
+                if now - last_used <= self.idle_timeout:
+                    self._stats["connections_reused"] += 1
+                    connection.timeout = timeout
+                    if connection.sock is not None:
+                        connection.sock.settimeout(timeout)
+                    return connection, True
+                connection.close()
+                self._stats["connections_discarded"] += 1
+            self._stats["connections_opened"] += 1
+        return self._connect(key, timeout), False
+
+    def _connect(self, key: _PoolKey, timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        proxy = self._proxy_for(scheme, host)
+        if proxy is not None:
+            proxy_parts = urlsplit(proxy)
+            proxy_host = proxy_parts.hostname or ""
+            proxy_port = proxy_parts.port or 80
+            if scheme == "https":
+                connection = http.client.HTTPSConnection(
+                    proxy_host, proxy_port, timeout=timeout, context=self._ssl_context
+                )
+                connection.set_tunnel(host, port)
+                return connection
+            return http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout)
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    @staticmethod
+    def _proxy_for(scheme: str, host: str) -> str | None:
+        proxy = getproxies().get(scheme)
+        if not proxy or proxy_bypass(host):
+            return None
+        return proxy
+
+    def _route(
+        self,
+        connection: http.client.HTTPConnection,
+        key: _PoolKey,
+        path: str,
+        headers: dict[str, str],
+    ) -> tuple[str, dict[str, str]]:
+        scheme, host, port = key
+        if scheme == "http" and connection.host != host:
+            # Plain HTTP through a forward proxy uses the absolute URL and the origin's Host header.
+            default_port = port == 80
+            authority = host if default_port else f"{host}:{port}"
+            return f"http://{authority}{path}", {**headers, "Host": authority}
+        return path, headers
+
+    def _release(self, key: _PoolKey, connection: http.client.HTTPConnection, reusable: bool) -> None:
+        with self._lock:
+            if reusable:
+                self._idle.setdefault(key, []).append((connection, time.monotonic()))
+            else:
+                connection.close()
+                self._stats["connections_discarded"] += 1
+        self._slots[key].release()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "idle_connections": sum(len(idle) for idle in self._idle.values())}
+
+    def close(self) -> None:
+        with self._lock:
+            for idle in self._idle.values():
+                for connection, _ in idle:
+                    connection.close()
+            self._idle.clear()
+
+
+_pool: HttpConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_http_pool() -> HttpConnectionPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HttpConnectionPool(
+                max_per_host=int(_env_number("INTERNET_TOOL_POOL_MAX_PER_HOST", DEFAULT_MAX_CONNECTIONS_PER_HOST)),
+                idle_timeout=_env_number("INTERNET_TOOL_POOL_IDLE_SECONDS", DEFAULT_IDLE_TIMEOUT_SECONDS),
+            )
+        return _pool
@@ -1,20 +1,50 @@
 from __future__ import annotations
 
+import codecs
+import contextvars
 import json
 import os
 import re
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
 from html import unescape
-from typing import Any
+from typing import Any, TypeVar
 from urllib.parse import parse_qs, quote_plus, urlparse
-from urllib.request import Request, urlopen
 
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from company_ai.telemetry import annotate
+
+from .base import TracedTool
+from .html_text import HtmlTextExtractor, html_to_text
+from .http_cache import CacheEntry, get_http_cache, normalize_url, page_cache_key, search_cache_key
+from .http_pool import get_http_pool
+from .latency import LatencyHistogram
+from .singleflight import SingleFlight
+
 
 DEFAULT_TIMEOUT_SECONDS = 15
 DEFAULT_MAX_RESULTS = 5
 DEFAULT_MAX_CHARS = 12000
+MAX_PAGE_CHARS = 30000
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+READ_CHUNK_BYTES = 16 * 1024
+TEXT_MEDIA_TYPES = ("application/json", "application/xml", "application/javascript", "application/x-yaml")
+SEARCH_MODES = ("single", "hedged", "hedged_merge")
+MAX_BATCH_ITEMS = 10
+DEFAULT_BATCH_WORKERS = 4
+DEFAULT_BATCH_MAX_CHARS = 4000
+DEFAULT_HEDGE_PERCENTILE = 95.0
+DEFAULT_HEDGE_DELAY_SECONDS = 1.5
+# Samples needed before the primary's latency percentile replaces the default hedge delay.
+MIN_HEDGE_SAMPLES = 20
+DEFAULT_SERPER_URL = "https://google.serper.dev/search"
+DEFAULT_DUCKDUCKGO_URL = "https://duckduckgo.com/html/"
 DEFAULT_USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
@@ -37,6 +67,127 @@ def _timeout_seconds() -> int:
     return max(3, min(timeout, 60))
 
 
+def _endpoint(name: str, default: str) -> str:
+    # Lets benchmarks and offline runs point the search providers at a local stand-in server.
+    return os.getenv(name, "").strip() or default
+
+
+def _search_mode() -> str:
+    mode = os.getenv("INTERNET_TOOL_SEARCH_MODE", "single").strip().lower()
+    return mode if mode in SEARCH_MODES else "single"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+_provider_latency: dict[str, LatencyHistogram] = {}
+_provider_latency_lock = threading.Lock()
+# Agents running concurrently often ask for the same search or page at the same moment; these
+# make the duplicates wait for the request already in flight instead of issuing their own.
+_search_flight: SingleFlight[str] = SingleFlight()
+_page_flight: SingleFlight[dict[str, Any]] = SingleFlight()
+
+
+def provider_latency(provider: str) -> LatencyHistogram:
+    with _provider_latency_lock:
+        histogram = _provider_latency.get(provider)
+        if histogram is None:
+            histogram = _provider_latency[provider] = LatencyHistogram()
+        return histogram
+
+
+def search_latency_stats() -> dict[str, dict[str, object]]:
+    with _provider_latency_lock:
+        providers = dict(_provider_latency)
+    return {name: histogram.snapshot() for name, histogram in providers.items()}
+
+
+def coalescing_stats() -> dict[str, dict[str, int]]:
+    return {"internet_search": _search_flight.stats(), "read_webpage": _page_flight.stats()}
+
+
+def hedge_delay_seconds(provider: str) -> float:
+    # Wait this long for the primary before starting the secondary provider.
+    histogram = provider_latency(provider)
+    percentile = min(99.9, max(1.0, _env_float("INTERNET_TOOL_HEDGE_PERCENTILE", DEFAULT_HEDGE_PERCENTILE)))
+    observed = histogram.percentile(percentile) if histogram.count >= MIN_HEDGE_SAMPLES else None
+    if observed is None:
+        return max(0.0, _env_float("INTERNET_TOOL_HEDGE_DELAY_SECONDS", DEFAULT_HEDGE_DELAY_SECONDS))
+    return observed
+
+
+T = TypeVar("T")
+
+
+def _start_thread(func: Callable[[], T]) -> Future[T]:
+    # A thread of its own rather than a shared pool: a hedged search waiting in a pool's queue
+    # would spend its hedge delay there, and every queued search would then fire its hedge too.
+    # func runs in a copy of the caller's context, as run_dag jobs do, so the trace reaches it.
+    future: Future[T] = Future()
+    context = contextvars.copy_context()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(context.run(func))
+        except BaseException as exc:  # noqa: BLE001
+            future.set_exception(exc)
+
+    threading.Thread(target=run, name="search-hedge", daemon=True).start()
+    return future
+
+
+def _timed_search(provider: str, search: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        result = search()
+    except Exception:
+        provider_latency(provider).observe_error()
+        raise
+    provider_latency(provider).observe(time.perf_counter() - started)
+    return result
+
+
+def _merge_search_results(answers: list[dict[str, Any]], query: str, max_results: int) -> dict[str, Any]:
+    seen: set[str] = set()
+    results: list[dict[str, Any]] = []
+    for answer in answers:
+        for item in answer["results"]:
+            url_key = normalize_url(item["url"]) if item.get("url") else item.get("title", "")
+            if url_key in seen:
+                continue
+            seen.add(url_key)
+            results.append({**item, "provider": answer["provider"]})
+    return {
+        "provider": "+".join(answer["provider"] for answer in answers),
+        "query": query,
+        "results": results[:max_results],
+    }
+
+
+def _batch_workers(item_count: int) -> int:
+    raw_workers = os.getenv("INTERNET_TOOL_BATCH_WORKERS", str(DEFAULT_BATCH_WORKERS))
+    try:
+        workers = int(raw_workers)
+    except ValueError:
+        workers = DEFAULT_BATCH_WORKERS
+    return max(1, min(workers, item_count, MAX_BATCH_ITEMS))
+
+
+def _dedupe_inputs(values: list[str]) -> list[str]:
+    unique: list[str] = []
+    for value in values:
+        value = value.strip()
+        if value and value not in unique:
+            unique.append(value)
+    return unique[:MAX_BATCH_ITEMS]
+
+
 def _extract_ddg_redirect(raw_url: str) -> str:
     parsed = urlparse(raw_url)
     query = parse_qs(parsed.query)
@@ -45,12 +196,203 @@ def _extract_ddg_redirect(raw_url: str) -> str:
     return raw_url
 
 
-def _strip_html(html: str) -> str:
-    text = re.sub(r"(?is)<script.*?>.*?</script>", " ", html)
-    text = re.sub(r"(?is)<style.*?>.*?</style>", " ", text)
-    text = re.sub(r"(?s)<[^>]+>", " ", text)
-    text = unescape(text)
-    return re.sub(r"\s+", " ", text).strip()
+def _max_bytes() -> int:
+    raw_max_bytes = os.getenv("INTERNET_TOOL_MAX_BYTES", str(DEFAULT_MAX_BYTES))
+    try:
+        max_bytes = int(raw_max_bytes)
+    except ValueError:
+        max_bytes = DEFAULT_MAX_BYTES
+    return max(64 * 1024, min(max_bytes, 20 * 1024 * 1024))
+
+
+def _is_text_content_type(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if not media_type:
+        return True
+    return media_type.startswith("text/") or media_type in TEXT_MEDIA_TYPES or media_type.endswith(("+xml", "+json"))
+
+
+def _charset(content_type: str) -> str:
+    match = re.search(r"charset=[\"']?([\w.:-]+)", content_type, re.IGNORECASE)
+    if match:
+        try:
+            codecs.lookup(match.group(1))
+            return match.group(1)
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+class _ContentDecoder:
+    # Undoes gzip/deflate Content-Encoding chunk by chunk. Output is produced in pieces of at
+    # most READ_CHUNK_BYTES so a small, highly compressed chunk is never inflated all at once.
+
+    def __init__(self, content_encoding: str) -> None:
+        self.encoding = content_encoding.strip().lower()
+        self._decompressor = zlib.decompressobj(32 + zlib.MAX_WBITS) if self.encoding in ("gzip", "deflate") else None
+        self._started = False
+
+    def decompress(self, chunk: bytes) -> Iterator[bytes]:
+        if self._decompressor is None:
+            yield chunk
+            return
+        try:
+            data = self._decompressor.decompress(chunk, READ_CHUNK_BYTES)
+        except zlib.error:
+            # Some servers send raw deflate streams without the zlib header.
+            if self.encoding != "deflate" or self._started:
+                raise
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            data = self._decompressor.decompress(chunk, READ_CHUNK_BYTES)
+        self._started = True
+        yield data
+        while self._decompressor.unconsumed_tail:
+            yield self._decompressor.decompress(self._decompressor.unconsumed_tail, READ_CHUNK_BYTES)
+
+
+def _extract_page_text(
+    chunks: Iterable[bytes],
+    content_type: str,
+    char_limit: int,
+    byte_limit: int,
+) -> tuple[str, bytes, bool]:
+    # Decodes and extracts text as chunks arrive, and stops pulling chunks once char_limit
+    # characters were produced or byte_limit decoded bytes were consumed.
+    # Returns the text, the decoded bytes that were used, and whether the page was cut short.
+    decoder = codecs.getincrementaldecoder(_charset(content_type))(errors="replace")
+    extractor = HtmlTextExtractor(char_limit=char_limit) if "html" in content_type.lower() else None
+    plain_parts: list[str] = []
+    plain_length = 0
+    used = bytearray()
+    truncated = False
+
+    for chunk in chunks:
+        if len(used) + len(chunk) > byte_limit:
+            chunk = chunk[: byte_limit - len(used)]
+            truncated = True
+        used.extend(chunk)
+        decoded = decoder.decode(chunk)
+        if extractor is not None:
+            extractor.feed(decoded)
+            truncated = truncated or extractor.full
+        else:
+            plain_parts.append(decoded)
+            plain_length += len(decoded)
+            truncated = truncated or plain_length >= char_limit
+        if truncated:
+            break
+    else:
+        tail = decoder.decode(b"", final=True)
+        if extractor is not None:
+            extractor.feed(tail)
+            extractor.close()
+        else:
+            plain_parts.append(tail)
+
+    text = extractor.text() if extractor is not None else "".join(plain_parts)
+    return text[:char_limit], bytes(used), truncated
+
+
+def _read_page(url: str, max_chars: int) -> dict[str, Any]:
+    cache = get_http_cache()
+    # With the cache enabled, read enough for the largest allowed max_chars so that the
+    # stored prefix can answer any later call for the same URL.
+    char_limit = MAX_PAGE_CHARS if cache is not None else max_chars
+    key = page_cache_key(url)
+    entry = cache.get(key) if cache else None
+    if entry is not None and entry.fresh:
+        text, used, truncated = _extract_page_text([entry.body], entry.content_type, char_limit, _max_bytes())
+        return _page_result(url, entry.content_type, text, max_chars, 0, len(used), truncated)
+
+    page, shared = _page_flight.do(f"{key}#{char_limit}", partial(_fetch_page, url, char_limit, entry))
+    if "error" in page:
+        return {**page, "url": url}
+    # Only the caller that issued the request reports its transfer.
+    transferred = 0 if shared else page["bytes_transferred"]
+    return _page_result(
+        url, page["content_type"], page["text"], max_chars, transferred, page["bytes_used"], page["truncated"]
+    )
+
+
+def _fetch_page(url: str, char_limit: int, entry: CacheEntry | None) -> dict[str, Any]:
+    # entry is the stale cache entry, if any, used to revalidate instead of downloading again.
+    cache = get_http_cache()
+    key = page_cache_key(url)
+    headers = {**_request_headers(), "Accept-Encoding": "gzip, deflate"}
+    if entry is not None:
+        headers.update(entry.validators())
+    response = get_http_pool().request("GET", url, headers=headers, timeout=_timeout_seconds())
+    if response.status == 304 and cache is not None and entry is not None:
+        response.close()
+        cache.refresh(key)
+        text, used, truncated = _extract_page_text([entry.body], entry.content_type, char_limit, _max_bytes())
+        return _fetched_page(entry.content_type, text, 0, len(used), truncated)
+
+    with response:
+        response_headers = response.headers
+        content_type = response_headers.get("Content-Type", "")
+        if not _is_text_content_type(content_type):
+            return {"error": f"read_webpage refused non-text content type: {content_type}"}
+
+        content_decoder = _ContentDecoder(response_headers.get("Content-Encoding", ""))
+        transferred = 0
+
+        def chunks() -> Iterator[bytes]:
+            nonlocal transferred
+            while True:
+                raw = response.read(READ_CHUNK_BYTES)
+                if not raw:
+                    return
+                transferred += len(raw)
+                yield from content_decoder.decompress(raw)
+
+        text, used, truncated = _extract_page_text(chunks(), content_type, char_limit, _max_bytes())
+
+    if cache is not None and "no-store" not in response_headers.get("Cache-Control", "").lower():
+        cache.put(
+            key,
+            used,
+            content_type=content_type,
+            etag=response_headers.get("ETag", ""),
+            last_modified=response_headers.get("Last-Modified", ""),
+        )
+    return _fetched_page(content_type, text, transferred, len(used), truncated)
+
+
+def _fetched_page(
+    content_type: str,
+    text: str,
+    bytes_transferred: int,
+    bytes_used: int,
+    truncated: bool,
+) -> dict[str, Any]:
+    return {
+        "content_type": content_type,
+        "text": text,
+        "bytes_transferred": bytes_transferred,
+        "bytes_used": bytes_used,
+        "truncated": truncated,
+    }
+
+
+def _page_result(
+    url: str,
+    content_type: str,
+    text: str,
+    max_chars: int,
+    bytes_transferred: int,
+    bytes_used: int,
+    truncated: bool,
+) -> dict[str, Any]:
+    return {
+        "url": url,
+        "content_type": content_type,
+        "content_chars": len(text),
+        "truncated": truncated or len(text) > max_chars,
+        "bytes_transferred": bytes_transferred,
+        "bytes_used": bytes_used,
+        "excerpt": text[:max_chars],
+    }
 
 
 class InternetSearchInput(BaseModel):
@@ -63,7 +405,17 @@ class ReadWebpageInput(BaseModel):
     max_chars: int = Field(default=DEFAULT_MAX_CHARS, description="Maximum characters to return")
 
 
-class InternetSearchTool(BaseTool):
+class BatchInternetSearchInput(BaseModel):
+    queries: list[str] = Field(description=f"Search queries to run in parallel (at most {MAX_BATCH_ITEMS})")
+    max_results: int = Field(default=DEFAULT_MAX_RESULTS, description="Maximum number of results per query")
+
+
+class BatchReadWebpageInput(BaseModel):
+    urls: list[str] = Field(description=f"Absolute HTTP/HTTPS URLs to fetch in parallel (at most {MAX_BATCH_ITEMS})")
+    max_chars: int = Field(default=DEFAULT_BATCH_MAX_CHARS, description="Maximum characters to return per page")
+
+
+class InternetSearchTool(TracedTool):
     name: str = "internet_search"
     description: str = "Search the internet for current information and return top results."
     args_schema: type[BaseModel] = InternetSearchInput
@@ -74,23 +426,113 @@ class InternetSearchTool(BaseTool):
             return json.dumps({"error": "query cannot be empty"}, indent=2)
 
         max_results = max(1, min(max_results, 10))
-        serper_api_key = os.getenv("SERPER_API_KEY", "").strip()
+        providers = self._providers(query, max_results)
+        mode = _search_mode() if len(providers) > 1 else "single"
+        cache_provider = providers[0][0] if mode == "single" else f"{mode}:{'+'.join(name for name, _ in providers)}"
+        cache = get_http_cache()
+        cache_key = search_cache_key(cache_provider, query, max_results)
+        entry = cache.get(cache_key) if cache else None
+        if entry is not None and entry.fresh:
+            return entry.body.decode("utf-8")
+
+        def search() -> str:
+            if mode == "single":
+                provider, provider_search = providers[0]
+                answer = _timed_search(provider, provider_search)
+            else:
+                answer = self._search_hedged(query, max_results, providers, merge=mode == "hedged_merge")
+            result = json.dumps(answer, indent=2)
+            if cache is not None:
+                cache.put(cache_key, result.encode("utf-8"), content_type="application/json")
+            return result
+
         try:
-            if serper_api_key:
-                return self._search_serper(query=query, max_results=max_results, api_key=serper_api_key)
-            return self._search_duckduckgo(query=query, max_results=max_results)
+            result, _ = _search_flight.do(cache_key, search)
         except Exception as exc:  # noqa: BLE001
             return json.dumps({"error": f"internet_search failed: {exc}", "query": query}, indent=2)
+        return result
 
-    def _search_serper(self, query: str, max_results: int, api_key: str) -> str:
+    def _providers(self, query: str, max_results: int) -> list[tuple[str, Callable[[], dict[str, Any]]]]:
+        # Ordered by preference; the first entry is the primary provider.
+        providers: list[tuple[str, Callable[[], dict[str, Any]]]] = []
+        serper_api_key = os.getenv("SERPER_API_KEY", "").strip()
+        if serper_api_key:
+            providers.append(
+                ("serper", partial(self._search_serper, query=query, max_results=max_results, api_key=serper_api_key))
+            )
+        providers.append(("duckduckgo", partial(self._search_duckduckgo, query=query, max_results=max_results)))
+        return providers
+
+    def _search_hedged(
+        self,
+        query: str,
+        max_results: int,
+        providers: list[tuple[str, Callable[[], dict[str, Any]]]],
+        merge: bool,
+    ) -> dict[str, Any]:
+        # Start the primary; start the secondary only if the primary has not produced a usable
+        # answer within its latency percentile, counted from when the primary started. Without
+        # merge, the first non-empty answer wins and the other provider is abandoned: a request in
+        # flight cannot be stopped, so its thread lives on until the request finishes or hits the
+        # INTERNET_TOOL_TIMEOUT_SECONDS timeout. A search thus holds at most two threads, each for
+        # at most that timeout.
+        (primary, primary_search), (secondary, secondary_search) = providers[:2]
+        primary_started: list[float] = []
+
+        def run_primary() -> dict[str, Any]:
+            primary_started.append(time.monotonic())
+            return _timed_search(primary, primary_search)
+
+        running: dict[Future[dict[str, Any]], str] = {_start_thread(run_primary): primary}
+        answers: dict[str, dict[str, Any]] = {}
+        errors: dict[str, BaseException] = {}
+        deadline = time.monotonic() + 2 * _timeout_seconds()
+        hedge_delay = hedge_delay_seconds(primary)
+        hedged = False
+
+        while running:
+            if not hedged:
+                started = primary_started[0] if primary_started else time.monotonic()
+                hedge_at = started + hedge_delay
+                timeout = max(0.0, hedge_at - time.monotonic())
+            else:
+                timeout = max(0.0, deadline - time.monotonic())
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                provider = running.pop(future)
+                try:
+                    answers[provider] = future.result()
+                except Exception as exc:  # noqa: BLE001
+                    errors[provider] = exc
+
+            good = [provider for provider, answer in answers.items() if answer["results"]]
+            if good and not merge:
+                break
+            if not hedged and not good and ((primary_started and time.monotonic() >= hedge_at) or not running):
+                hedged = True
+                running[_start_thread(partial(_timed_search, secondary, secondary_search))] = secondary
+                continue
+            if not done and hedged:
+                break  # overall deadline reached
+
+        ordered = [answers[name] for name, _ in providers if name in answers and answers[name]["results"]]
+        if not ordered:
+            if answers:
+                return next(iter(answers.values()))
+            raise next(iter(errors.values()), TimeoutError("no search provider answered in time"))
+        if merge and len(ordered) > 1:
+            return _merge_search_results(ordered, query, max_results)
+        return ordered[0] if merge else answers[good[0]]
+
+    def _search_serper(self, query: str, max_results: int, api_key: str) -> dict[str, Any]:
         request_body = json.dumps({"q": query, "num": max_results}).encode("utf-8")
-        request = Request(
-            url="https://google.serper.dev/search",
-            data=request_body,
+        with get_http_pool().request(
+            "POST",
+            _endpoint("INTERNET_TOOL_SERPER_URL", DEFAULT_SERPER_URL),
             headers={**_request_headers(include_json=True), "X-API-KEY": api_key},
-            method="POST",
-        )
-        with urlopen(request, timeout=_timeout_seconds()) as response:
+            body=request_body,
+            timeout=_timeout_seconds(),
+        ) as response:
             payload = json.loads(response.read().decode("utf-8", errors="replace"))
 
         organic_results = payload.get("organic", [])[:max_results]
@@ -102,12 +544,12 @@ class InternetSearchTool(BaseTool):
             }
             for item in organic_results
         ]
-        return json.dumps({"provider": "serper", "query": query, "results": results}, indent=2)
+        return {"provider": "serper", "query": query, "results": results}
 
-    def _search_duckduckgo(self, query: str, max_results: int) -> str:
-        query_url = f"https://duckduckgo.com/html/?q={quote_plus(query)}"
-        request = Request(url=query_url, headers=_request_headers())
-        with urlopen(request, timeout=_timeout_seconds()) as response:
+    def _search_duckduckgo(self, query: str, max_results: int) -> dict[str, Any]:
+        endpoint = _endpoint("INTERNET_TOOL_DUCKDUCKGO_URL", DEFAULT_DUCKDUCKGO_URL)
+        query_url = f"{endpoint}?q={quote_plus(query)}"
+        with get_http_pool().request("GET", query_url, headers=_request_headers(), timeout=_timeout_seconds()) as response:
             html = response.read().decode("utf-8", errors="replace")
 
         link_pattern = re.compile(
@@ -115,21 +557,21 @@ class InternetSearchTool(BaseTool):
         )
         snippet_pattern = re.compile(r'(?s)<a[^>]*class="[^"]*result__snippet[^"]*"[^>]*>(.*?)</a>')
         link_matches = link_pattern.findall(html)
-        snippet_matches = [_strip_html(match) for match in snippet_pattern.findall(html)]
+        snippet_matches = [html_to_text(match) for match in snippet_pattern.findall(html)]
 
         results: list[dict[str, Any]] = []
         for index, (raw_url, raw_title) in enumerate(link_matches[:max_results]):
             results.append(
                 {
-                    "title": _strip_html(raw_title),
+                    "title": html_to_text(raw_title),
                     "url": _extract_ddg_redirect(unescape(raw_url)),
                     "snippet": snippet_matches[index] if index < len(snippet_matches) else "",
                 }
             )
-        return json.dumps({"provider": "duckduckgo", "query": query, "results": results}, indent=2)
+        return {"provider": "duckduckgo", "query": query, "results": results}
 
 
-class ReadWebpageTool(BaseTool):
+class ReadWebpageTool(TracedTool):
     name: str = "read_webpage"
     description: str = "Fetch and extract readable text from a public webpage."
     args_schema: type[BaseModel] = ReadWebpageInput
@@ -139,29 +581,90 @@ class ReadWebpageTool(BaseTool):
         if not url.lower().startswith(("http://", "https://")):
             return json.dumps({"error": "url must start with http:// or https://"}, indent=2)
 
-        max_chars = max(1000, min(max_chars, 30000))
+        max_chars = max(1000, min(max_chars, MAX_PAGE_CHARS))
         try:
-            request = Request(url=url, headers=_request_headers())
-            with urlopen(request, timeout=_timeout_seconds()) as response:
-                body = response.read()
-                content_type = response.headers.get("Content-Type", "")
-
-            decoded = body.decode("utf-8", errors="replace")
-            text_content = _strip_html(decoded) if "text/html" in content_type.lower() else decoded
-            excerpt = text_content[:max_chars]
-
-            return json.dumps(
-                {
-                    "url": url,
-                    "content_type": content_type,
-                    "content_chars": len(text_content),
-                    "excerpt": excerpt,
-                },
-                indent=2,
-            )
+            page = _read_page(url, max_chars)
         except Exception as exc:  # noqa: BLE001
             return json.dumps({"error": f"read_webpage failed: {exc}", "url": url}, indent=2)
+        annotate(network_bytes=page.get("bytes_transferred", 0))
+        return json.dumps(page, indent=2)
+
+
+def _map_in_context(func: Callable[[str], str], items: list[str]) -> list[str]:
+    # Like executor.map, but each item runs in a copy of the caller's context, as run_dag jobs
+    # do, so span annotations, profile sections and run-scoped state reach the worker threads.
+    with ThreadPoolExecutor(max_workers=_batch_workers(len(items))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, func, item) for item in items]
+        return [future.result() for future in futures]
+
+
+class BatchInternetSearchTool(TracedTool):
+    name: str = "batch_internet_search"
+    description: str = (
+        "Run several internet searches at once and return merged, deduplicated results "
+        "with the queries that produced each URL."
+    )
+    args_schema: type[BaseModel] = BatchInternetSearchInput
+
+    def _run(self, queries: list[str], max_results: int = DEFAULT_MAX_RESULTS) -> str:
+        queries = _dedupe_inputs(queries)
+        if not queries:
+            return json.dumps({"error": "queries cannot be empty"}, indent=2)
+
+        search_tool = InternetSearchTool()
+        answers = [
+            json.loads(raw)
+            for raw in _map_in_context(lambda query: search_tool.run_raw(query, max_results), queries)
+        ]
+
+        merged: dict[str, dict[str, Any]] = {}
+        errors: list[dict[str, str]] = []
+        for query, answer in zip(queries, answers):
+            if "error" in answer:
+                errors.append({"query": query, "error": answer["error"]})
+                continue
+            for item in answer.get("results", []):
+                url_key = normalize_url(item["url"]) if item.get("url") else item.get("title", "")
+                if url_key in merged:
+                    merged[url_key]["queries"].append(query)
+                else:
+                    merged[url_key] = {"provider": answer.get("provider", ""), **item, "queries": [query]}
+
+        payload: dict[str, Any] = {"queries": queries, "results": list(merged.values())}
+        if errors:
+            payload["errors"] = errors
+        return json.dumps(payload, indent=2)
+
+
+class BatchReadWebpageTool(TracedTool):
+    name: str = "batch_read_webpage"
+    description: str = "Fetch several public webpages at once and extract readable text from each."
+    args_schema: type[BaseModel] = BatchReadWebpageInput
+
+    def _run(self, urls: list[str], max_chars: int = DEFAULT_BATCH_MAX_CHARS) -> str:
+        urls = _dedupe_inputs(urls)
+        if not urls:
+            return json.dumps({"error": "urls cannot be empty"}, indent=2)
+
+        read_tool = ReadWebpageTool()
+        pages = [json.loads(raw) for raw in _map_in_context(lambda url: read_tool.run_raw(url, max_chars), urls)]
+        # Each page read annotates the batch span with its own bytes; record the total instead.
+        annotate(network_bytes=sum(page.get("bytes_transferred", 0) for page in pages))
+        return json.dumps({"pages": pages}, indent=2)
 
 
 def build_internet_tools() -> list[BaseTool]:
-    return [InternetSearchTool(), ReadWebpageTool()]
+    return [InternetSearchTool(), ReadWebpageTool(), BatchInternetSearchTool(), BatchReadWebpageTool()]
+
+
+_shared_tools: list[BaseTool] | None = None
+_shared_tools_lock = threading.Lock()
+
+
+def shared_internet_tools() -> list[BaseTool]:
+    # The internet tools keep no per-agent state, so one set of instances serves every agent.
+    global _shared_tools
+    with _shared_tools_lock:
+        if _shared_tools is None:
+            _shared_tools = build_internet_tools()
+        return list(_shared_tools)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import bisect
+import threading
+
+
+# Upper bounds in seconds; roughly logarithmic between 25 ms and one minute.
+DEFAULT_BUCKETS = (0.025, 0.05, 0.1, 0.2, 0.35, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 34.0, 60.0)
+
+
+class LatencyHistogram:
+    # Thread-safe fixed-bucket histogram. Percentiles are estimated as the upper bound of the
+    # bucket holding the requested rank, which is conservative for hedging decisions.
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._errors = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self._count += 1
+            self._sum += seconds
+
+    def observe_error(self) -> None:
+        with self._lock:
+            self._errors += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def percentile(self, percent: float) -> float | None:
+        with self._lock:
+            if not self._count:
+                return None
+            rank = max(1, round(self._count * percent / 100))
+            seen = 0
+            for index, bucket_count in enumerate(self._counts):
+                seen += bucket_count
+                if seen >= rank:
+                    return self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+        return self.buckets[-1]
+
+    def snapshot(self) -> dict[str, object]:
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        with self._lock:
+            return {
+                "count": self._count,
+                "errors": self._errors,
+                "mean_seconds": round(self._sum / self._count, 4) if self._count else None,
+                "p50_seconds": p50,
+                "p95_seconds": p95,
+                "buckets": {
+                    **{f"le_{bound}": count for bound, count in zip(self.buckets, self._counts)},
+                    "le_inf": self._counts[-1],
+                },
+            }
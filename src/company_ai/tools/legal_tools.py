@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import json
 
-from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from .base import TracedTool
+
 
 class ContractReviewInput(BaseModel):
     document_summary: str = Field(description="Short summary of the contract or policy")
@@ -14,7 +15,7 @@ class ComplianceChecklistInput(BaseModel):
     product_scope: str = Field(description="Product or initiative scope")
 
 
-class ContractReviewTool(BaseTool):
+class ContractReviewTool(TracedTool):
     name: str = "contract_review"
     description: str = "Return a simple legal review placeholder structure."
     args_schema: type[BaseModel] = ContractReviewInput
@@ -38,7 +39,7 @@ class ContractReviewTool(BaseTool):
         )
 
 
-class ComplianceChecklistTool(BaseTool):
+class ComplianceChecklistTool(TracedTool):
     name: str = "compliance_checklist"
     description: str = "Return a baseline compliance checklist template."
     args_schema: type[BaseModel] = ComplianceChecklistInput
@@ -3,15 +3,16 @@ from __future__ import annotations
 import json
 import re
 
-from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from .base import TracedTool
+
 
 class ClaimsCheckInput(BaseModel):
     text: str = Field(description="Marketing copy to check")
 
 
-class ClaimsCheckTool(BaseTool):
+class ClaimsCheckTool(TracedTool):
     name: str = "claims_check"
     description: str = "Flag risky marketing wording using simple heuristics."
     args_schema: type[BaseModel] = ClaimsCheckInput
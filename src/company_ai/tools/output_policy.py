@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from company_ai.settings import tool_output_policy
+
+
+# Rough size of a token for English text and JSON; good enough to budget and to report savings.
+CHARS_PER_TOKEN = 4
+# Room kept for the truncation notice added to a shortened output.
+NOTICE_CHARS = 320
+MAX_STORED_OUTPUTS = 256
+MAX_STORED_CHARS = 32 * 1024 * 1024
+# Runs whose statistics are kept; the least recently active go first.
+MAX_STATS_RUNS = 64
+LOG_FIELDS = ("stdout", "stderr", "output", "log", "logs")
+FAILURE_LINE = re.compile(
+    r"(?i)(^E\s|^FAILED|^ERROR|\berror\b|\bfailed\b|\bfailure\b|\bexception\b|traceback|assert)"
+)
+FAILURE_CONTEXT_LINES = 2
+TRACEBACK_LINES = 25
+
+
+def estimate_tokens(chars: int) -> int:
+    return -(-chars // CHARS_PER_TOKEN)
+
+
+@dataclass(frozen=True)
+class ShapedOutput:
+    text: str
+    raw_chars: int
+    output_id: str | None = None
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, estimate_tokens(self.raw_chars) - estimate_tokens(len(self.text)))
+
+
+class ToolOutputStore:
+    # Full outputs of truncated tool calls, kept in memory so agents can page through them with
+    # read_tool_output. Bounded by entry count and total size; the oldest outputs go first.
+
+    def __init__(self, max_entries: int = MAX_STORED_OUTPUTS, max_chars: int = MAX_STORED_CHARS) -> None:
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._outputs: OrderedDict[str, dict[str, str]] = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def put(self, tool_name: str, fields: dict[str, str]) -> str:
+        digest = hashlib.sha1(tool_name.encode("utf-8"))
+        for path, value in sorted(fields.items()):
+            digest.update(path.encode("utf-8") + b"\0" + value.encode("utf-8") + b"\0")
+        output_id = f"out-{digest.hexdigest()[:12]}"
+        size = sum(len(value) for value in fields.values())
+        with self._lock:
+            if output_id in self._outputs:
+                self._outputs.move_to_end(output_id)
+                return output_id
+            self._outputs[output_id] = fields
+            self._chars += size
+            while len(self._outputs) > self.max_entries or (self._chars > self.max_chars and len(self._outputs) > 1):
+                _, evicted = self._outputs.popitem(last=False)
+                self._chars -= sum(len(value) for value in evicted.values())
+        return output_id
+
+    def get(self, output_id: str) -> dict[str, str] | None:
+        with self._lock:
+            fields = self._outputs.get(output_id)
+            if fields is not None:
+                self._outputs.move_to_end(output_id)
+            return fields
+
+
+_store = ToolOutputStore()
+_current_run: ContextVar[str] = ContextVar("company_ai_output_policy_run", default="")
+# Run id -> tool name -> counters.
+_stats: OrderedDict[str, defaultdict[str, dict[str, int]]] = OrderedDict()
+_stats_lock = threading.Lock()
+
+
+def tool_output_store() -> ToolOutputStore:
+    return _store
+
+
+def _new_row() -> dict[str, int]:
+    return {"calls": 0, "truncated": 0, "raw_chars": 0, "chars": 0}
+
+
+@contextmanager
+def output_policy_run(run_id: str) -> Iterator[None]:
+    # Tool outputs shaped inside the block, from any thread the flow starts, count towards
+    # run_id. The run starts from zero even if its id ran before in this process (a resumed run,
+    # or a batch worker that is handed the same id again).
+    with _stats_lock:
+        _stats.pop(run_id, None)
+    token = _current_run.set(run_id)
+    try:
+        yield
+    finally:
+        _current_run.reset(token)
+
+
+def output_policy_stats(run_id: str | None = None) -> dict[str, dict[str, int]]:
+    # For run_id (by default the current run), per tool and in total: calls shaped, calls
+    # truncated, characters produced by the tools and handed to the model, and the estimated
+    # tokens saved.
+    run_id = _current_run.get() if run_id is None else run_id
+    with _stats_lock:
+        rows = {name: dict(row) for name, row in sorted(_stats.get(run_id, {}).items())}
+    total = _new_row()
+    for row in rows.values():
+        for key in total:
+            total[key] += row[key]
+    rows["total"] = total
+    for row in rows.values():
+        row["tokens_saved"] = max(0, estimate_tokens(row["raw_chars"]) - estimate_tokens(row["chars"]))
+    return rows
+
+
+def _dump(payload: Any, compact: bool) -> str:
+    if compact:
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(payload, indent=2, ensure_ascii=False)
+
+
+def truncate_head(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:max(0, limit - 40)]}\n... [{len(text) - max(0, limit - 40)} more chars]"
+
+
+def truncate_log(text: str, limit: int) -> str:
+    # Keeps the head and the tail of a log plus the failing sections in between (error lines
+    # with a little context, and tracebacks), replacing the rest with "[N lines omitted]".
+    if len(text) <= limit:
+        return text
+    lines = text.splitlines()
+    if len(lines) < 3:
+        head = limit // 2
+        return f"{text[:head]}\n... [{len(text) - limit} chars omitted] ...\n{text[-(limit - head):]}"
+
+    keep: set[int] = set()
+    used = 0
+    for index, line in enumerate(lines):
+        if used + len(line) + 1 > limit // 4:
+            break
+        keep.add(index)
+        used += len(line) + 1
+    used_tail = 0
+    for index in range(len(lines) - 1, -1, -1):
+        if index in keep or used_tail + len(lines[index]) + 1 > limit // 3:
+            break
+        keep.add(index)
+        used_tail += len(lines[index]) + 1
+
+    remaining = limit - used - used_tail
+    for index, line in enumerate(lines):
+        if index in keep or not FAILURE_LINE.search(line):
+            continue
+        extra = TRACEBACK_LINES if "traceback" in line.lower() else FAILURE_CONTEXT_LINES
+        section = range(max(0, index - FAILURE_CONTEXT_LINES), min(len(lines), index + extra + 1))
+        cost = sum(len(lines[position]) + 1 for position in section if position not in keep)
+        if cost > remaining:
+            continue
+        keep.update(section)
+        remaining -= cost
+
+    shaped: list[str] = []
+    omitted = 0
+    for index, line in enumerate(lines):
+        if index in keep:
+            if omitted:
+                shaped.append(f"... [{omitted} lines omitted] ...")
+                omitted = 0
+            shaped.append(line[:limit])
+        else:
+            omitted += 1
+    if omitted:
+        shaped.append(f"... [{omitted} lines omitted] ...")
+    return "\n".join(shaped)
+
+
+def _string_leaves(payload: Any, path: str = "") -> list[tuple[str, str]]:
+    # (path, value) of every string in a JSON payload, with paths such as "pages[0].text".
+    if isinstance(payload, str):
+        return [(path, payload)]
+    children: list[tuple[str, Any]] = []
+    if isinstance(payload, dict):
+        children = [(f"{path}.{key}" if path else str(key), value) for key, value in payload.items()]
+    elif isinstance(payload, list):
+        children = [(f"{path}[{index}]", value) for index, value in enumerate(payload)]
+    return [leaf for child_path, value in children for leaf in _string_leaves(value, child_path)]
+
+
+def _replace_leaves(payload: Any, replacements: dict[str, str], path: str = "") -> Any:
+    if isinstance(payload, str):
+        return replacements.get(path, payload)
+    if isinstance(payload, dict):
+        return {
+            key: _replace_leaves(value, replacements, f"{path}.{key}" if path else str(key))
+            for key, value in payload.items()
+        }
+    if isinstance(payload, list):
+        return [_replace_leaves(value, replacements, f"{path}[{index}]") for index, value in enumerate(payload)]
+    return payload
+
+
+def _leaf_cap(lengths: list[int], target: int) -> int:
+    # Largest per-string cap that brings the total string length down to target.
+    low, high = 0, max(lengths, default=0)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if sum(min(length, middle) for length in lengths) <= target:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _notice(output_id: str, total_chars: int, fields: list[str]) -> dict[str, Any]:
+    return {
+        "output_id": output_id,
+        "total_chars": total_chars,
+        "fields": fields,
+        "hint": "Call read_tool_output with this output_id (and a field) to page through the rest.",
+    }
+
+
+def shape_output(tool_name: str, raw: str) -> ShapedOutput:
+    # Applies the tool-output policy (see settings.tool_output_policy): JSON is re-serialized
+    # compactly, and an output over the tool's budget is shortened, with its full text stored
+    # for read_tool_output. Long strings inside JSON are shortened first, evenly from the longest
+    # down, so that small fields such as exit codes and URLs always survive.
+    policy = tool_output_policy()
+    max_tokens = policy["tools"].get(tool_name, policy["max_tokens"])
+    limit = max_tokens * CHARS_PER_TOKEN if max_tokens > 0 else 0
+
+    payload: Any = None
+    if raw[:1] in ("{", "["):
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            payload = None
+    text = raw if payload is None else _dump(payload, policy["compact_json"])
+    shaped = ShapedOutput(text, len(raw))
+    if limit and len(text) > limit:
+        shaped = _truncate(tool_name, payload, text, limit, policy["compact_json"], len(raw))
+
+    run_id = _current_run.get()
+    with _stats_lock:
+        run_stats = _stats.get(run_id)
+        if run_stats is None:
+            run_stats = _stats[run_id] = defaultdict(_new_row)
+            while len(_stats) > MAX_STATS_RUNS:
+                _stats.popitem(last=False)
+        else:
+            _stats.move_to_end(run_id)
+        row = run_stats[tool_name]
+        row["calls"] += 1
+        row["truncated"] += 1 if shaped.output_id else 0
+        row["raw_chars"] += shaped.raw_chars
+        row["chars"] += len(shaped.text)
+    return shaped
+
+
+def _truncate(tool_name: str, payload: Any, text: str, limit: int, compact: bool, raw_chars: int) -> ShapedOutput:
+    if payload is None:
+        output_id = _store.put(tool_name, {"": text})
+        body = truncate_head(text, limit - NOTICE_CHARS)
+        notice = _dump(_notice(output_id, len(text), [""]), compact=True)
+        return ShapedOutput(f"{body}\n[truncated: {notice}]", raw_chars, output_id)
+
+    leaves = dict(_string_leaves(payload))
+    output_id = _store.put(tool_name, {"": text, **leaves})
+    # Budget in serialized characters, since escaping (newlines in logs) makes strings longer.
+    lengths = [len(json.dumps(value, ensure_ascii=False)) - 2 for value in leaves.values()]
+    target = sum(lengths) - (len(text) - (limit - NOTICE_CHARS))
+    for _ in range(4):
+        cap = _leaf_cap(lengths, max(0, target))
+        replacements: dict[str, str] = {}
+        for (path, value), length in zip(leaves.items(), lengths):
+            if length > cap:
+                field = path.rsplit(".", 1)[-1]
+                replacements[path] = truncate_log(value, cap) if field in LOG_FIELDS else truncate_head(value, cap)
+        shortened = _replace_leaves(payload, replacements)
+        notice = _notice(output_id, len(text), sorted(replacements))
+        if isinstance(shortened, dict):
+            shortened = {**shortened, "_truncated": notice}
+        else:
+            shortened = {"result": shortened, "_truncated": notice}
+        shaped = _dump(shortened, compact)
+        if len(shaped) <= limit:
+            return ShapedOutput(shaped, raw_chars, output_id)
+        target -= len(shaped) - limit + 64
+    # Many small fields rather than a few long ones: cut the serialized text instead.
+    notice = _dump(_notice(output_id, len(text), [""]), compact=True)
+    return ShapedOutput(f"{truncate_head(text, limit - NOTICE_CHARS)}\n[truncated: {notice}]", raw_chars, output_id)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import ClassVar
+
+from pydantic import BaseModel, Field
+
+from company_ai.settings import tool_output_policy
+
+from .base import TracedTool
+from .output_policy import CHARS_PER_TOKEN, NOTICE_CHARS, tool_output_store
+
+
+DEFAULT_PAGE_CHARS = 8000
+
+
+class ReadToolOutputInput(BaseModel):
+    output_id: str = Field(description="output_id from the _truncated notice of a shortened tool result")
+    field: str = Field(default="", description="Field to read (e.g. stdout); empty for the whole output")
+    offset: int = Field(default=0, description="Character offset to start reading from")
+    max_chars: int = Field(default=DEFAULT_PAGE_CHARS, description="Maximum characters to return")
+
+
+class ReadToolOutputTool(TracedTool):
+    name: str = "read_tool_output"
+    description: str = "Page through the full text of a tool result that was shortened to fit the context."
+    args_schema: type[BaseModel] = ReadToolOutputInput
+    # Pages are sized to the budget already, so they are never shortened again.
+    apply_output_policy: ClassVar[bool] = False
+
+    def _run(self, output_id: str, field: str = "", offset: int = 0, max_chars: int = DEFAULT_PAGE_CHARS) -> str:
+        fields = tool_output_store().get(output_id.strip())
+        if fields is None:
+            return json.dumps({"error": f"unknown or expired output_id: {output_id}"})
+        if field not in fields:
+            return json.dumps({"error": f"unknown field '{field}'", "fields": sorted(fields)})
+
+        policy = tool_output_policy()
+        budget = policy["max_tokens"] * CHARS_PER_TOKEN - NOTICE_CHARS
+        page_chars = max(500, min(max_chars, budget if budget > 0 else max_chars))
+        text = fields[field]
+        offset = max(0, min(offset, len(text)))
+        end = min(len(text), offset + page_chars)
+        return json.dumps(
+            {
+                "output_id": output_id,
+                "field": field,
+                "offset": offset,
+                "next_offset": end if end < len(text) else None,
+                "total_chars": len(text),
+                "content": text[offset:end],
+            },
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+
+
+_shared_pager: ReadToolOutputTool | None = None
+_shared_pager_lock = threading.Lock()
+
+
+def tool_output_pager() -> ReadToolOutputTool | None:
+    # One shared read_tool_output instance for every agent; None when no tool output is ever
+    # shortened, so agents do not carry a tool they can never use.
+    global _shared_pager
+    policy = tool_output_policy()
+    if policy["max_tokens"] <= 0 and not any(tokens > 0 for tokens in policy["tools"].values()):
+        return None
+    with _shared_pager_lock:
+        if _shared_pager is None:
+            _shared_pager = ReadToolOutputTool()
+        return _shared_pager
@@ -1,10 +1,27 @@
 from __future__ import annotations
 
+import json
+import mmap
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any
 
-from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from company_ai.settings import repo_read_settings, repo_search_settings
+
+from .base import TracedTool
+from .search_index import repo_search_index
+
+
+BINARY_SNIFF_BYTES = 8192
+SUMMARY_LINES = 20
+SUMMARY_SPAN_BYTES = 8192
+SUMMARY_LINE_CHARS = 200
+LINE_SCAN_CHUNK = 64 * 1024
+
 
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[3]
@@ -12,6 +29,18 @@ def _repo_root() -> Path:
 
 class RepoReadInput(BaseModel):
     file_path: str = Field(description="Repository-relative text file path")
+    start_line: int | None = Field(default=None, description="First line to read, starting at 1")
+    end_line: int | None = Field(default=None, description="Last line to read, inclusive")
+    start_byte: int | None = Field(default=None, description="Byte offset to start reading at, starting at 0")
+    end_byte: int | None = Field(default=None, description="Byte offset to stop reading at, exclusive")
+
+
+class RepoSearchInput(BaseModel):
+    query: str = Field(description="Text to search for, or a regular expression when regex is true")
+    regex: bool = Field(default=False, description="Treat query as a Python regular expression")
+    case_sensitive: bool = Field(default=False, description="Match letter case exactly")
+    path_glob: str = Field(default="", description="Only search paths matching this glob, e.g. src/*.py")
+    max_results: int | None = Field(default=None, description="Number of hits to return; empty for the default")
 
 
 class RepoWriteInput(BaseModel):
@@ -19,19 +48,190 @@ class RepoWriteInput(BaseModel):
     content: str = Field(description="Content to write")
 
 
-class RepoReadTool(BaseTool):
+@contextmanager
+def _open_buffer(path: Path, size: int, mmap_bytes: int) -> Iterator[bytes | mmap.mmap]:
+    # Large files are memory-mapped, so ranges and summaries only page in the parts they touch.
+    with path.open("rb") as handle:
+        if size and size >= mmap_bytes:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+        else:
+            yield handle.read()
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+
+def _line_offset(buffer: bytes | mmap.mmap, line: int) -> int:
+    # Byte offset at which the 1-based line starts (the buffer size past the last line).
+    remaining = line - 1
+    position = 0
+    while remaining > 0:
+        chunk = buffer[position : position + LINE_SCAN_CHUNK]
+        if not chunk:
+            return len(buffer)
+        count = chunk.count(b"\n")
+        if count < remaining:
+            remaining -= count
+            position += len(chunk)
+            continue
+        index = -1
+        for _ in range(remaining):
+            index = chunk.index(b"\n", index + 1)
+        return position + index + 1
+    return position
+
+
+def _count_lines(buffer: bytes | mmap.mmap) -> int:
+    lines = sum(
+        buffer[position : position + LINE_SCAN_CHUNK].count(b"\n")
+        for position in range(0, len(buffer), LINE_SCAN_CHUNK)
+    )
+    return lines + (1 if len(buffer) and buffer[-1:] != b"\n" else 0)
+
+
+def _clip_lines(text: str) -> str:
+    return "\n".join(
+        line if len(line) <= SUMMARY_LINE_CHARS else f"{line[:SUMMARY_LINE_CHARS]}..." for line in text.splitlines()
+    )
+
+
+def _summary(file_path: str, buffer: bytes | mmap.mmap, size: int, max_bytes: int) -> dict[str, Any]:
+    head_end = min(_line_offset(buffer, SUMMARY_LINES + 1), SUMMARY_SPAN_BYTES)
+    tail = _decode(buffer[max(head_end, size - SUMMARY_SPAN_BYTES) :]).splitlines()[-SUMMARY_LINES:]
+    return {
+        "file_path": file_path,
+        "size_bytes": size,
+        "lines": _count_lines(buffer),
+        "head": _clip_lines(_decode(buffer[:head_end])),
+        "tail": _clip_lines("\n".join(tail)),
+        "note": (
+            f"The file is larger than {max_bytes} bytes, so only a summary is returned. "
+            "Read parts of it with start_line/end_line or start_byte/end_byte."
+        ),
+    }
+
+
+def _read_range(
+    file_path: str,
+    buffer: bytes | mmap.mmap,
+    size: int,
+    max_bytes: int,
+    lines: tuple[int | None, int | None],
+    byte_range: tuple[int | None, int | None],
+) -> dict[str, Any]:
+    start_line, end_line = lines
+    if start_line is not None or end_line is not None:
+        first = max(1, start_line or 1)
+        if end_line is not None and end_line < first:
+            return {"error": f"end_line {end_line} is before start_line {first}"}
+        begin = _line_offset(buffer, first)
+        if begin >= size and first > 1:
+            return {"error": f"start_line {first} is past the end of the file ({_count_lines(buffer)} lines)"}
+        end = requested_end = _line_offset(buffer, end_line + 1) if end_line is not None else size
+        if end - begin > max_bytes:
+            # Stop after the last whole line that fits.
+            cut = buffer.rfind(b"\n", begin, begin + max_bytes)
+            end = cut + 1 if cut >= begin else begin + max_bytes
+    else:
+        begin = min(size, max(0, byte_range[0] or 0))
+        end = min(size, byte_range[1] if byte_range[1] is not None else size)
+        if end < begin:
+            return {"error": f"end_byte {end} is before start_byte {begin}"}
+        end = min(end, begin + max_bytes)
+
+    content = _decode(buffer[begin:end])
+    payload: dict[str, Any] = {"file_path": file_path, "size_bytes": size, "start_byte": begin, "end_byte": end}
+    if start_line is not None or end_line is not None:
+        payload["start_line"] = first
+        payload["end_line"] = first + content.count("\n") - (1 if content.endswith("\n") or not content else 0)
+        if end < requested_end and content.endswith("\n"):
+            payload["next_start_line"] = payload["end_line"] + 1
+        elif end < requested_end:
+            # A single line longer than the ceiling: continue by bytes.
+            payload["next_start_byte"] = end
+    elif end < min(size, byte_range[1] if byte_range[1] is not None else size):
+        payload["next_start_byte"] = end
+    payload["content"] = content
+    return payload
+
+
+class RepoReadTool(TracedTool):
     name: str = "repo_read"
-    description: str = "Read a text file from the repository."
+    description: str = (
+        "Read a text file from the repository. Large files return a summary (size, line count, head "
+        "and tail); read parts of them with start_line/end_line or start_byte/end_byte."
+    )
     args_schema: type[BaseModel] = RepoReadInput
 
-    def _run(self, file_path: str) -> str:
+    def _run(
+        self,
+        file_path: str,
+        start_line: int | None = None,
+        end_line: int | None = None,
+        start_byte: int | None = None,
+        end_byte: int | None = None,
+    ) -> str:
         target = (_repo_root() / file_path).resolve()
         if not target.exists() or not target.is_file():
             return f"File not found: {file_path}"
-        return target.read_text(encoding="utf-8")
+        line_range = (start_line, end_line)
+        byte_range = (start_byte, end_byte)
+        if any(value is not None for value in line_range) and any(value is not None for value in byte_range):
+            return json.dumps({"error": "pass either start_line/end_line or start_byte/end_byte, not both"})
+
+        settings = repo_read_settings()
+        size = target.stat().st_size
+        with _open_buffer(target, size, settings["mmap_bytes"]) as buffer:
+            if b"\0" in buffer[:BINARY_SNIFF_BYTES]:
+                return json.dumps(
+                    {"file_path": file_path, "size_bytes": size, "error": "binary file; repo_read only returns text"}
+                )
+            if all(value is None for value in (*line_range, *byte_range)):
+                if size <= settings["max_bytes"]:
+                    return _decode(buffer[:])
+                return json.dumps(_summary(file_path, buffer, size, settings["max_bytes"]), indent=2)
+            return json.dumps(
+                _read_range(file_path, buffer, size, settings["max_bytes"], line_range, byte_range), indent=2
+            )
+
+
+class RepoSearchTool(TracedTool):
+    name: str = "repo_search"
+    description: str = (
+        "Search the repository's text files for a string or regular expression and return ranked "
+        "file:line hits with snippets. Use it to find where code is defined or used before reading files."
+    )
+    args_schema: type[BaseModel] = RepoSearchInput
+
+    def _run(
+        self,
+        query: str,
+        regex: bool = False,
+        case_sensitive: bool = False,
+        path_glob: str = "",
+        max_results: int | None = None,
+    ) -> str:
+        if not query.strip():
+            return json.dumps({"error": "query is required"})
+        settings = repo_search_settings()
+        index = repo_search_index(_repo_root(), settings["max_file_bytes"])
+        try:
+            result = index.search(
+                query,
+                regex=regex,
+                case_sensitive=case_sensitive,
+                path_glob=path_glob.strip(),
+                max_results=max(1, max_results or settings["max_results"]),
+                max_scan_files=settings["max_scan_files"],
+            )
+        except re.error as exc:
+            return json.dumps({"error": f"invalid regular expression: {exc}"})
+        return json.dumps(result, indent=2)
 
 
-class RepoWriteTool(BaseTool):
+class RepoWriteTool(TracedTool):
     name: str = "repo_write"
     description: str = "Write a text file in the repository."
     args_schema: type[BaseModel] = RepoWriteInput
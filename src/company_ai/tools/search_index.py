@@ -0,0 +1,429 @@
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import re
+import secrets
+import struct
+import sys
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from company_ai.checkpoint import write_bytes_atomic, write_text_atomic
+
+from .ci_cache import list_repo_files
+
+
+INDEX_VERSION = 1
+# The index's own files and the other run state never need to be searched.
+IGNORED_PREFIXES = ("src/company_ai/artifacts/state/",)
+# Only trigrams inside runs of word characters are indexed: every query trigram made of word
+# characters still appears in a matching file, and a file's trigrams are those of its distinct
+# words, collected by one overlapping findall over them instead of a Python loop per position.
+WORD_RUN = re.compile(rb"[a-z0-9_]{3,}")
+TRIGRAM = re.compile(rb"(?=([a-z0-9_]{3}))")
+BINARY_SNIFF_BYTES = 8192
+# Incremental refreshes append segments; they are merged into one past this count or once a
+# quarter of the indexed documents are stale.
+MAX_SEGMENTS = 8
+SNIPPET_CHARS = 200
+MAX_HITS_PER_FILE = 50
+# Declarations whose name (the first group) a hit can fall in: Python, JS/TS, Go, Rust and
+# top-level assignments.
+DEFINITION = re.compile(
+    r"^\s*(?:export\s+)?(?:default\s+)?(?:pub\s+)?(?:async\s+)?"
+    r"(?:def|class|function|interface|type|struct|enum|fn|func|const|let|var)\s+\*?(\w+)"
+    r"|^(\w+)\s*(?::[^=]*)?=[^=]"
+)
+_POSTING = struct.Struct("<3sI")
+_SEGMENT_MAGIC = b"CAISEG1\n"
+
+
+def default_search_state_dir() -> Path:
+    return Path(__file__).resolve().parents[1] / "artifacts" / "state" / "search"
+
+
+def file_trigrams(data: bytes) -> set[bytes]:
+    return set(TRIGRAM.findall(b" ".join(set(WORD_RUN.findall(data.lower())))))
+
+
+def query_trigrams(literals: list[str]) -> set[bytes]:
+    grams: set[bytes] = set()
+    for literal in literals:
+        grams.update(TRIGRAM.findall(literal.encode("utf-8").lower()))
+    return grams
+
+
+def regex_literals(pattern: str) -> list[str]:
+    # Literal runs every match of the pattern contains. Alternation makes no run required;
+    # groups, classes and characters made optional by ?, * or {} end a run.
+    literals: list[str] = []
+    current: list[str] = []
+    depth = 0
+    index = 0
+
+    def flush() -> None:
+        if current and depth == 0:
+            literals.append("".join(current))
+        current.clear()
+
+    while index < len(pattern):
+        char = pattern[index]
+        following = pattern[index + 1] if index + 1 < len(pattern) else ""
+        if char == "|":
+            return []
+        if char == "\\":
+            quantifier = pattern[index + 2] if index + 2 < len(pattern) else ""
+            if following and not following.isalnum() and quantifier not in ("?", "*", "{"):
+                current.append(following)
+            else:
+                flush()
+            index += 2
+            continue
+        if char == "[":
+            flush()
+            end = pattern.find("]", index + 2 if following == "]" else index + 1)
+            index = len(pattern) if end < 0 else end + 1
+            continue
+        if char in "()":
+            flush()
+            depth += 1 if char == "(" else -1
+        elif char in ".^$+":
+            flush()
+        elif char in "?*{":
+            if current:
+                current.pop()
+            flush()
+            if char == "{":
+                end = pattern.find("}", index)
+                index = len(pattern) if end < 0 else end
+        elif following in ("?", "*", "{"):
+            flush()
+        else:
+            current.append(char)
+        index += 1
+    flush()
+    return literals
+
+
+def _read_segment(path: Path) -> dict[bytes, array]:
+    data = path.read_bytes()
+    if not data.startswith(_SEGMENT_MAGIC):
+        raise ValueError(f"not a search index segment: {path}")
+    view = memoryview(data)
+    postings: dict[bytes, array] = {}
+    position = len(_SEGMENT_MAGIC)
+    while position < len(data):
+        key, count = _POSTING.unpack_from(data, position)
+        position += _POSTING.size
+        ids = array("I")
+        ids.frombytes(view[position : position + count * 4])
+        if sys.byteorder == "big":
+            ids.byteswap()
+        postings[key] = ids
+        position += count * 4
+    return postings
+
+
+def _segment_bytes(postings: dict[bytes, array]) -> bytes:
+    parts = [_SEGMENT_MAGIC]
+    for key in sorted(postings):
+        ids = postings[key]
+        if sys.byteorder == "big":
+            ids = array("I", ids)
+            ids.byteswap()
+        parts.append(_POSTING.pack(key, len(ids)))
+        parts.append(ids.tobytes())
+    return b"".join(parts)
+
+
+@dataclass
+class RefreshStats:
+    files: int
+    indexed: int
+    removed: int
+    seconds: float
+    compacted: bool = False
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "files": self.files,
+            "indexed": self.indexed,
+            "removed": self.removed,
+            "seconds": round(self.seconds, 3),
+            **({"compacted": True} if self.compacted else {}),
+        }
+
+
+class SearchIndex:
+    # Trigram index of the repository's text files. index.json maps every listed file to its
+    # mtime, size and document id (-1 for binary or oversized files); each segment file holds the
+    # posting lists (trigram -> document ids) of the documents indexed by one refresh. A refresh
+    # re-reads only files whose mtime or size changed; their previous documents become stale and
+    # are filtered out of results until the next merge drops them.
+
+    def __init__(self, root: Path, state_dir: Path | None = None, max_file_bytes: int = 1024 * 1024) -> None:
+        self.root = root
+        self.state_dir = state_dir or default_search_state_dir()
+        self.max_file_bytes = max_file_bytes
+        self._meta_path = self.state_dir / "index.json"
+        self._files: dict[str, list[int]] = {}
+        self._paths: dict[int, str] = {}
+        self._postings: dict[bytes, array] = {}
+        self._segments: list[str] = []
+        self._stale: set[int] = set()
+        self._next_id = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+            if meta.get("version") != INDEX_VERSION or meta.get("root") != str(self.root):
+                return
+            postings: dict[bytes, array] = {}
+            for name in meta["segments"]:
+                for key, ids in _read_segment(self.state_dir / name).items():
+                    if key in postings:
+                        postings[key].extend(ids)
+                    else:
+                        postings[key] = ids
+        except (OSError, ValueError, KeyError):
+            return
+        self._files = meta["files"]
+        self._paths = {entry[2]: path for path, entry in self._files.items() if entry[2] >= 0}
+        self._postings = postings
+        self._segments = meta["segments"]
+        self._stale = set(meta["stale"])
+        self._next_id = meta["next_id"]
+
+    def _read_document(self, path: str, size: int) -> bytes | None:
+        if size > self.max_file_bytes:
+            return None
+        try:
+            with open(os.path.join(self.root, path), "rb") as handle:
+                data = handle.read()
+        except OSError:
+            return None
+        return None if b"\0" in data[:BINARY_SNIFF_BYTES] else data
+
+    def refresh(self) -> RefreshStats:
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> RefreshStats:
+        started = time.perf_counter()
+        if not self._loaded:
+            self._load()
+        listed = list_repo_files(self.root, IGNORED_PREFIXES)
+        current: dict[str, list[int]] = {}
+        changed: list[tuple[str, int, int]] = []
+        # os.stat on joined strings: pathlib's per-path overhead dominates on large trees.
+        root = str(self.root)
+        for path in listed:
+            try:
+                stat = os.stat(os.path.join(root, path))
+            except OSError:
+                continue
+            entry = self._files.get(path)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                current[path] = entry
+            else:
+                changed.append((path, stat.st_mtime_ns, stat.st_size))
+        changed_paths = {path for path, _, _ in changed}
+        removed = [path for path in self._files if path not in current and path not in changed_paths]
+        for path in [*removed, *changed_paths]:
+            entry = self._files.get(path)
+            if entry is not None and entry[2] >= 0:
+                self._stale.add(entry[2])
+                self._paths.pop(entry[2], None)
+
+        added: dict[bytes, array] = {}
+        for path, mtime_ns, size in changed:
+            data = self._read_document(path, size)
+            document = -1
+            if data is not None:
+                document = self._next_id
+                self._next_id += 1
+                self._paths[document] = path
+                for gram in file_trigrams(data):
+                    ids = added.get(gram)
+                    if ids is None:
+                        ids = added[gram] = array("I")
+                    ids.append(document)
+            current[path] = [mtime_ns, size, document]
+        stats = RefreshStats(files=len(current), indexed=len(changed), removed=len(removed), seconds=0.0)
+        self._files = current
+        if changed or removed:
+            if added:
+                name = f"segment-{secrets.token_hex(6)}.bin"
+                write_bytes_atomic(self.state_dir / name, _segment_bytes(added))
+                self._segments.append(name)
+                for gram, ids in added.items():
+                    if gram in self._postings:
+                        self._postings[gram].extend(ids)
+                    else:
+                        self._postings[gram] = ids
+            if len(self._segments) > MAX_SEGMENTS or len(self._stale) * 4 > max(len(self._paths), 1):
+                self._compact()
+                stats.compacted = True
+            self._save()
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    def _compact(self) -> None:
+        stale = self._stale
+        postings: dict[bytes, array] = {}
+        for gram, ids in self._postings.items():
+            kept = array("I", [document for document in ids if document not in stale]) if stale else ids
+            if kept:
+                postings[gram] = kept
+        name = f"segment-{secrets.token_hex(6)}.bin"
+        write_bytes_atomic(self.state_dir / name, _segment_bytes(postings))
+        previous = self._segments
+        self._postings = postings
+        self._segments = [name]
+        self._stale = set()
+        self._save()
+        for old in previous:
+            (self.state_dir / old).unlink(missing_ok=True)
+
+    def _save(self) -> None:
+        meta = {
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "next_id": self._next_id,
+            "segments": self._segments,
+            "stale": sorted(self._stale),
+            "files": self._files,
+        }
+        write_text_atomic(self._meta_path, json.dumps(meta, separators=(",", ":")))
+
+    def _candidates(self, grams: set[bytes]) -> list[str]:
+        if not grams:
+            return sorted(self._paths.values())
+        lists = sorted((self._postings.get(gram, array("I")) for gram in grams), key=len)
+        documents = set(lists[0])
+        for ids in lists[1:]:
+            if not documents:
+                break
+            documents.intersection_update(ids)
+        return sorted(self._paths[document] for document in documents if document in self._paths)
+
+    def search(
+        self,
+        query: str,
+        regex: bool = False,
+        case_sensitive: bool = False,
+        path_glob: str = "",
+        max_results: int = 20,
+        max_scan_files: int = 5000,
+    ) -> dict[str, Any]:
+        flags = 0 if case_sensitive else re.IGNORECASE
+        matcher = re.compile(query if regex else re.escape(query), flags | re.MULTILINE)
+        with self._lock:
+            refreshed = self._refresh()
+            candidates = self._candidates(query_trigrams(regex_literals(query) if regex else [query]))
+        if path_glob:
+            candidates = [path for path in candidates if fnmatch.fnmatch(path, path_glob)]
+        needle = query.lower()
+        # Files whose path mentions the query are scanned first, so they survive the scan limit.
+        candidates.sort(key=lambda path: needle not in path.lower())
+        scanned = candidates[:max_scan_files]
+
+        hits: list[dict[str, Any]] = []
+        files_matched = 0
+        for path in scanned:
+            file_hits = self._scan_file(path, matcher, needle)
+            if file_hits:
+                files_matched += 1
+                hits.extend(file_hits)
+        hits.sort(key=lambda hit: (-hit["score"], hit["path"], hit["line"]))
+        return {
+            "query": query,
+            "hits": hits[:max_results],
+            "total_hits": len(hits),
+            "files_matched": files_matched,
+            "candidate_files": len(candidates),
+            "scanned_files": len(scanned),
+            "truncated": len(hits) > max_results or len(candidates) > len(scanned),
+            "index": refreshed.as_dict(),
+        }
+
+    def _scan_file(self, path: str, matcher: re.Pattern[str], needle: str) -> list[dict[str, Any]]:
+        try:
+            with open(os.path.join(self.root, path), encoding="utf-8", errors="replace") as handle:
+                text = handle.read()
+        except OSError:
+            return []
+        name = path.rsplit("/", 1)[-1].lower()
+        file_score = 3.0 if needle in name else 1.0 if needle in path.lower() else 0.0
+        hits: list[dict[str, Any]] = []
+        line_number = 1
+        position = 0
+        for match in matcher.finditer(text):
+            line_number += text.count("\n", position, match.start())
+            position = match.start()
+            line_start = text.rfind("\n", 0, match.start()) + 1
+            line_end = text.find("\n", match.start())
+            line = text[line_start : line_end if line_end >= 0 else len(text)]
+            if hits and hits[-1]["line"] == line_number:
+                continue
+            hits.append(
+                {
+                    "path": path,
+                    "line": line_number,
+                    "snippet": _snippet(line, match.start() - line_start),
+                    "score": file_score + _line_score(line, line_start, match),
+                }
+            )
+            if len(hits) >= MAX_HITS_PER_FILE:
+                break
+        # Many hits in one file add a little, so a definition elsewhere still ranks higher.
+        bonus = min(len(hits), 10) / 10
+        for hit in hits:
+            hit["score"] = round(hit["score"] + bonus, 2)
+        return hits
+
+
+def _line_score(line: str, line_start: int, match: re.Match[str]) -> float:
+    score = 0.0
+    definition = DEFINITION.match(line)
+    if definition:
+        group = 1 if definition.group(1) else 2
+        name_start, name_end = definition.start(group) + line_start, definition.end(group) + line_start
+        if match.start() < name_end and match.end() > name_start:
+            score += 4.0
+    text = match.string
+    before = text[match.start() - 1] if match.start() > 0 else " "
+    after = text[match.end()] if match.end() < len(text) else " "
+    if not (before.isalnum() or before == "_") and not (after.isalnum() or after == "_"):
+        score += 2.0
+    return score
+
+
+def _snippet(line: str, column: int) -> str:
+    line = line.rstrip()
+    if len(line) <= SNIPPET_CHARS:
+        return line.strip()
+    start = max(0, min(column - SNIPPET_CHARS // 4, len(line) - SNIPPET_CHARS))
+    return f"{'...' if start else ''}{line[start : start + SNIPPET_CHARS].strip()}..."
+
+
+_shared_index: SearchIndex | None = None
+_shared_index_lock = threading.Lock()
+
+
+def repo_search_index(root: Path, max_file_bytes: int) -> SearchIndex:
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None or _shared_index.root != root:
+            _shared_index = SearchIndex(root, max_file_bytes=max_file_bytes)
+        _shared_index.max_file_bytes = max_file_bytes
+        return _shared_index
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Generic, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    # Coalesces concurrent calls that share a key: the first caller runs the function, callers
+    # arriving while it is in flight wait for it and receive the same result (or exception).
+    # Nothing is remembered once the call completes; that is the HTTP cache's job.
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future[T]] = {}
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    def do(self, key: str, func: Callable[[], T]) -> tuple[T, bool]:
+        # Returns the result and whether it was shared from another caller's execution.
+        with self._lock:
+            self._stats["calls"] += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self._stats["executions"] += 1
+            else:
+                self._stats["coalesced"] += 1
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = func()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._in_flight)}
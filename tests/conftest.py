@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from company_ai.tools import http_cache, http_pool
+from company_ai.tools.http_cache import HttpCache
+
+
+ETAG = '"page-v1"'
+LAST_MODIFIED = "Wed, 01 Jan 2025 12:00:00 GMT"
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keep-alive server for the web tools:
+    # - /etag/<name> answers with an ETag and honours If-None-Match.
+    # - /modified/<name> answers with Last-Modified only and honours If-Modified-Since.
+    # - /slow/<name> waits server.delay before answering.
+    # - Any other path gets a plain page.
+    # A connection idle for server.idle_close seconds is closed by the server.
+    protocol_version = "HTTP/1.1"
+    server: LocalServer
+
+    def setup(self) -> None:
+        self.timeout = self.server.idle_close
+        super().setup()
+
+    def handle(self) -> None:
+        # One call per TCP connection; keep-alive requests on it are served inside.
+        with self.server.lock:
+            self.server.connections += 1
+            self.server.active += 1
+            self.server.max_active = max(self.server.max_active, self.server.active)
+        try:
+            super().handle()
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+
+    def do_GET(self) -> None:  # noqa: N802
+        with self.server.lock:
+            self.server.requests[self.path] += 1
+            self.server.conditional_headers.append(
+                {name: self.headers[name] for name in ("If-None-Match", "If-Modified-Since") if name in self.headers}
+            )
+        if self.path.startswith("/slow/"):
+            time.sleep(self.server.delay)
+        headers: dict[str, str] = {}
+        if self.path.startswith("/etag/"):
+            headers["ETag"] = ETAG
+            if self.headers.get("If-None-Match") == ETAG:
+                self._reply(304, headers)
+                return
+        elif self.path.startswith("/modified/"):
+            headers["Last-Modified"] = LAST_MODIFIED
+            if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                self._reply(304, headers)
+                return
+        body = f"<html><body><h1>{self.path}</h1><p>Served body of {self.path}.</p></body></html>"
+        self._reply(200, {**headers, "Content-Type": "text/html; charset=utf-8"}, body.encode("utf-8"))
+
+    def _reply(self, status: int, headers: dict[str, str], body: bytes = b"") -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+
+class LocalServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _PageHandler)
+        self.lock = threading.Lock()
+        self.requests: Counter[str] = Counter()
+        self.conditional_headers: list[dict[str, str]] = []
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+        self.delay = 0.05
+        self.idle_close: float | None = None
+        self.base_url = f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@pytest.fixture
+def local_server() -> Iterator[LocalServer]:
+    server = LocalServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def web_tools(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Iterator[HttpCache]:
+    # A private cache (every entry stale at once, so each read revalidates) and connection pool.
+    monkeypatch.delenv("INTERNET_TOOL_CACHE", raising=False)
+    cache = HttpCache(tmp_path / "http_cache.sqlite3", ttl_seconds=0)
+    pool = http_pool.HttpConnectionPool()
+    monkeypatch.setattr(http_cache, "_cache", cache)
+    monkeypatch.setattr(http_pool, "_pool", pool)
+    try:
+        yield cache
+    finally:
+        pool.close()
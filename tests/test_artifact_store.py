@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from company_ai import checkpoint
+from company_ai.artifact_store import (
+    ArtifactStore,
+    LocalArtifactStore,
+    MemoryArtifactStore,
+    SqliteArtifactStore,
+    default_artifacts_dir,
+)
+
+
+@pytest.fixture(params=["local", "memory", "sqlite"])
+def store(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[ArtifactStore]:
+    if request.param == "local":
+        yield LocalArtifactStore(tmp_path / "artifacts")
+    elif request.param == "memory":
+        yield MemoryArtifactStore()
+    else:
+        sqlite_store = SqliteArtifactStore(tmp_path / "artifacts.sqlite3")
+        try:
+            yield sqlite_store
+        finally:
+            sqlite_store._conn.close()
+
+
+def test_unchanged_content_is_not_rewritten(store: ArtifactStore) -> None:
+    first = store.write("run-1", "docs/plan.md", "# Plan\n")
+    again = store.write("run-1", "docs/plan.md", "# Plan\n")
+    changed = store.write("run-1", "docs/plan.md", "# Plan v2\n")
+
+    assert not first["unchanged"]
+    assert again["unchanged"]
+    assert again["sha256"] == first["sha256"] and again["written_at"] == first["written_at"]
+    assert not changed["unchanged"]
+    assert store.read("run-1", "docs/plan.md") == "# Plan v2\n"
+    assert store.stats("run-1") == {"written": 2, "unchanged": 1}
+
+
+def test_each_run_has_its_own_manifest(store: ArtifactStore) -> None:
+    store.write("run-1", "docs/plan.md", "first run")
+    store.write("run-2", "docs/plan.md", "second run")
+    store.write("run-2", "reports/summary.md", "summary")
+
+    first, second = store.manifest("run-1"), store.manifest("run-2")
+
+    assert first["run_id"] == "run-1" and second["run_id"] == "run-2"
+    assert list(first["artifacts"]) == ["docs/plan.md"]
+    assert list(second["artifacts"]) == ["docs/plan.md", "reports/summary.md"]
+    assert first["artifacts"]["docs/plan.md"]["sha256"] != second["artifacts"]["docs/plan.md"]["sha256"]
+    assert "run-1" in store.manifest_location("run-1") and "run-2" in store.manifest_location("run-2")
+    # Writing the same content again in another run is a write of its own, not a skip.
+    assert not store.write("run-1", "reports/summary.md", "summary")["unchanged"]
+    assert store.read("run-1", "docs/plan.md") == "first run"
+    assert store.read("", "docs/plan.md") is None
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "../outside.md",
+        "docs/../../outside.md",
+        "src/company_ai/artifacts/../outside.md",
+        "/etc/passwd",
+        "runs/other-run/docs/plan.md",
+        "manifest.json",
+    ],
+)
+def test_paths_outside_the_artifacts_directory_are_rejected(store: ArtifactStore, path: str) -> None:
+    with pytest.raises(ValueError):
+        store.write("run-1", path, "content")
+    assert store.manifest("run-1")["artifacts"] == {}
+
+
+def test_paths_relative_to_the_repository_or_absolute_are_accepted(store: ArtifactStore) -> None:
+    store.write("run-1", "src/company_ai/artifacts/docs/plan.md", "plan")
+
+    assert store.read("run-1", "docs/plan.md") == "plan"
+    assert store.read("run-1", str(default_artifacts_dir() / "docs" / "plan.md")) == "plan"
+
+
+def test_local_writes_are_renamed_into_place(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    store = LocalArtifactStore(tmp_path / "artifacts")
+    target = tmp_path / "artifacts" / "runs" / "run-1" / "docs" / "plan.md"
+    store.write("run-1", "docs/plan.md", "old")
+    renames: list[tuple[Path, Path]] = []
+
+    def failing_replace(source: str, destination: str | Path) -> None:
+        renames.append((Path(source), Path(destination)))
+        raise OSError("disk full")
+
+    monkeypatch.setattr(checkpoint.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        store.write("run-1", "docs/plan.md", "new")
+
+    # The new content went to a temporary file next to the target, which was removed when the
+    # rename failed, leaving the previous artifact and its manifest entry whole.
+    ((source, destination),) = renames
+    assert destination == target and source.parent == target.parent and source != target
+    assert target.read_text(encoding="utf-8") == "old"
+    assert os.listdir(target.parent) == ["plan.md"]
+
+    monkeypatch.undo()
+    store = LocalArtifactStore(tmp_path / "artifacts")
+    assert not store.write("run-1", "docs/plan.md", "new")["unchanged"]
+    assert target.read_text(encoding="utf-8") == "new"
+    assert sorted(os.listdir(target.parent)) == ["plan.md"]
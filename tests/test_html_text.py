@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from company_ai.tools.html_text import HtmlTextExtractor, html_to_text
+
+
+def _feed(chunks: list[str], **kwargs: object) -> str:
+    extractor = HtmlTextExtractor(**kwargs)
+    for chunk in chunks:
+        extractor.feed(chunk)
+    extractor.close()
+    return extractor.text()
+
+
+def test_chunk_boundaries_do_not_change_the_text() -> None:
+    html = (
+        "<html><body><h1>Title</h1><!-- a comment --><p>Fish &amp; chips</p>"
+        "<script>var a = '</scr' + 'ipt>';</script><div class='x'>a < b</div>"
+        "<table><tr><td>1</td><td>2</td></tr></table></body></html>"
+    )
+    expected = html_to_text(html)
+
+    assert expected == "Title\nFish & chips\na < b\n1 2"
+    for size in (1, 2, 3, 7, 16):
+        assert _feed([html[i : i + size] for i in range(0, len(html), size)]) == expected
+
+
+@pytest.mark.parametrize("opener", ["<!--", "<style>", '<div title="'])
+def test_unterminated_construct_is_fed_in_linear_time(opener: str) -> None:
+    # Each chunk must be scanned once, not the whole backlog since the opener again.
+    def feed(chunks: int) -> float:
+        extractor = HtmlTextExtractor()
+        extractor.feed("<p>before</p>" + opener)
+        started = time.perf_counter()
+        for _ in range(chunks):
+            extractor.feed("a" * 16384)
+        return time.perf_counter() - started
+
+    feed(50)
+    assert feed(800) < max(0.5, 40 * feed(50))
+
+
+def test_closed_boilerplate_is_dropped() -> None:
+    assert html_to_text("<p>a</p><nav><ul><li>Home</li></ul></nav><p>b</p>") == "a\nb"
+    assert html_to_text("<p>a</p><nav>Home</nav>", drop_boilerplate=False) == "a\nHome"
+
+
+def test_unclosed_boilerplate_ends_with_its_parent() -> None:
+    html = "<div><p>before</p><aside>note<p>related</p></div><p>main</p>"
+
+    assert html_to_text(html) == "before\nmain"
+
+
+@pytest.mark.parametrize(
+    "html",
+    ["<p>before</p><aside>note<p>main</p>", "<p>before</p><footer>note<p>main</p></body></html>"],
+)
+def test_unclosed_boilerplate_keeps_the_rest_of_the_page(html: str) -> None:
+    assert html_to_text(html) == "before\nnote\nmain"
+
+
+def test_char_limit_ignores_dropped_boilerplate() -> None:
+    extractor = HtmlTextExtractor(char_limit=10)
+    extractor.feed("<nav>" + "menu " * 20 + "</nav><p>short</p>")
+
+    assert not extractor.full
+    extractor.close()
+    assert extractor.text() == "short"
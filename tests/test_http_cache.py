@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from company_ai.tools import http_cache, internet_tools
+from company_ai.tools.http_cache import HttpCache, page_cache_key
+
+from .conftest import ETAG, LAST_MODIFIED, LocalServer
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(http_cache, "time", fake)
+    return fake
+
+
+def test_entry_expires_after_ttl(tmp_path: Path, clock: FakeClock) -> None:
+    cache = HttpCache(tmp_path / "cache.sqlite3", ttl_seconds=60)
+    cache.put("url:a", b"body")
+
+    entry = cache.get("url:a")
+    assert entry is not None and entry.fresh and entry.body == b"body"
+
+    clock.advance(61)
+    entry = cache.get("url:a")
+    assert entry is not None and not entry.fresh
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["stale"] == 1
+
+
+def test_refresh_extends_a_stale_entry(tmp_path: Path, clock: FakeClock) -> None:
+    cache = HttpCache(tmp_path / "cache.sqlite3", ttl_seconds=60)
+    cache.put("url:a", b"body", etag=ETAG)
+    clock.advance(61)
+
+    cache.refresh("url:a")
+
+    entry = cache.get("url:a")
+    assert entry is not None and entry.fresh and entry.body == b"body"
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_validators_of_an_entry(tmp_path: Path) -> None:
+    cache = HttpCache(tmp_path / "cache.sqlite3")
+    cache.put("url:a", b"body", etag=ETAG, last_modified=LAST_MODIFIED)
+    cache.put("url:b", b"body")
+
+    assert cache.get("url:a").validators() == {"If-None-Match": ETAG, "If-Modified-Since": LAST_MODIFIED}
+    assert cache.get("url:b").validators() == {}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path, clock: FakeClock) -> None:
+    cache = HttpCache(tmp_path / "cache.sqlite3", max_bytes=30)
+    for key in ("url:a", "url:b", "url:c"):
+        cache.put(key, b"x" * 10)
+        clock.advance(1)
+    # Reading a makes b the least recently used entry.
+    assert cache.get("url:a") is not None
+    clock.advance(1)
+
+    cache.put("url:d", b"x" * 10)
+
+    assert cache.get("url:b") is None
+    assert all(cache.get(key) is not None for key in ("url:a", "url:c", "url:d"))
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 3
+    assert stats["bytes"] == 30
+
+
+def test_entry_larger_than_the_cache_evicts_everything(tmp_path: Path, clock: FakeClock) -> None:
+    cache = HttpCache(tmp_path / "cache.sqlite3", max_bytes=30)
+    cache.put("url:a", b"x" * 10)
+    clock.advance(1)
+
+    cache.put("url:big", b"x" * 40)
+
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize(
+    ("path", "validator"),
+    [("/etag/page", {"If-None-Match": ETAG}), ("/modified/page", {"If-Modified-Since": LAST_MODIFIED})],
+)
+def test_stale_page_is_revalidated_with_304(
+    web_tools: HttpCache, local_server: LocalServer, path: str, validator: dict[str, str]
+) -> None:
+    url = f"{local_server.base_url}{path}"
+
+    first = internet_tools._read_page(url, 1000)
+    second = internet_tools._read_page(url, 1000)
+
+    assert local_server.requests[path] == 2
+    assert local_server.conditional_headers == [{}, validator]
+    assert second["excerpt"] == first["excerpt"]
+    assert f"Served body of {path}." in second["excerpt"]
+    assert first["bytes_transferred"] > 0
+    assert second["bytes_transferred"] == 0
+    assert web_tools.stats()["revalidated"] == 1
+
+
+def test_fresh_page_is_served_without_a_request(
+    web_tools: HttpCache, local_server: LocalServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(web_tools, "ttl_seconds", 3600)
+    url = f"{local_server.base_url}/etag/fresh"
+
+    first = internet_tools._read_page(url, 1000)
+    second = internet_tools._read_page(url, 1000)
+
+    assert local_server.requests["/etag/fresh"] == 1
+    assert second["excerpt"] == first["excerpt"]
+    assert web_tools.get(page_cache_key(url)).fresh
+
+
+def test_page_without_validators_is_downloaded_again(web_tools: HttpCache, local_server: LocalServer) -> None:
+    url = f"{local_server.base_url}/plain"
+
+    internet_tools._read_page(url, 1000)
+    second = internet_tools._read_page(url, 1000)
+
+    assert local_server.conditional_headers == [{}, {}]
+    assert second["bytes_transferred"] > 0
+    assert web_tools.stats()["revalidated"] == 0
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from company_ai.tools.http_pool import HttpConnectionPool
+
+from .conftest import LocalServer
+
+
+@pytest.fixture
+def pool() -> Iterator[HttpConnectionPool]:
+    pool = HttpConnectionPool(max_per_host=2, idle_timeout=0.2)
+    try:
+        yield pool
+    finally:
+        pool.close()
+
+
+def _get(pool: HttpConnectionPool, url: str) -> bytes:
+    with pool.request("GET", url) as response:
+        return response.read()
+
+
+def test_sequential_requests_reuse_one_connection(pool: HttpConnectionPool, local_server: LocalServer) -> None:
+    for index in range(5):
+        assert f"/page/{index}".encode() in _get(pool, f"{local_server.base_url}/page/{index}")
+
+    stats = pool.stats()
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 4
+    assert stats["idle_connections"] == 1
+    assert local_server.connections == 1
+
+
+def test_partially_read_response_still_returns_its_connection(
+    pool: HttpConnectionPool, local_server: LocalServer
+) -> None:
+    with pool.request("GET", f"{local_server.base_url}/page/a") as response:
+        response.read(5)
+    _get(pool, f"{local_server.base_url}/page/b")
+
+    assert pool.stats()["connections_opened"] == 1
+    assert local_server.connections == 1
+
+
+def test_concurrent_requests_stay_within_the_per_host_limit(
+    pool: HttpConnectionPool, local_server: LocalServer
+) -> None:
+    urls = [f"{local_server.base_url}/slow/{index}" for index in range(12)]
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        bodies = list(executor.map(lambda url: _get(pool, url), urls))
+
+    assert all(f"/slow/{index}".encode() in body for index, body in enumerate(bodies))
+    stats = pool.stats()
+    assert stats["requests"] == 12
+    assert stats["connections_opened"] == 2
+    assert stats["connections_reused"] == 10
+    assert local_server.max_active == 2
+    assert local_server.connections == 2
+
+
+def test_idle_connections_are_discarded_after_the_timeout(
+    pool: HttpConnectionPool, local_server: LocalServer
+) -> None:
+    _get(pool, f"{local_server.base_url}/page/a")
+    time.sleep(pool.idle_timeout + 0.1)
+    _get(pool, f"{local_server.base_url}/page/b")
+
+    stats = pool.stats()
+    assert stats["connections_opened"] == 2
+    assert stats["connections_reused"] == 0
+    assert stats["connections_discarded"] == 1
+    assert local_server.connections == 2
+
+
+def test_idle_timeout_under_concurrency(pool: HttpConnectionPool, local_server: LocalServer) -> None:
+    # Two concurrent waves separated by more than the idle timeout: the second wave opens new
+    # connections instead of reusing the expired ones, and every request succeeds.
+    def wave(tag: str) -> list[bytes]:
+        barrier = threading.Barrier(4)
+
+        def fetch(index: int) -> bytes:
+            barrier.wait()
+            return _get(pool, f"{local_server.base_url}/slow/{tag}-{index}")
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            return list(executor.map(fetch, range(4)))
+
+    first = wave("first")
+    assert pool.stats()["idle_connections"] == 2
+    time.sleep(pool.idle_timeout + 0.1)
+    second = wave("second")
+
+    assert all(b"/slow/first-" in body for body in first)
+    assert all(b"/slow/second-" in body for body in second)
+    stats = pool.stats()
+    assert stats["requests"] == 8
+    assert stats["connections_opened"] == 4
+    assert stats["connections_reused"] == 4
+    assert stats["connections_discarded"] == 2
+    assert local_server.max_active <= 4
+    assert local_server.connections == 4
+
+
+def test_connection_closed_by_the_server_is_replaced(pool: HttpConnectionPool, local_server: LocalServer) -> None:
+    # The server drops idle connections before the pool's idle timeout expires them.
+    local_server.idle_close = 0.05
+    _get(pool, f"{local_server.base_url}/page/a")
+    time.sleep(0.1)
+
+    assert b"/page/b" in _get(pool, f"{local_server.base_url}/page/b")
+    stats = pool.stats()
+    assert stats["connections_opened"] == 2
+    assert stats["connections_reused"] == 1
+    assert local_server.connections == 2
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from contextvars import ContextVar
+from pathlib import Path
+
+import pytest
+
+from company_ai.telemetry import start_trace
+from company_ai.tools import internet_tools
+from company_ai.tools.http_cache import HttpCache
+from company_ai.tools.internet_tools import BatchReadWebpageTool
+
+from .conftest import LocalServer
+
+
+_marker: ContextVar[str] = ContextVar("test_marker", default="")
+
+
+def test_batch_items_run_in_the_callers_context(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("INTERNET_TOOL_BATCH_WORKERS", "4")
+    token = _marker.set("caller")
+    try:
+        seen = internet_tools._map_in_context(lambda item: f"{item}:{_marker.get()}", ["a", "b", "c", "d", "e"])
+    finally:
+        _marker.reset(token)
+
+    assert seen == ["a:caller", "b:caller", "c:caller", "d:caller", "e:caller"]
+
+
+def test_hedge_threads_run_in_the_callers_context() -> None:
+    token = _marker.set("caller")
+    try:
+        future = internet_tools._start_thread(_marker.get)
+    finally:
+        _marker.reset(token)
+
+    assert future.result(timeout=5) == "caller"
+
+
+def test_batch_page_reads_annotate_the_batch_span(
+    web_tools: HttpCache, local_server: LocalServer, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("COMPANY_AI_TRACE", "1")
+    monkeypatch.setenv("COMPANY_AI_TRACE_DIR", str(tmp_path))
+    urls = [f"{local_server.base_url}/page/{index}" for index in range(3)]
+
+    with start_trace("batch-read") as trace:
+        pages = json.loads(BatchReadWebpageTool().run(urls=urls))["pages"]
+
+    assert trace is not None
+    (batch_span,) = [span for span in trace.spans if span.name == "batch_read_webpage"]
+    assert all(page["bytes_transferred"] > 0 for page in pages)
+    assert batch_span.attributes["network_bytes"] == sum(page["bytes_transferred"] for page in pages)
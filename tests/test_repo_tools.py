@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import pytest
+
+from company_ai.tools.repo_tools import _read_range
+
+
+CONTENT = b"one\ntwo\nthree\n"
+
+
+def test_line_range_is_read() -> None:
+    payload = _read_range("notes.txt", CONTENT, len(CONTENT), 1024, (2, 3), (None, None))
+
+    assert payload["content"] == "two\nthree\n"
+    assert (payload["start_line"], payload["end_line"]) == (2, 3)
+
+
+@pytest.mark.parametrize("content", [CONTENT, CONTENT.rstrip(b"\n")])
+def test_start_line_past_the_end_is_an_error(content: bytes) -> None:
+    payload = _read_range("notes.txt", content, len(content), 1024, (4, None), (None, None))
+
+    assert payload == {"error": "start_line 4 is past the end of the file (3 lines)"}
+
+
+def test_first_line_of_an_empty_file_is_empty() -> None:
+    payload = _read_range("empty.txt", b"", 0, 1024, (1, None), (None, None))
+
+    assert payload["content"] == ""